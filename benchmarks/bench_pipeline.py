@@ -0,0 +1,345 @@
+"""
+Benchmark reprodutível das etapas principais do pToolNER: carga de corpus, filtragem,
+tagging com máscara, relatórios de entidades e escrita de saídas.
+
+Roda offline e em CPU: os corpora são sintéticos (português, gerados com semente fixa) e o
+modelo é substituído por um tagger de dicionário (GazetteerTagger), sem download de modelo.
+Os resultados são gravados em JSON para comparação entre versões.
+
+Benchmarks:
+- load_conll / load_conll_columnar: loadCorpusInCoNLLFormat (listas / columnar=True);
+- load_plain_entities: loadCorpusInPlainFormat(withNamedEntities=True);
+- filter_conll / filter_conll_columnar: filterCoNLLCorpusByCategories;
+- tag_mask / tag_mask_aux: sequenceTaggingOnText com máscara, sem e com auxListNE;
+- get_spans: agregação de spans em relatórios (__getSpans);
+- output_conll / output_plain: generateOutputFile.
+
+Uso:
+    python benchmarks/bench_pipeline.py [--sentences 5000] [--files 20] [--repeat 5]
+                                        [--output resultados.json] [--only load_conll,tag_mask]
+                                        [--compare base.json] [--threshold 1.10]
+
+Com --compare, cada benchmark é comparado (mediana) com o arquivo informado; o processo
+termina com código 1 se algum ficar mais lento que `threshold` vezes o valor de referência.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pToolNER import PortugueseToolNER  # noqa: E402
+
+FIRST_NAMES = ['Manoel', 'Ana', 'João', 'Maria', 'Francisco', 'Antônia', 'José', 'Luíza',
+               'Pedro', 'Beatriz', 'Carlos', 'Juliana', 'Paulo', 'Fernanda', 'Rafael', 'Camila']
+LAST_NAMES = ['Silva', 'Souza', 'Oliveira', 'Santos', 'Pereira', 'Costa', 'Rodrigues', 'Almeida',
+              'Nascimento', 'Lima', 'Araújo', 'Fernandes', 'Carvalho', 'Gomes', 'Ribeiro', 'Barros']
+LOCATIONS = ['São Paulo', 'Lisboa', 'Belo Horizonte', 'Porto Alegre', 'Recife', 'Brasília',
+             'Fortaleza', 'Coimbra', 'Salvador', 'Rio de Janeiro']
+ORGANIZATIONS = ['Supremo Tribunal Federal', 'Prefeitura de Recife', 'Banco do Brasil',
+                 'Ministério Público', 'Universidade de Coimbra', 'Petrobras', 'Câmara Municipal']
+VERBS = ['assinou', 'encaminhou', 'recebeu', 'analisou', 'publicou', 'contestou', 'arquivou']
+OBJECTS = ['o contrato', 'a petição', 'o recurso', 'a sentença', 'o parecer', 'o ofício', 'a denúncia']
+CONNECTORS = ['em', 'junto a', 'perante', 'na sede de', 'conforme decisão de']
+FILLERS = ['ontem', 'nesta semana', 'no prazo legal', 'após a audiência', 'sem ressalvas',
+           'por unanimidade', 'com urgência']
+
+
+def entityTokens(rng: random.Random, entityType: str) -> list[str]:
+    if entityType == 'PER':
+        name = [rng.choice(FIRST_NAMES)] + rng.sample(LAST_NAMES, rng.randint(1, 2))
+    elif entityType == 'LOC':
+        name = rng.choice(LOCATIONS).split(' ')
+    else:
+        name = rng.choice(ORGANIZATIONS).split(' ')
+    return name
+
+
+def syntheticSentence(rng: random.Random) -> list[tuple[str, str]]:
+    """
+    Gera uma sentença sintética como lista de pares (token, rótulo BIO).
+    """
+    pairs = []
+
+    def addEntity(entityType: str):
+        for i, token in enumerate(entityTokens(rng, entityType)):
+            pairs.append((token, f"{'B' if i == 0 else 'I'}-{entityType}"))
+
+    def addWords(text: str):
+        pairs.extend((token, 'O') for token in text.split(' '))
+
+    addWords(rng.choice(['O', 'A', 'Segundo', 'Na audiência,']))
+    addEntity('PER')
+    addWords(rng.choice(VERBS))
+    addWords(rng.choice(OBJECTS))
+    addWords(rng.choice(CONNECTORS))
+    addEntity(rng.choice(['LOC', 'ORG']))
+    if rng.random() < 0.5:
+        addWords(rng.choice(['com', 'e notificou', 'representando']))
+        addEntity(rng.choice(['PER', 'ORG']))
+    addWords(rng.choice(FILLERS))
+    pairs.append(('.', 'O'))
+    return pairs
+
+
+def buildCorpora(workDir: Path, numSentences: int, numFiles: int, seed: int) -> dict:
+    """
+    Escreve os corpora sintéticos em `workDir`:
+    - corpus.conll: token e rótulo por linha, sentenças separadas por linha em branco;
+    - corpus_entities.txt: texto plano com as tags no formato '<B-PER>';
+    - texts/: `numFiles` arquivos .txt com uma sentença por linha, para o tagging.
+    """
+    rng = random.Random(seed)
+    sentences = [syntheticSentence(rng) for _ in range(numSentences)]
+
+    conllPath = workDir / 'corpus.conll'
+    with open(conllPath, 'w', encoding='utf-8') as f:
+        for pairs in sentences:
+            f.write(''.join(f"{token} {tag}\n" for token, tag in pairs) + '\n')
+
+    plainPath = workDir / 'corpus_entities.txt'
+    with open(plainPath, 'w', encoding='utf-8') as f:
+        for pairs in sentences:
+            f.write(' '.join(token if tag == 'O' else f"{token} <{tag}>" for token, tag in pairs) + '\n')
+
+    textsDir = workDir / 'texts'
+    textsDir.mkdir()
+    for fileIndex in range(numFiles):
+        with open(textsDir / f"doc{fileIndex:04d}.txt", 'w', encoding='utf-8') as f:
+            for pairs in sentences[fileIndex::numFiles]:
+                f.write(' '.join(token for token, _ in pairs) + '\n')
+
+    gazetteer = {}
+    for pairs in sentences:
+        for token, tag in pairs:
+            if tag != 'O':
+                gazetteer.setdefault(token, tag[2:])
+
+    return dict(conllPath=conllPath, plainPath=plainPath, textsDir=textsDir, sentences=sentences,
+                gazetteer=gazetteer, numTokens=sum(len(pairs) for pairs in sentences))
+
+
+class GazetteerTagger:
+    """
+    Tagger substituto, com a mesma interface de predição do SequenceTagger do Flair:
+    rotula cada token pelo dicionário token -> tipo (BIO), sem rede neural.
+    Mede o custo do pipeline ao redor do modelo, e não o do modelo.
+    """
+
+    def __init__(self, gazetteer: dict[str, str]):
+        self.gazetteer = gazetteer
+
+    def predict(self, sentences, mini_batch_size: int = 32, **kwargs):
+        if not isinstance(sentences, list):
+            sentences = [sentences]
+        for sentence in sentences:
+            previous = 'O'
+            tags = []
+            for token in sentence.tokens:
+                entityType = self.gazetteer.get(token.text)
+                if entityType is None:
+                    tag = 'O'
+                elif previous.endswith(entityType):
+                    tag = f"I-{entityType}"
+                else:
+                    tag = f"B-{entityType}"
+                token.set_label('label', tag)
+                tags.append(('', tag))
+                previous = tag
+            # Como o SequenceTagger, também anota os spans (usados por get_spans / to_tagged_string)
+            for start, end in entityBounds(tags):
+                sentence[start:end].add_label('label', tags[start][1][2:])
+
+    def state_dict(self) -> dict:
+        return {}
+
+
+def entityBounds(pairs: list[tuple[str, str]]) -> list[tuple[int, int]]:
+    bounds, start = [], None
+    for i, (_, tag) in enumerate(pairs + [('', 'O')]):
+        if start is not None and not tag.startswith('I-'):
+            bounds.append((start, i))
+            start = None
+        if tag.startswith('B-'):
+            start = i
+    return bounds
+
+
+def newTool(corpora: dict) -> PortugueseToolNER:
+    tool = PortugueseToolNER()
+    tool.tagger = GazetteerTagger(corpora['gazetteer'])
+    return tool
+
+
+def benchmarkCases(corpora: dict, workDir: Path) -> dict:
+    """
+    Retorna {nome: (preparação, medição, itens)}. A preparação roda fora da medição e
+    devolve o estado usado pela medição; `itens` (tokens) é usado no cálculo de vazão.
+    """
+    numTokens = corpora['numTokens']
+    conllPath, plainPath, textsDir = corpora['conllPath'], corpora['plainPath'], corpora['textsDir']
+    outputDir = workDir / 'out'
+    personNames = sorted({token for pairs in corpora['sentences'] for token, tag in pairs if tag.endswith('PER')})
+
+    def loadedTool(columnar: bool):
+        def setup():
+            tool = newTool(corpora)
+            tool.loadCorpusInCoNLLFormat(conllPath, columnar=columnar)
+            return tool
+        return setup
+
+    def taggingTool(useAux: bool):
+        def setup():
+            tool = newTool(corpora)
+            if useAux:
+                tool.getUniqueNames(personNames, ['da', 'de', 'do', 'dos'])
+            return tool
+        return setup
+
+    def tagMask(tool: PortugueseToolNER, useAux: bool):
+        tool.sequenceTaggingOnText(textsDir, useTokenizer_flair=False, maskNamedEntity=True,
+                                   entitiesToMask=['PER', 'ORG'], specialTokenToMaskNE='[MASK]',
+                                   useAuxListNE=useAux, auxListNE=tool.uniqueStringNames if useAux else None,
+                                   createOutputListSpans=True, createOutputFile=True,
+                                   outputFilePath=outputDir / 'tagged', outFormat='plain')
+
+    spansData = [(' '.join(token for token, _ in pairs[start:end]), pairs[start][1][2:])
+                 for pairs in corpora['sentences']
+                 for start, end in entityBounds(pairs)]
+
+    return {
+        'load_conll': (lambda: newTool(corpora),
+                       lambda tool: tool.loadCorpusInCoNLLFormat(conllPath), numTokens),
+        'load_conll_columnar': (lambda: newTool(corpora),
+                                lambda tool: tool.loadCorpusInCoNLLFormat(conllPath, columnar=True), numTokens),
+        'load_plain_entities': (lambda: newTool(corpora),
+                                lambda tool: tool.loadCorpusInPlainFormat(plainPath, withNamedEntities=True),
+                                numTokens),
+        'filter_conll': (loadedTool(False),
+                         lambda tool: tool.filterCoNLLCorpusByCategories(['PER'], 'O'), numTokens),
+        'filter_conll_columnar': (loadedTool(True),
+                                  lambda tool: tool.filterCoNLLCorpusByCategories(['PER'], 'O'), numTokens),
+        'tag_mask': (taggingTool(False), lambda tool: tagMask(tool, False), numTokens),
+        'tag_mask_aux': (taggingTool(True), lambda tool: tagMask(tool, True), numTokens),
+        'get_spans': (lambda: newTool(corpora),
+                      lambda tool: tool._PortugueseToolNER__getSpans(spansData), len(spansData)),
+        'output_conll': (loadedTool(False),
+                         lambda tool: tool.generateOutputFile(outputDir / 'corpus.conll',
+                                                              tool.sentencesTokenAndLabels, 'CoNLL'),
+                         numTokens),
+        'output_plain': (lambda: newTool(corpora),
+                         lambda tool: tool.generateOutputFile(outputDir / 'corpus.txt',
+                                                              [' '.join(token for token, _ in pairs)
+                                                               for pairs in corpora['sentences']],
+                                                              'plain'),
+                         numTokens),
+    }
+
+
+def runBenchmark(setup, measure, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()): # O pToolNER imprime o progresso de cada etapa
+            state = setup()
+            start = time.perf_counter()
+            measure(state)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def environmentInfo() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'platform': platform.platform(), 'processor': platform.processor(), 'commit': commit}
+
+
+def compareResults(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Imprime a razão (mediana atual / mediana de referência) de cada benchmark e
+    retorna os nomes dos que ficaram mais lentos que `threshold`.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<24} {'ref (ms)':>10} {'atual (ms)':>11} {'razão':>7}")
+    for name, result in results.items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        ratio = result['median'] / reference['median']
+        flag = '  <-- regressão' if ratio > threshold else ''
+        print(f"{name:<24} {reference['median'] * 1e3:10.2f} {result['median'] * 1e3:11.2f} {ratio:7.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sentences', type=int, default=5000, help='Sentenças do corpus sintético.')
+    parser.add_argument('--files', type=int, default=20, help='Arquivos .txt usados no tagging.')
+    parser.add_argument('--repeat', type=int, default=5, help='Execuções medidas por benchmark.')
+    parser.add_argument('--seed', type=int, default=13, help='Semente do corpus sintético.')
+    parser.add_argument('--only', default=None, help='Benchmarks a executar, separados por vírgula.')
+    parser.add_argument('--output', type=Path, default=None, help='Arquivo JSON com os resultados.')
+    parser.add_argument('--compare', type=Path, default=None, help='JSON de referência para comparação.')
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help='Razão (atual/referência) a partir da qual um benchmark é regressão.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='ptoolner-bench-') as tmp:
+        workDir = Path(tmp)
+        corpora = buildCorpora(workDir, args.sentences, args.files, args.seed)
+        cases = benchmarkCases(corpora, workDir)
+        selected = args.only.split(',') if args.only else list(cases)
+        unknown = [name for name in selected if name not in cases]
+        if unknown:
+            parser.error(f"benchmarks desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(cases)})")
+
+        print(f"Corpus sintético: {args.sentences} sentenças, {corpora['numTokens']} tokens, "
+              f"{args.files} arquivos; {args.repeat} execuções por benchmark\n")
+        print(f"{'benchmark':<24} {'mediana (ms)':>13} {'mín (ms)':>10} {'itens/s':>12}")
+        results = {}
+        for name in selected:
+            setup, measure, items = cases[name]
+            times = runBenchmark(setup, measure, args.repeat)
+            median = statistics.median(times)
+            results[name] = {'median': median, 'min': min(times), 'mean': statistics.fmean(times),
+                             'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+                             'items': items, 'itemsPerSecond': items / median if median > 0 else None,
+                             'times': times}
+            print(f"{name:<24} {median * 1e3:13.2f} {min(times) * 1e3:10.2f} {items / median:12,.0f}")
+
+    report = {'environment': environmentInfo(),
+              'config': {'sentences': args.sentences, 'files': args.files,
+                         'repeat': args.repeat, 'seed': args.seed},
+              'results': results}
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados gravados em {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('config') != report['config']:
+            print("Aviso: a referência foi gerada com outra configuração; as razões podem não ser comparáveis.")
+        if compareResults(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Micro-benchmark dos divisores de sentença usados por sequenceTaggingOnTheFly.
+
+Compara:
+- punkt (recarregado): nltk.data.load a cada chamada, como era feito antes do cache;
+- punkt (cache): punktSentenceSplitter, carregado uma vez por processo;
+- regex: regexSentenceSplitter.
+
+Uso:
+    python benchmarks/bench_sentence_splitters.py [--sentences 20] [--repeat 2000]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import nltk
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pToolNER import punktSentenceSplitter, regexSentenceSplitter  # noqa: E402
+
+SAMPLE_SENTENCES = [
+    "O Sr. Manoel Francisco foi a São Paulo na semana passada.",
+    "A Dra. Ana F. Souza assinou o contrato nº 123 com a Prefeitura de Lisboa!",
+    "Conforme o art. 5 da Constituição, todos são iguais perante a lei.",
+    "Será que o processo chega ao Supremo Tribunal Federal ainda este ano?",
+    "\"Não há previsão\", disse o advogado da União.",
+]
+
+
+def punktReloaded(text: str) -> list[str]:
+    return nltk.data.load('tokenizers/punkt/portuguese.pickle').tokenize(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sentences', type=int, default=20, help='Sentenças por texto.')
+    parser.add_argument('--repeat', type=int, default=2000, help='Chamadas por divisor.')
+    args = parser.parse_args()
+
+    text = ' '.join(SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)] for i in range(args.sentences))
+    splitters = {
+        'punkt (recarregado)': punktReloaded,
+        'punkt (cache)': punktSentenceSplitter,
+        'regex': regexSentenceSplitter,
+    }
+
+    punktSentenceSplitter(text) # Carga inicial fora da medição
+    print(f"Texto com {args.sentences} sentenças, {args.repeat} chamadas por divisor\n")
+    for name, splitter in splitters.items():
+        seconds = timeit.timeit(lambda: splitter(text), number=args.repeat)
+        print(f"{name:<20} {seconds / args.repeat * 1e6:10.1f} us/chamada"
+              f"   ({len(splitter(text))} sentenças)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,2746 @@
 import re
+import abc
+import asyncio
+import gc
+import multiprocessing
 import os
+import hashlib
+import gzip
+import io
+import mmap
+import json
+import logging
+import pickle
+import socket
+import sqlite3
+import tarfile
+import tempfile
+import threading
 import nltk
 import random
+import sys
+import time
+from array import array
 from pathlib import Path # Recomendado para manipulação de caminhos
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
 
 # Assumindo que flair e unidecode são dependências necessárias
 from flair.data import Sentence
 from flair.models import SequenceTagger
 from unidecode import unidecode
 
+@lru_cache(maxsize=None)
+def _loadPunktSentenceDetector():
+    """
+    Carrega o tokenizador Punkt do NLTK para português uma única vez por processo.
+    O objeto é compartilhado por todas as instâncias de PortugueseToolNER.
+
+    Raises:
+        LookupError: Se o tokenizador 'punkt' para português não for encontrado.
+    """
+    try:
+        return nltk.data.load('tokenizers/punkt/portuguese.pickle')
+    except LookupError:
+        print("Recurso 'punkt' do NLTK não encontrado. Tente nltk.download('punkt')")
+        raise
+
+def punktSentenceSplitter(text: str) -> list[str]:
+    """
+    Divide o texto em sentenças com o Punkt do NLTK para português (carregado uma vez por processo).
+    """
+    return _loadPunktSentenceDetector().tokenize(text)
+
+# Abreviações comuns em português que não devem encerrar uma sentença (sem o ponto, em minúsculas)
+_ptAbbreviations = frozenset({
+    'sr', 'sra', 'srs', 'sras', 'srta', 'dr', 'dra', 'drs', 'dras', 'prof', 'profa', 'profs',
+    'exmo', 'exma', 'ilmo', 'ilma', 'eng', 'arq', 'adv', 'dep', 'gov', 'pres',
+    'gen', 'cel', 'maj', 'sgt', 'fr', 'd', 'sto', 'sta', 'av', 'r', 'pç',
+    'art', 'arts', 'inc', 'fl', 'fls', 'pág', 'págs', 'p', 'pp', 'vol', 'ed',
+    'n', 'nº', 'tel', 'cf', 'ex', 'etc', 'obs', 'aprox', 'ltda', 'cia',
+    'jan', 'fev', 'abr', 'mai', 'jun', 'jul', 'ago', 'nov', 'dez',
+})
+# Abreviações que também são palavras comuns ('ao mar.', 'um par.', 'disse no.'): só contam como
+# abreviação se escritas com maiúscula (títulos: 'Des. Fulano', 'Pe. José') ou seguidas de um
+# número ('set. 2020', 'no. 5')
+_ptAmbiguousAbbreviations = frozenset({
+    'des', 'min', 'sen', 'cap', 'ten', 'pe', 'par', 'no', 'nos', 'num', 'mar', 'set', 'out',
+})
+_regexSentenceBoundary = re.compile(r'[.!?…]+["\'”»)]*\s+(?=["\'“«(\-—]?[A-ZÀ-ÖØ-Þ0-9])')
+
+def regexSentenceSplitter(text: str) -> list[str]:
+    """
+    Divisor de sentenças rápido, baseado em expressões regulares, para textos em português.
+
+    Considera fim de sentença uma pontuação final ('.', '!', '?', '…') seguida de espaço e de
+    uma palavra iniciada por maiúscula ou dígito. Pontos após abreviações comuns
+    (ex: 'Sr.', 'Dra.', 'art.') ou iniciais (ex: 'F.') não encerram a sentença; abreviações
+    que também são palavras ('mar.', 'set.', 'no.') só quando escritas com maiúscula ou
+    seguidas de um número.
+    """
+    sentences: list[str] = []
+    start = 0
+    for boundary in _regexSentenceBoundary.finditer(text):
+        end = boundary.start()
+        if text[end] == '.' and not text.startswith('..', end):
+            lastWord = text[max(text.rfind(' ', start, end), start - 1) + 1:end].lstrip('"\'“«(')
+            lowerWord = lastWord.lower()
+            if lowerWord in _ptAbbreviations or (len(lastWord) == 1 and lastWord.isupper()):
+                continue
+            if lowerWord in _ptAmbiguousAbbreviations and \
+                    (lastWord[0].isupper() or text[boundary.end():boundary.end() + 1].isdigit()):
+                continue
+        sentence = text[start:boundary.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = boundary.end()
+
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+# Divisores de sentença disponíveis por nome em sequenceTaggingOnTheFly(sentenceSplitter=...)
+SENTENCE_SPLITTERS: dict[str, Callable[[str], list[str]]] = {
+    'punkt': punktSentenceSplitter,
+    'regex': regexSentenceSplitter,
+}
+
+
+class EntityStatistics:
+    """
+    Agregador de estatísticas de entidades nomeadas calculado em uma única passada:
+    contagem por texto da entidade, agrupamento por rótulo e histograma de n-gramas.
+
+    Agregados parciais (ex: um por arquivo) podem ser combinados com `merge` (ou `+`)
+    e removidos com `subtract` sem reprocessar os spans originais. O resultado de `entitiesAndAmount`,
+    `nGramsCount` e `uniqueLabels` é o mesmo que seria obtido com todos os spans de uma vez.
+    """
+
+    def __init__(self, spans_data: Iterable[tuple[str, str]] = ()):
+        """
+        Args:
+            spans_data: Iterável de tuplas (texto_do_span, tag_do_span).
+        """
+        self.textCounts: Counter = Counter() # texto -> ocorrências (independente da tag)
+        self.nGramCounts: Counter = Counter() # tamanho do n-grama -> ocorrências
+        self.entityKeys: dict[tuple[str, str], int] = {} # (texto, tag) -> ocorrências, na ordem da primeira ocorrência
+        self.add(spans_data)
+
+    def add(self, spans_data: Iterable[tuple[str, str]]) -> 'EntityStatistics':
+        """
+        Acumula novos spans (texto_do_span, tag_do_span) no agregado.
+        """
+        for span_text, tag in spans_data:
+            self.textCounts[span_text] += 1
+            self.nGramCounts[span_text.count(' ') + 1] += 1
+            self.entityKeys[(span_text, tag)] = self.entityKeys.get((span_text, tag), 0) + 1
+        return self
+
+    def merge(self, other: 'EntityStatistics') -> 'EntityStatistics':
+        """
+        Combina outro agregado neste (in-place), como se os spans dele viessem depois dos deste.
+        """
+        self.textCounts.update(other.textCounts)
+        self.nGramCounts.update(other.nGramCounts)
+        for key, amount in other.entityKeys.items():
+            self.entityKeys[key] = self.entityKeys.get(key, 0) + amount
+        return self
+
+    def subtract(self, other: 'EntityStatistics') -> 'EntityStatistics':
+        """
+        Remove deste agregado (in-place) um agregado combinado anteriormente com `merge`.
+        """
+        self.textCounts -= other.textCounts
+        self.nGramCounts -= other.nGramCounts
+        for key, amount in other.entityKeys.items():
+            remaining = self.entityKeys.get(key, 0) - amount
+            if remaining > 0:
+                self.entityKeys[key] = remaining
+            else:
+                self.entityKeys.pop(key, None)
+        return self
+
+    def __iadd__(self, other: 'EntityStatistics') -> 'EntityStatistics':
+        return self.merge(other)
+
+    def __add__(self, other: 'EntityStatistics') -> 'EntityStatistics':
+        return EntityStatistics().merge(self).merge(other)
+
+    def __len__(self) -> int:
+        return len(self.entityKeys)
+
+    def distinct(self) -> 'EntityStatistics':
+        """
+        Retorna um novo agregado com uma única ocorrência de cada par (texto, tag).
+        É a forma como cada arquivo contribui para o relatório geral (GeneralNamedEntities).
+        """
+        return EntityStatistics(self.entityKeys)
+
+    @classmethod
+    def combineDistinct(cls, statistics: Iterable['EntityStatistics']) -> 'EntityStatistics':
+        """
+        Agregado geral de vários arquivos/textos, na ordem dada: cada par (texto, tag) conta
+        uma vez por item (ver `distinct`).
+        """
+        general = cls()
+        for stats in statistics:
+            general.merge(stats.distinct())
+        return general
+
+    def entitiesAndAmount(self) -> list[tuple[str, str, str]]:
+        """
+        Lista de tuplas (texto_da_entidade, contagem, tag), na ordem da primeira ocorrência.
+        """
+        return [(text, str(self.textCounts[text]), tag) for text, tag in self.entityKeys]
+
+    def nGramsCount(self) -> list[str]:
+        """
+        Lista de strings "<n>-gram: <contagem>", ordenada pelo tamanho do n-grama.
+        """
+        return [f"{ng}-gram: {self.nGramCounts[ng]}" for ng in sorted(self.nGramCounts)]
+
+    def uniqueLabels(self) -> list[str]:
+        """
+        Lista ordenada das tags de entidade encontradas.
+        """
+        return sorted({tag for _, tag in self.entityKeys})
+
+    def entitiesByLabel(self) -> dict[str, list[tuple[str, str]]]:
+        """
+        Agrupa as entidades por tag: {tag: [(texto_da_entidade, contagem), ...]}, com as tags ordenadas.
+        """
+        grouped: dict[str, list[tuple[str, str]]] = {}
+        for text, count, tag in self.entitiesAndAmount():
+            grouped.setdefault(tag, []).append((text, count))
+        return {tag: grouped[tag] for tag in sorted(grouped)}
+
+    def reportLines(self) -> list[str]:
+        """
+        Linhas do relatório de entidades (formato dos arquivos NamedEntities-*.txt e
+        GeneralNamedEntities.txt): entidades por categoria seguidas da contagem de n-gramas.
+        """
+        report: list[str] = []
+        for label, entities in self.entitiesByLabel().items():
+            report.append(f'CATEGORY:{label}\n')
+            for text, count in entities:
+                report.append(f'{text}: {count}\n')
+            report.append('\n') # Linha em branco entre categorias
+
+        report.append('\n-------\n')
+        for nGramCount in self.nGramsCount():
+            report.append(f'{nGramCount}\n')
+        return report
+
+    def toPayload(self) -> dict:
+        """
+        Representação serializável em JSON (ver fromPayload), preservando a ordem das entidades.
+        """
+        return {'entities': [[text, tag, amount] for (text, tag), amount in self.entityKeys.items()],
+                'texts': list(self.textCounts.items()),
+                'nGrams': list(self.nGramCounts.items())}
+
+    @classmethod
+    def fromPayload(cls, payload: dict) -> 'EntityStatistics':
+        stats = cls()
+        stats.entityKeys = {(text, tag): amount for text, tag, amount in payload['entities']}
+        stats.textCounts = Counter(dict(payload['texts']))
+        stats.nGramCounts = Counter({int(ng): amount for ng, amount in payload['nGrams']})
+        return stats
+
+
+@lru_cache(maxsize=65536)
+def normalizeNameToken(token: str) -> str:
+    """
+    Forma normalizada de um token para busca na lista auxiliar de nomes:
+    sem acentos (unidecode) e sem distinção entre maiúsculas e minúsculas (casefold).
+    """
+    return unidecode(token).casefold()
+
+
+class AuxNamesIndex(frozenset):
+    """
+    Índice da lista auxiliar de nomes (ver PortugueseToolNER.buildAuxNamesIndex): um frozenset
+    com a forma normalizada (normalizeNameToken) de cada nome. Passado como `auxListNE`, é
+    usado como está; listas e conjuntos comuns são normalizados a cada chamada.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def fromNames(cls, names: Iterable[str]) -> 'AuxNamesIndex':
+        return cls(normalizeNameToken(name) for name in names if name)
+
+
+class GazetteerMatcher:
+    """
+    Gazetteer compilado para nomes com um ou mais tokens (ex: 'Manoel Francisco das Neves').
+
+    Os nomes são guardados como sequências de tokens normalizados (ver normalizeNameToken)
+    em um conjunto, junto com o conjunto de todos os seus prefixos, o que equivale a uma
+    trie sobre tokens com consulta O(1) por nível. Diferente da lista produzida por
+    getUniqueNames, que quebra os nomes em tokens isolados, o matcher só encontra a
+    sequência completa do nome. A busca percorre a sentença uma única vez; o custo por
+    posição é limitado pelo número de tokens do maior nome.
+
+    Pode ser passado como `auxListNE` nos métodos de tagging (com useAuxListNE=True), e
+    salvo/carregado do disco com `save` / `load`.
+    """
+
+    _TOKEN_SEP = '\x1f' # Separador de tokens dentro de um nome normalizado
+    _FORMAT_VERSION = 1
+
+    def __init__(self, names: Iterable[str] = (), listStopNames: Iterable[str] = ()):
+        """
+        Args:
+            names: Nomes (um ou mais tokens separados por espaço) a serem indexados.
+            listStopNames: Nomes que, sozinhos, não devem ser considerados (ex: 'da', 'de').
+        """
+        self.names: set[str] = set()
+        self.prefixes: set[str] = set()
+        self.maxNameLength: int = 0
+        self.stopNames: frozenset[str] = frozenset(normalizeNameToken(sN) for sN in listStopNames if sN)
+        self.addNames(names)
+
+    def addNames(self, names: Iterable[str]) -> 'GazetteerMatcher':
+        """
+        Adiciona nomes ao gazetteer.
+        """
+        for name in names:
+            tokens = [token for token in (normalizeNameToken(raw) for raw in name.split()) if token]
+            if not tokens or (len(tokens) == 1 and tokens[0] in self.stopNames):
+                continue
+            for length in range(1, len(tokens)):
+                self.prefixes.add(self._TOKEN_SEP.join(tokens[:length]))
+            self.names.add(self._TOKEN_SEP.join(tokens))
+            self.maxNameLength = max(self.maxNameLength, len(tokens))
+        return self
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return self._TOKEN_SEP.join(normalizeNameToken(token) for token in name.split()) in self.names
+
+    def findMatches(self, tokens: list[str], normalized: bool = False) -> list[tuple[int, int]]:
+        """
+        Encontra as ocorrências de nomes do gazetteer em uma sequência de tokens.
+
+        Para cada posição é considerada a ocorrência mais longa que começa nela; ocorrências
+        totalmente contidas em outra já encontrada são descartadas.
+
+        Args:
+            tokens: Tokens da sentença.
+            normalized: Se True, os tokens já estão normalizados.
+
+        Returns:
+            Lista de intervalos (início, fim) de posições de tokens, com fim exclusivo.
+        """
+        if not normalized:
+            tokens = [normalizeNameToken(token) for token in tokens]
+
+        matches: list[tuple[int, int]] = []
+        coveredUntil = 0
+        for start in range(len(tokens)):
+            key = ''
+            end = -1
+            for position in range(start, min(len(tokens), start + self.maxNameLength)):
+                key = tokens[position] if position == start else key + self._TOKEN_SEP + tokens[position]
+                if key in self.names:
+                    end = position + 1
+                if key not in self.prefixes:
+                    break
+            if end > coveredUntil:
+                matches.append((start, end))
+                coveredUntil = end
+        return matches
+
+    def save(self, filePath: str | Path):
+        """
+        Salva o gazetteer compilado em disco (JSON, UTF-8), para ser recarregado rapidamente
+        com `load`. Nomes e prefixos são gravados como duas strings únicas, que são apenas
+        divididas de volta na carga. Por ser só texto, o arquivo pode ser compartilhado
+        como dado: carregá-lo não executa código.
+        """
+        output_path = Path(filePath)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self._FORMAT_VERSION,
+                       'names': '\n'.join(sorted(self.names)),
+                       'prefixes': '\n'.join(sorted(self.prefixes)),
+                       'maxNameLength': self.maxNameLength,
+                       'stopNames': '\n'.join(sorted(self.stopNames))},
+                      f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, filePath: str | Path) -> 'GazetteerMatcher':
+        """
+        Carrega um gazetteer salvo com `save`.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não for encontrado.
+            ValueError: Se o arquivo não for de uma versão compatível.
+        """
+        try:
+            with open(filePath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Arquivo não encontrado: {filePath}")
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            data = None
+        if not isinstance(data, dict) or data.get('version') != cls._FORMAT_VERSION:
+            raise ValueError(f"Arquivo {filePath} não é um gazetteer compatível.")
+
+        try:
+            matcher = cls()
+            matcher.names = set(data['names'].split('\n')) if data['names'] else set()
+            matcher.prefixes = set(data['prefixes'].split('\n')) if data['prefixes'] else set()
+            matcher.maxNameLength = int(data['maxNameLength'])
+            matcher.stopNames = frozenset(data['stopNames'].split('\n')) if data['stopNames'] else frozenset()
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"Arquivo {filePath} não é um gazetteer compatível: {e}")
+        return matcher
+
+
+@dataclass
+class TaggedSentence:
+    """
+    Resultado do NER para uma única sentença, produzido pela API de streaming
+    (`iterTagSentences` / `iterTagFile`) e usado em `TaggingResult.sentences`
+    (`tagText` / `tagSentences` / `tagAsync`).
+
+    Attributes:
+        text: Texto original da sentença.
+        tokens: Tokens originais (tokenização do Flair).
+        labels: Rótulo predito para cada token.
+        maskedTokens: Tokens após o mascaramento (iguais a `tokens` se não houver máscara).
+        maskedTokenAndLabels: Linhas "token<sep>label" prontas para o formato CoNLL.
+        taggedString: Sentença pronta para o formato plain (mascarada ou com as tags do Flair).
+        spans: Entidades encontradas, como tuplas (texto_do_span, tag_do_span).
+    """
+    text: str
+    tokens: list[str] = field(default_factory=list)
+    labels: list[str] = field(default_factory=list)
+    maskedTokens: list[str] = field(default_factory=list)
+    maskedTokenAndLabels: list[str] = field(default_factory=list)
+    taggedString: str = ''
+    spans: list[tuple[str, str]] = field(default_factory=list)
+
+
+# Cache binário de corpus carregados e anotados (ver CoNLLCorpus.save / TaggedDocument.save).
+_CACHE_FORMAT_VERSION = 1
+
+def _fileContentHash(filePath: str | Path, chunkSize: int = 1 << 20) -> str:
+    """
+    Hash (BLAKE2b) do conteúdo de um arquivo, lido em blocos.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filePath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunkSize), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _cacheKey(*parts) -> str:
+    """
+    Combina as partes (convertidas para str) em uma chave de cache.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+def _packStrings(values: Iterable[str]) -> np.ndarray:
+    """
+    Codifica uma lista de strings (sem quebras de linha) como um único buffer UTF-8,
+    cada string terminada por '\\n'.
+    """
+    return np.frombuffer(''.join(value + '\n' for value in values).encode('utf-8'), dtype=np.uint8)
+
+def _unpackStrings(data: np.ndarray) -> list[str]:
+    return data.tobytes().decode('utf-8').split('\n')[:-1]
+
+def _packSentences(sentences: list[list[str]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Codifica uma lista de listas de strings como (vocabulário, ids, offsets por sentença).
+    """
+    index: dict[str, int] = {}
+    ids = array('i', (index.setdefault(value, len(index)) for sentence in sentences for value in sentence))
+    offsets = array('q', [0])
+    for sentence in sentences:
+        offsets.append(offsets[-1] + len(sentence))
+    return (_packStrings(index),
+            np.frombuffer(ids, dtype=np.int32) if ids else np.zeros(0, dtype=np.int32),
+            np.frombuffer(offsets, dtype=np.int64))
+
+def _unpackSentences(vocab: np.ndarray, ids: np.ndarray, offsets: np.ndarray) -> list[list[str]]:
+    values = _unpackStrings(vocab)
+    ids = ids.tolist()
+    offsets = offsets.tolist()
+    return [[values[valueId] for valueId in ids[start:end]] for start, end in zip(offsets, offsets[1:])]
+
+def _saveArrays(filePath: str | Path, compress: bool, **arrays: np.ndarray):
+    """
+    Grava os arrays em um arquivo .npz de forma atômica (arquivo temporário + os.replace),
+    para que leitores concorrentes nunca vejam um cache pela metade.
+    """
+    output_path = Path(filePath)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        (np.savez_compressed if compress else np.savez)(f, formatVersion=np.array(_CACHE_FORMAT_VERSION), **arrays)
+    os.replace(tmp_path, output_path)
+
+def _loadArrays(filePath: str | Path) -> dict[str, np.ndarray]:
+    """
+    Lê um arquivo gravado por `_saveArrays`.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não for encontrado.
+        ValueError: Se o arquivo não for de uma versão compatível.
+    """
+    try:
+        with np.load(filePath, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Arquivo não encontrado: {filePath}")
+    except (OSError, EOFError) as e:
+        raise ValueError(f"Arquivo {filePath} não é um cache compatível: {e}")
+    if 'formatVersion' not in arrays or int(arrays['formatVersion']) != _CACHE_FORMAT_VERSION:
+        raise ValueError(f"Arquivo {filePath} não é um cache compatível.")
+    return arrays
+
+
+@dataclass
+class TaggedDocument:
+    """
+    Resultado do tagging de um arquivo/texto inteiro, na forma usada por
+    `sequenceTaggingOnText` para gerar os arquivos de saída e as estatísticas.
+    Pode ser salvo em um formato binário compacto (`save` / `load`), usado como cache.
+
+    Attributes:
+        tokens: Tokens de cada sentença (mascarados, se for o caso).
+        tokenAndLabels: Linhas "token<sep>label" de cada sentença.
+        plainSentences: Cada sentença pronta para o formato plain.
+        namedEntities: Entidades encontradas, como tuplas (texto_do_span, tag_do_span).
+        numTokens: Quantidade de tokens originais (antes do mascaramento).
+    """
+    tokens: list[list[str]] = field(default_factory=list)
+    tokenAndLabels: list[list[str]] = field(default_factory=list)
+    plainSentences: list[str] = field(default_factory=list)
+    namedEntities: list[tuple[str, str]] = field(default_factory=list)
+    numTokens: int = 0
+
+    def save(self, filePath: str | Path, compress: bool = False):
+        """
+        Salva o documento em um .npz: vocabulários em buffers UTF-8 e ids/offsets em arrays int.
+        """
+        tokenVocab, tokenIds, tokenOffsets = _packSentences(self.tokens)
+        lineVocab, lineIds, lineOffsets = _packSentences(self.tokenAndLabels)
+        _saveArrays(filePath, compress,
+                    tokenVocab=tokenVocab, tokenIds=tokenIds, tokenOffsets=tokenOffsets,
+                    lineVocab=lineVocab, lineIds=lineIds, lineOffsets=lineOffsets,
+                    plainSentences=_packStrings(self.plainSentences),
+                    spanTexts=_packStrings(text for text, _ in self.namedEntities),
+                    spanTags=_packStrings(tag for _, tag in self.namedEntities),
+                    numTokens=np.array(self.numTokens, dtype=np.int64))
+
+    @classmethod
+    def load(cls, filePath: str | Path) -> 'TaggedDocument':
+        """
+        Carrega um documento salvo com `save`.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não for encontrado.
+            ValueError: Se o arquivo não for de uma versão compatível.
+        """
+        arrays = _loadArrays(filePath)
+        return cls(tokens=_unpackSentences(arrays['tokenVocab'], arrays['tokenIds'], arrays['tokenOffsets']),
+                   tokenAndLabels=_unpackSentences(arrays['lineVocab'], arrays['lineIds'], arrays['lineOffsets']),
+                   plainSentences=_unpackStrings(arrays['plainSentences']),
+                   namedEntities=list(zip(_unpackStrings(arrays['spanTexts']), _unpackStrings(arrays['spanTags']))),
+                   numTokens=int(arrays['numTokens']))
+
+
+@dataclass
+class TaggingResult:
+    """
+    Resultado de `tagText` / `tagSentences` / `tagAsync` para um texto, independente de
+    qualquer estado da instância de PortugueseToolNER.
+
+    Attributes:
+        identifier: Identificador do texto (opcional).
+        sentences: Um TaggedSentence por sentença, na ordem de entrada.
+        statistics: Estatísticas das entidades encontradas no texto.
+    """
+    identifier: int | str | None = None
+    sentences: list[TaggedSentence] = field(default_factory=list)
+    statistics: EntityStatistics = field(default_factory=EntityStatistics)
+
+    @property
+    def tokens(self) -> list[list[str]]:
+        return [sentence.tokens for sentence in self.sentences]
+
+    @property
+    def labels(self) -> list[list[str]]:
+        return [sentence.labels for sentence in self.sentences]
+
+    @property
+    def maskedTokens(self) -> list[list[str]]:
+        return [sentence.maskedTokens for sentence in self.sentences]
+
+    @property
+    def taggedStrings(self) -> list[str]:
+        """
+        Sentenças no formato plain (mascaradas ou com as tags do Flair).
+        """
+        return [sentence.taggedString for sentence in self.sentences]
+
+    @property
+    def spans(self) -> list[tuple[str, str]]:
+        return [span for sentence in self.sentences for span in sentence.spans]
+
+    def toDocument(self) -> TaggedDocument:
+        return TaggedDocument(tokens=self.maskedTokens,
+                              tokenAndLabels=[sentence.maskedTokenAndLabels for sentence in self.sentences],
+                              plainSentences=self.taggedStrings,
+                              namedEntities=self.spans,
+                              numTokens=sum(len(sentence.tokens) for sentence in self.sentences))
+
+
+class TaggingCollector:
+    """
+    Acumulador opcional para os resultados de `tagText` / `tagSentences`, passado
+    explicitamente em `collector=`. Mantém, por identificador, as sentenças tageadas e as
+    estatísticas de entidades, além do agregado geral (cada par (texto, tag) conta uma
+    vez por identificador, como em sequenceTaggingOnText). Pode ser compartilhado entre threads.
+    """
+
+    def __init__(self):
+        self.taggedFilesDict: dict[str, list[str]] = {}
+        self.entityStatisticsByFileDict: dict[str, EntityStatistics] = {}
+        self.generalEntityStatistics: EntityStatistics = EntityStatistics()
+        self._lock = threading.Lock()
+
+    def add(self, result: TaggingResult):
+        """
+        Registra um resultado. Se o identificador já tinha sido registrado, a contribuição
+        anterior é substituída.
+
+        Raises:
+            ValueError: Se o resultado não tiver identificador.
+        """
+        if result.identifier is None:
+            raise ValueError('Para usar um TaggingCollector, informe o "identifier" do texto.')
+        identifier = str(result.identifier)
+        with self._lock:
+            replaced = identifier in self.entityStatisticsByFileDict
+            self.entityStatisticsByFileDict[identifier] = result.statistics
+            self.taggedFilesDict[identifier] = result.taggedStrings
+            if replaced: # Refaz o agregado para manter a ordem das entidades pela posição do identificador
+                self.generalEntityStatistics = EntityStatistics.combineDistinct(
+                    self.entityStatisticsByFileDict.values())
+            else:
+                self.generalEntityStatistics.merge(result.statistics.distinct())
+
+    @property
+    def namedEntitiesByFileDict(self) -> dict[str, list]:
+        with self._lock:
+            return {identifier: stats.entitiesAndAmount()
+                    for identifier, stats in self.entityStatisticsByFileDict.items()}
+
+    @property
+    def namedEntitiesDict(self) -> dict[str, list]:
+        with self._lock:
+            if not len(self.generalEntityStatistics):
+                return {}
+            return {'allFiles': self.generalEntityStatistics.entitiesAndAmount()}
+
+    def reportLines(self) -> list[str]:
+        """
+        Relatório geral de entidades (mesmo formato do GeneralNamedEntities.txt).
+        """
+        with self._lock:
+            return self.generalEntityStatistics.reportLines()
+
+
+def _tokenLabel(token, labelType: str = 'label') -> str:
+    """
+    Rótulo predito de um token, tanto na API antiga do Flair (get_tag) quanto na atual (get_label).
+    """
+    getLabel = getattr(token, 'get_label', None) or token.get_tag
+    return getLabel(labelType).value
+
+
+class _PredictedLabel:
+    __slots__ = ('value',)
+
+    def __init__(self, value: str):
+        self.value = value
+
+
+class _PredictedToken:
+    __slots__ = ('text', 'idx', '_label')
+
+    def __init__(self, text: str, idx: int, value: str):
+        self.text = text
+        self.idx = idx
+        self._label = _PredictedLabel(value)
+
+    def get_tag(self, label_type: str = 'label') -> _PredictedLabel:
+        return self._label
+
+    get_label = get_tag
+
+
+class _PredictedSpan:
+    __slots__ = ('tokens', 'text', 'tag')
+
+    def __init__(self, tokens: list[_PredictedToken], text: str, tag: str):
+        self.tokens = tokens
+        self.text = text
+        self.tag = tag
+
+    def get_tag(self, label_type: str = 'label') -> _PredictedLabel:
+        return _PredictedLabel(self.tag)
+
+
+class _PredictedSentence:
+    """
+    Predição de uma sentença guardada no PredictionCache.
+
+    Expõe a parte da interface de flair.data.Sentence usada pelo tagging (`tokens` com
+    `text`/`idx`/`get_tag`, `get_spans` e `to_tagged_string`), com os valores copiados
+    da Sentence anotada pelo modelo, de modo que máscaras e saídas são idênticas às
+    de uma predição sem cache.
+    """
+    __slots__ = ('tokens', '_spans', '_taggedString')
+
+    def __init__(self, tokens: list[_PredictedToken], spans: list[_PredictedSpan], taggedString: str):
+        self.tokens = tokens
+        self._spans = spans
+        self._taggedString = taggedString
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def get_spans(self, label_type: str = 'label') -> list[_PredictedSpan]:
+        return self._spans
+
+    def to_tagged_string(self) -> str:
+        return self._taggedString
+
+    @classmethod
+    def fromPayload(cls, payload: dict) -> '_PredictedSentence':
+        tokens = [_PredictedToken(text, idx, value)
+                  for text, idx, value in zip(payload['tokens'], payload['idx'], payload['labels'])]
+        spans = [_PredictedSpan([tokens[position] for position in positions], text, tag)
+                 for positions, text, tag in payload['spans']]
+        return cls(tokens, spans, payload['tagged'])
+
+    @staticmethod
+    def payloadFromSentence(sentence: Sentence) -> dict:
+        """
+        Extrai de uma Sentence anotada os dados necessários para reconstruí-la com `fromPayload`.
+        """
+        tokens = sentence.tokens
+        position = {id(token): i for i, token in enumerate(tokens)}
+        return {'tokens': [token.text for token in tokens],
+                'idx': [token.idx for token in tokens],
+                'labels': [_tokenLabel(token) for token in tokens],
+                'spans': [[[position[id(token)] for token in span.tokens], span.text, span.tag]
+                          for span in sentence.get_spans(label_type='label')],
+                'tagged': sentence.to_tagged_string()}
+
+
+class PredictionCache:
+    """
+    Cache de predições por sentença, endereçado pelo conteúdo.
+
+    A chave combina o texto da sentença (sem espaços nas pontas, exatamente o texto
+    entregue ao Flair), a opção `useTokenizer_flair` e a impressão digital do modelo
+    (ver PortugueseToolNER.getModelFingerprint). O valor guarda os rótulos dos tokens,
+    os spans e a sentença tageada.
+
+    Há dois níveis: um LRU em memória limitado a `maxSize` sentenças e, opcionalmente,
+    um arquivo SQLite persistente (`persistentPath`), que pode ser compartilhado entre
+    execuções e entre processos.
+
+    Contadores: `hits` (sentenças atendidas sem executar o modelo, incluindo repetições
+    dentro de um mesmo lote), `misses` (sentenças enviadas ao modelo) e `persistentHits`
+    (chaves encontradas apenas no SQLite).
+
+    Ative com PortugueseToolNER.enablePredictionCache().
+    """
+
+    def __init__(self, maxSize: int = 100_000, persistentPath: str | Path | None = None):
+        """
+        Args:
+            maxSize: Quantidade máxima de sentenças no LRU em memória.
+            persistentPath: Caminho do arquivo SQLite (opcional).
+        """
+        if maxSize < 1:
+            raise ValueError('"maxSize" deve ser maior ou igual a 1.')
+        self.maxSize = maxSize
+        self.persistentPath = Path(persistentPath) if persistentPath else None
+        self.hits = 0
+        self.misses = 0
+        self.persistentHits = 0
+        self._entries: OrderedDict[str, _PredictedSentence] = OrderedDict()
+        self._lock = threading.Lock() # LRU e conexão SQLite podem ser usados por outras threads (ex: tagAsync)
+        self._connection: sqlite3.Connection | None = None
+        if self.persistentPath is not None:
+            self.persistentPath.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.persistentPath, timeout=60, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS predictions (key TEXT PRIMARY KEY, payload TEXT NOT NULL)')
+            self._connection.commit()
+
+    @staticmethod
+    def key(sentenceText: str, useTokenizer_flair: bool, modelFingerprint: str) -> str:
+        return _cacheKey(modelFingerprint, int(useTokenizer_flair), sentenceText.strip())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def getMany(self, keys: Iterable[str]) -> dict[str, _PredictedSentence]:
+        """
+        Busca várias chaves, primeiro no LRU e depois no SQLite. Chaves encontradas no SQLite
+        são promovidas ao LRU. Chaves ausentes não aparecem no resultado.
+        """
+        with self._lock:
+            return self.__getMany(keys)
+
+    def __getMany(self, keys: Iterable[str]) -> dict[str, _PredictedSentence]:
+        found: dict[str, _PredictedSentence] = {}
+        pending: list[str] = []
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                pending.append(key)
+            else:
+                self._entries.move_to_end(key)
+                found[key] = entry
+
+        if pending and self._connection is not None:
+            loaded: dict[str, _PredictedSentence] = {}
+            for start in range(0, len(pending), 500): # Limite de parâmetros por consulta do SQLite
+                chunk = pending[start:start + 500]
+                rows = self._connection.execute(
+                    f"SELECT key, payload FROM predictions WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                for key, payload in rows:
+                    loaded[key] = _PredictedSentence.fromPayload(json.loads(payload))
+            self.persistentHits += len(loaded)
+            self.__remember(loaded)
+            found.update(loaded)
+        return found
+
+    def putMany(self, payloads: dict[str, dict]) -> dict[str, _PredictedSentence]:
+        """
+        Guarda novas predições (chave -> payload de `_PredictedSentence.payloadFromSentence`)
+        nos dois níveis e retorna as entradas criadas.
+        """
+        entries = {key: _PredictedSentence.fromPayload(payload) for key, payload in payloads.items()}
+        with self._lock:
+            self.__remember(entries)
+            if self._connection is not None and payloads:
+                with self._connection:
+                    self._connection.executemany(
+                        'INSERT OR REPLACE INTO predictions (key, payload) VALUES (?, ?)',
+                        [(key, json.dumps(payload, ensure_ascii=False, separators=(',', ':')))
+                         for key, payload in payloads.items()])
+        return entries
+
+    def __remember(self, entries: dict[str, _PredictedSentence]):
+        self._entries.update(entries)
+        for key in entries:
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+
+    def recordLookups(self, hits: int, misses: int):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'persistentHits': self.persistentHits,
+                'entries': len(self._entries)}
+
+    def clear(self, persistent: bool = False):
+        """
+        Esvazia o LRU em memória (e o SQLite, se persistent=True) e zera os contadores.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.persistentHits = 0
+            if persistent and self._connection is not None:
+                with self._connection:
+                    self._connection.execute('DELETE FROM predictions')
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_MANIFEST_FILE_NAME = 'ptToolNER-manifest.sqlite'
+
+class TaggingManifest:
+    """
+    Manifesto das execuções incrementais de sequenceTaggingOnText(incremental=True), guardado
+    em SQLite na pasta de saída. Para cada arquivo rotulado: tamanho, mtime, hash do conteúdo
+    (opcional), impressão digital do modelo, chave das opções e as estatísticas de entidades
+    do arquivo (EntityStatistics), usadas para refazer o relatório geral sem novo tagging.
+
+    Cada arquivo é registrado assim que as suas saídas são gravadas, então uma execução
+    interrompida é retomada a partir dos arquivos que faltaram.
+    """
+
+    def __init__(self, filePath: str | Path):
+        self.filePath = Path(filePath)
+        self.filePath.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.filePath, timeout=60, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS files (name TEXT PRIMARY KEY, size INTEGER NOT NULL, '
+            'mtimeNs INTEGER NOT NULL, contentHash TEXT, modelFingerprint TEXT NOT NULL, '
+            'optionsKey TEXT NOT NULL, statistics TEXT, updatedAt REAL NOT NULL)')
+        self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def plan(self,
+             files: list[Path],
+             modelFingerprint: str,
+             optionsKey: str,
+             changeDetection: str = 'mtime'
+            ) -> tuple[list[Path], dict[str, EntityStatistics | None], dict[str, tuple[int, int, str | None]], list[str]]:
+        """
+        Separa os arquivos a rotular dos que não mudaram desde o último registro e remove
+        do manifesto os arquivos que não existem mais.
+
+        Args:
+            files: Arquivos da pasta de entrada.
+            modelFingerprint: Impressão digital do modelo atual.
+            optionsKey: Chave das opções de tagging e de saída atuais.
+            changeDetection: 'mtime' (tamanho e mtime) ou 'hash' (se tamanho ou mtime mudarem,
+                             compara o hash do conteúdo antes de rotular de novo).
+
+        Returns:
+            Tupla (arquivos a rotular, {nome: estatísticas guardadas} dos inalterados,
+            {nome: (tamanho, mtime_ns, hash ou None)} dos arquivos a rotular, para `record`,
+            nomes dos arquivos removidos do manifesto).
+        """
+        if changeDetection not in ('mtime', 'hash'):
+            raise ValueError(f'"changeDetection" deve ser "mtime" ou "hash", e não "{changeDetection}".')
+        with self._lock:
+            rows = {name: row for name, *row in self._connection.execute(
+                'SELECT name, size, mtimeNs, contentHash, modelFingerprint, optionsKey, statistics FROM files')}
+
+        toTag: list[Path] = []
+        unchanged: dict[str, EntityStatistics | None] = {}
+        fileStates: dict[str, tuple[int, int, str | None]] = {}
+        touched: list[tuple[int, str | None, str]] = []
+        for file_path in files:
+            stat = file_path.stat()
+            state = (stat.st_size, stat.st_mtime_ns, None)
+            row = rows.get(file_path.name)
+            current = row is not None and row[3] == modelFingerprint and row[4] == optionsKey
+            if current and (row[0], row[1]) != state[:2]:
+                current = False
+                if changeDetection == 'hash':
+                    state = (*state[:2], _fileContentHash(file_path))
+                    if row[2] == state[2]: # Conteúdo igual (ex: arquivo copiado ou "tocado")
+                        current = True
+                        touched.append((state[1], state[2], file_path.name))
+            if current:
+                unchanged[file_path.name] = EntityStatistics.fromPayload(json.loads(row[5])) if row[5] else None
+            else:
+                if changeDetection == 'hash' and state[2] is None:
+                    state = (*state[:2], _fileContentHash(file_path))
+                toTag.append(file_path)
+                fileStates[file_path.name] = state
+
+        names = {file_path.name for file_path in files}
+        removed = [name for name in rows if name not in names]
+        with self._lock, self._connection:
+            self._connection.executemany('UPDATE files SET mtimeNs = ?, contentHash = ? WHERE name = ?', touched)
+            self._connection.executemany('DELETE FROM files WHERE name = ?', [(name,) for name in removed])
+        return toTag, unchanged, fileStates, removed
+
+    def record(self,
+               name: str,
+               fileState: tuple[int, int, str | None],
+               modelFingerprint: str,
+               optionsKey: str,
+               statistics: EntityStatistics | None):
+        """
+        Registra um arquivo rotulado (com as saídas já gravadas).
+        """
+        payload = json.dumps(statistics.toPayload(), ensure_ascii=False, separators=(',', ':')) \
+            if statistics is not None else None
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO files (name, size, mtimeNs, contentHash, modelFingerprint, optionsKey, '
+                'statistics, updatedAt) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (name, *fileState, modelFingerprint, optionsKey, payload, time.time()))
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def _iterInputFiles(rootFolderPath: str | Path, fileExtension: str = '.txt', recursive: bool = True) -> Iterator[str]:
+    """
+    Enumera de forma preguiçosa (os.scandir, uma pasta por vez) os arquivos com a extensão
+    informada, como caminhos relativos no formato POSIX ('sub/arquivo.txt'). A ordem é
+    determinística: entradas de cada pasta ordenadas pelo nome, arquivos antes das subpastas.
+    """
+    root = os.fspath(rootFolderPath)
+    pending = ['']
+    while pending:
+        relativeDir = pending.pop()
+        with os.scandir(os.path.join(root, relativeDir) if relativeDir else root) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+        subdirs = []
+        for entry in entries:
+            relativePath = f"{relativeDir}/{entry.name}" if relativeDir else entry.name
+            if entry.is_file() and os.path.splitext(entry.name)[1] == fileExtension:
+                yield relativePath
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                subdirs.append(relativePath)
+        pending.extend(reversed(subdirs))
+
+
+# Lotes gravados por transação ao criar a fila (DistributedTaggingQueue.seed)
+_SEED_BATCHES_PER_TRANSACTION = 32
+
+class DistributedTaggingQueue:
+    """
+    Fila de trabalho em SQLite, no disco compartilhado, para rotular uma pasta a partir de
+    vários nós (máquinas ou processos) sem serviço coordenador
+    (ver PortugueseToolNER.sequenceTaggingDistributed).
+
+    O primeiro nó divide os arquivos em lotes (`seed`), gravados em transações curtas enquanto
+    a enumeração avança: os demais nós já podem reservar os lotes gravados. Cada nó reserva
+    um lote por vez (`claim`) por `leaseSeconds`, renovando a reserva enquanto trabalha
+    (`renew` / `keepLeased`); lotes com reserva vencida (ex: nó que caiu) voltam a ficar disponíveis. Ao
+    concluir um lote (`complete`), as estatísticas de entidades de cada arquivo são gravadas
+    na mesma transação, para o relatório geral (`iterStatistics`). Quando todos os lotes
+    estão concluídos, `finish` indica a um único nó que ele deve gerar o relatório geral.
+
+    Usa o journal padrão do SQLite (rollback), e não WAL, que não funciona em sistemas de
+    arquivos de rede; o sistema de arquivos compartilhado precisa ter travamento de
+    arquivos confiável (ex: NFSv4 com locks).
+    """
+
+    def __init__(self, filePath: str | Path, timeout: float = 600.0):
+        self.filePath = Path(filePath)
+        self.filePath.parent.mkdir(parents=True, exist_ok=True)
+        # A reserva é renovada por uma thread (keepLeased): a conexão é compartilhada sob o lock
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(self.filePath, timeout=timeout, isolation_level=None,
+                                           check_same_thread=False)
+        with self.__transaction():
+            self._connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS batches (batchId INTEGER PRIMARY KEY, files TEXT NOT NULL, "
+                "status TEXT NOT NULL DEFAULT 'pending', owner TEXT, leaseExpires REAL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, finishedAt REAL)")
+            self._connection.execute('CREATE INDEX IF NOT EXISTS batchesByStatus ON batches (status, batchId)')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS fileStatistics (position INTEGER PRIMARY KEY, '
+                'path TEXT NOT NULL, statistics TEXT)')
+
+    @contextmanager
+    def __transaction(self):
+        # BEGIN IMMEDIATE reserva a escrita já no início: dois nós nunca reservam o mesmo lote
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+
+    def seed(self,
+             files: Iterable[str],
+             batchSize: int,
+             optionsKey: str,
+             nodeId: str = '',
+             leaseSeconds: float = 600.0) -> bool:
+        """
+        Cria os lotes, se a fila ainda estiver vazia (ou retoma a criação, se o nó que a
+        começou parou de renová-la por mais de `leaseSeconds`).
+
+        A enumeração de `files` acontece fora das transações: a cada
+        _SEED_BATCHES_PER_TRANSACTION lotes, eles são gravados e a fila fica liberada
+        para os outros nós. Enquanto a criação não termina, a fila fica no estado
+        'seeding' (ver isSeeding) e não é dada como concluída.
+
+        Args:
+            files: Caminhos relativos dos arquivos, na ordem do relatório geral. A enumeração
+                   precisa ser determinística (a retomada pula os arquivos já gravados).
+            batchSize: Arquivos por lote.
+            optionsKey: Chave do modelo e das opções de tagging; todos os nós precisam usar a mesma.
+            nodeId: Identificador do nó que cria os lotes.
+            leaseSeconds: Prazo para outro nó retomar a criação, se este parar.
+
+        Returns:
+            True se os lotes foram criados (ou concluídos) por esta chamada, False se outro nó
+            já os criou ou ainda os está criando.
+
+        Raises:
+            ValueError: Se a fila foi criada com outro modelo ou outras opções.
+        """
+        if batchSize < 1:
+            raise ValueError('"batchSize" deve ser maior ou igual a 1.')
+        with self.__transaction():
+            meta = dict(self._connection.execute('SELECT key, value FROM meta'))
+            if 'optionsKey' not in meta:
+                seeded = 0
+                self._connection.executemany('INSERT INTO meta (key, value) VALUES (?, ?)',
+                                             [('optionsKey', optionsKey), ('files', '0'),
+                                              ('createdAt', str(time.time())), ('state', 'seeding')])
+            elif meta['optionsKey'] != optionsKey:
+                raise ValueError(f'A fila {self.filePath} foi criada com outro modelo ou outras opções de tagging.')
+            elif meta.get('state', 'ready') == 'ready' or float(meta.get('seedExpires', 0)) >= time.time():
+                return False
+            else:
+                seeded = int(meta['files']) # Retoma a criação interrompida de outro nó
+            self.__renewSeeding(nodeId, leaseSeconds)
+
+        batches: list[str] = []
+        batch: list[tuple[int, str]] = []
+        position = seeded
+        for position, relativePath in enumerate(islice(files, seeded, None), start=seeded + 1):
+            batch.append((position - 1, relativePath))
+            if len(batch) == batchSize:
+                batches.append(json.dumps(batch))
+                batch = []
+                if len(batches) == _SEED_BATCHES_PER_TRANSACTION:
+                    if not self.__storeSeedBatches(batches, position, nodeId, leaseSeconds):
+                        return False
+                    batches = []
+        if batch:
+            batches.append(json.dumps(batch))
+        return self.__storeSeedBatches(batches, position, nodeId, leaseSeconds, last=True)
+
+    def __renewSeeding(self, nodeId: str, leaseSeconds: float):
+        self._connection.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                                     [('seedOwner', nodeId), ('seedExpires', str(time.time() + leaseSeconds))])
+
+    def __storeSeedBatches(self,
+                           batches: list[str],
+                           files: int,
+                           nodeId: str,
+                           leaseSeconds: float,
+                           last: bool = False) -> bool:
+        """
+        Grava um bloco de lotes de `seed` em uma transação. Retorna False se outro nó
+        assumiu a criação dos lotes (reserva vencida).
+        """
+        with self.__transaction():
+            row = self._connection.execute("SELECT value FROM meta WHERE key = 'seedOwner'").fetchone()
+            if row is None or row[0] != nodeId:
+                return False
+            self._connection.executemany('INSERT INTO batches (files) VALUES (?)', [(batch,) for batch in batches])
+            self._connection.execute("UPDATE meta SET value = ? WHERE key = 'files'", (str(files),))
+            if last:
+                self._connection.execute("UPDATE meta SET value = 'ready' WHERE key = 'state'")
+                self._connection.execute("DELETE FROM meta WHERE key IN ('seedOwner', 'seedExpires')")
+            else:
+                self.__renewSeeding(nodeId, leaseSeconds)
+        return True
+
+    def isSeeding(self) -> bool:
+        """
+        True enquanto os lotes ainda estão sendo criados por algum nó.
+        """
+        row = self._connection.execute("SELECT value FROM meta WHERE key = 'state'").fetchone()
+        return row is not None and row[0] == 'seeding'
+
+    def claim(self, nodeId: str, leaseSeconds: float) -> tuple[int, list[tuple[int, str]]] | None:
+        """
+        Reserva o próximo lote pendente (ou com reserva vencida).
+
+        Returns:
+            (id_do_lote, [(posição, caminho_relativo), ...]) ou None se não houver lote disponível.
+        """
+        now = time.time()
+        with self.__transaction():
+            row = self._connection.execute(
+                "SELECT batchId, files FROM batches WHERE status = 'pending' "
+                "OR (status = 'leased' AND leaseExpires < ?) ORDER BY batchId LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE batches SET status = 'leased', owner = ?, leaseExpires = ?, attempts = attempts + 1 "
+                "WHERE batchId = ?", (nodeId, now + leaseSeconds, row[0]))
+        return row[0], [tuple(item) for item in json.loads(row[1])]
+
+    def renew(self, batchId: int, nodeId: str, leaseSeconds: float) -> bool:
+        """
+        Renova a reserva de um lote. Retorna False se o lote não está mais reservado por este nó.
+        """
+        with self.__transaction():
+            cursor = self._connection.execute(
+                "UPDATE batches SET leaseExpires = ? WHERE batchId = ? AND owner = ? AND status = 'leased'",
+                (time.time() + leaseSeconds, batchId, nodeId))
+        return cursor.rowcount == 1
+
+    @contextmanager
+    def keepLeased(self, batchId: int, nodeId: str, leaseSeconds: float):
+        """
+        Renova a reserva do lote a cada `leaseSeconds / 3`, em uma thread, enquanto o bloco
+        `with` executa (inclusive durante um arquivo demorado). Produz um threading.Event
+        que é ativado se a reserva for perdida (ex: venceu e o lote foi reservado por outro nó).
+        """
+        stop, lost = threading.Event(), threading.Event()
+
+        def renewLoop():
+            while not stop.wait(leaseSeconds / 3):
+                if not self.renew(batchId, nodeId, leaseSeconds):
+                    lost.set()
+                    return
+
+        renewer = threading.Thread(target=renewLoop, name=f'pToolNER-lease-{batchId}', daemon=True)
+        renewer.start()
+        try:
+            yield lost
+        finally:
+            stop.set()
+            renewer.join()
+
+    def release(self, batchId: int, nodeId: str):
+        """
+        Devolve um lote à fila (ex: após um erro no nó).
+        """
+        with self.__transaction():
+            self._connection.execute(
+                "UPDATE batches SET status = 'pending', owner = NULL, leaseExpires = NULL "
+                "WHERE batchId = ? AND owner = ? AND status = 'leased'", (batchId, nodeId))
+
+    def complete(self,
+                 batchId: int,
+                 nodeId: str,
+                 statistics: dict[int, tuple[str, EntityStatistics | None]]) -> bool:
+        """
+        Conclui um lote, gravando as estatísticas de cada arquivo ({posição: (caminho, estatísticas)}).
+        Um lote já concluído por outro nó (reserva vencida) não é alterado.
+
+        Returns:
+            True se o lote foi concluído por esta chamada.
+        """
+        with self.__transaction():
+            cursor = self._connection.execute(
+                "UPDATE batches SET status = 'done', owner = ?, finishedAt = ? WHERE batchId = ? AND status != 'done'",
+                (nodeId, time.time(), batchId))
+            if cursor.rowcount == 0:
+                return False
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO fileStatistics (position, path, statistics) VALUES (?, ?, ?)',
+                [(position, path,
+                  json.dumps(stats.toPayload(), ensure_ascii=False, separators=(',', ':')) if stats is not None else None)
+                 for position, (path, stats) in statistics.items()])
+        return True
+
+    def finish(self, nodeId: str) -> bool:
+        """
+        Verifica se a fila terminou (lotes todos criados e concluídos, inclusive quando não
+        há nenhum arquivo). Apenas a primeira chamada após o término retorna True: o nó que
+        a recebe gera o relatório geral.
+        """
+        with self.__transaction():
+            meta = dict(self._connection.execute('SELECT key, value FROM meta'))
+            if 'optionsKey' not in meta or meta.get('state', 'ready') != 'ready' or 'finishedBy' in meta:
+                return False
+            if self._connection.execute("SELECT 1 FROM batches WHERE status != 'done' LIMIT 1").fetchone():
+                return False
+            self._connection.execute("INSERT INTO meta (key, value) VALUES ('finishedBy', ?)", (nodeId,))
+        return True
+
+    def progress(self) -> dict[str, int]:
+        """
+        Quantidade de lotes por situação ('pending', 'leased', 'done'), total de arquivos
+        enumerados e 'seeding' (1 enquanto os lotes ainda estão sendo criados).
+        """
+        counts = {'pending': 0, 'leased': 0, 'done': 0}
+        counts.update(self._connection.execute('SELECT status, COUNT(*) FROM batches GROUP BY status'))
+        row = self._connection.execute("SELECT value FROM meta WHERE key = 'files'").fetchone()
+        counts['files'] = int(row[0]) if row else 0
+        counts['seeding'] = int(self.isSeeding())
+        return counts
+
+    def iterStatistics(self) -> Iterator[tuple[str, EntityStatistics | None]]:
+        """
+        Estatísticas de entidades dos arquivos concluídos, na ordem da enumeração.
+        """
+        with self._lock:
+            rows = self._connection.execute('SELECT path, statistics FROM fileStatistics ORDER BY position')
+            for path, payload in rows:
+                yield path, EntityStatistics.fromPayload(json.loads(payload)) if payload is not None else None
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def _parseCoNLLLine(line: str, sepTokenTag: str, predicted: bool) -> tuple[str, ...] | None:
+    """
+    Interpreta uma linha CoNLL com as mesmas regras de loadCorpusInCoNLLFormat.
+
+    Returns:
+        (token, tag) ou, se `predicted`, (token, chave, predição). None para linhas vazias ou malformadas.
+    """
+    parts = line.strip().split(sepTokenTag)
+    if not parts or not parts[0]:
+        return None
+    token = parts[0].strip()
+    if predicted:
+        if len(parts) < 3:
+            return None
+        key, prediction = parts[1].strip(), parts[2].strip()
+        return (token, key, prediction) if token and key and prediction else None
+    if len(parts) < 2:
+        return None
+    tag = parts[-1].strip() # Pega o último elemento como tag
+    return (token, tag) if token and tag else None
+
+
+class _CorpusSentencesView(Sequence):
+    """
+    Visão somente leitura, no formato lista de listas, de uma coluna de um CoNLLCorpus.
+    Cada sentença é montada apenas quando acessada; nada é materializado antecipadamente.
+    """
+
+    def __init__(self, corpus: 'CoNLLCorpus', render: Callable[[int], list[str]]):
+        self._corpus = corpus
+        self._render = render
+
+    def __len__(self) -> int:
+        return len(self._corpus)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._render(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Índice de sentença fora do intervalo.')
+        return self._render(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._render(i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, Sequence)) and not isinstance(other, str):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<{len(self)} sentenças>"
+
+
+class CoNLLCorpus:
+    """
+    Representação colunar e compacta de um corpus CoNLL em memória.
+
+    Em vez de listas aninhadas de strings, guarda:
+    - um vocabulário de tokens (cada token distinto é armazenado uma única vez);
+    - os ids de token e de rótulo de todo o corpus em buffers NumPy (int32);
+    - um índice de offsets com o início de cada sentença (offsets[i]:offsets[i + 1]).
+
+    As visões em listas (`sentencesTokens`, `sentencesLabels`, `sentencesTokenAndLabels` e,
+    para corpus preditos, `sentencesKeys`, `sentencesPreds`, `sentencesTokensKeysPreds`)
+    são derivadas sob demanda.
+    """
+
+    def __init__(self,
+                 tokenVocab: list[str],
+                 tokenIds: np.ndarray,
+                 labelVocab: list[str],
+                 labelIds: np.ndarray,
+                 offsets: np.ndarray,
+                 sepTokenTag: str = ' ',
+                 predIds: np.ndarray | None = None):
+        """
+        Args:
+            tokenVocab: Vocabulário de tokens (id -> token).
+            tokenIds: Id do token em cada posição do corpus.
+            labelVocab: Vocabulário de rótulos (id -> rótulo), compartilhado por chaves e predições.
+            labelIds: Id do rótulo (ou da chave, em corpus preditos) em cada posição.
+            offsets: Posição inicial de cada sentença, seguida do total de tokens.
+            sepTokenTag: Separador usado para montar as linhas "token<sep>tag".
+            predIds: Id da predição em cada posição (apenas corpus preditos).
+        """
+        self.tokenVocab = tokenVocab
+        self.tokenIds = tokenIds
+        self.labelVocab = labelVocab
+        self.labelIds = labelIds
+        self.offsets = offsets
+        self.sepTokenTag = sepTokenTag
+        self.predIds = predIds
+
+    @property
+    def predicted(self) -> bool:
+        return self.predIds is not None
+
+    @property
+    def numTokens(self) -> int:
+        return int(self.offsets[-1]) if len(self.offsets) else 0
+
+    def __len__(self) -> int:
+        return max(len(self.offsets) - 1, 0)
+
+    @classmethod
+    def fromFile(cls,
+                 inputFilePath: str | Path,
+                 setEncoding: str = 'utf-8',
+                 sepTokenTag: str = ' ',
+                 loadPredictedCorpus: bool = False) -> 'CoNLLCorpus':
+        """
+        Lê um arquivo CoNLL linha a linha, sem carregar o arquivo inteiro em memória.
+        As regras de parsing são as mesmas de PortugueseToolNER.loadCorpusInCoNLLFormat.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não for encontrado.
+        """
+        builder = _CoNLLCorpusBuilder(sepTokenTag, loadPredictedCorpus)
+        try:
+            with open(inputFilePath, 'r', encoding=setEncoding) as f:
+                for line in f:
+                    if line == '\n':
+                        builder.endSentence()
+                    else:
+                        builder.addLine(line)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Arquivo não encontrado: {inputFilePath}")
+        return builder.build()
+
+    @classmethod
+    def fromSentences(cls,
+                      sentencesTokens: Iterable[list[str]],
+                      sentencesLabels: Iterable[list[str]],
+                      sepTokenTag: str = ' ',
+                      sentencesPreds: Iterable[list[str]] | None = None) -> 'CoNLLCorpus':
+        """
+        Constrói o corpus colunar a partir das listas de tokens e rótulos por sentença.
+        """
+        builder = _CoNLLCorpusBuilder(sepTokenTag, sentencesPreds is not None)
+        if sentencesPreds is None:
+            for tokens, labels in zip(sentencesTokens, sentencesLabels):
+                builder.addSentence(tokens, labels)
+        else:
+            for tokens, labels, preds in zip(sentencesTokens, sentencesLabels, sentencesPreds):
+                builder.addSentence(tokens, labels, preds)
+        return builder.build()
+
+    def save(self, filePath: str | Path, compress: bool = False):
+        """
+        Salva o corpus em um formato binário (.npz): vocabulários em buffers UTF-8,
+        ids de token/rótulo e offsets como arrays NumPy. Com compress=True o arquivo é
+        comprimido (menor, porém mais lento para recarregar).
+        """
+        arrays = dict(tokenVocab=_packStrings(self.tokenVocab), tokenIds=self.tokenIds,
+                      labelVocab=_packStrings(self.labelVocab), labelIds=self.labelIds,
+                      offsets=self.offsets, sepTokenTag=np.array(self.sepTokenTag))
+        if self.predIds is not None:
+            arrays['predIds'] = self.predIds
+        _saveArrays(filePath, compress, **arrays)
+
+    @classmethod
+    def load(cls, filePath: str | Path) -> 'CoNLLCorpus':
+        """
+        Carrega um corpus salvo com `save`, sem nenhum parsing de texto.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não for encontrado.
+            ValueError: Se o arquivo não for de uma versão compatível.
+        """
+        arrays = _loadArrays(filePath)
+        return cls(tokenVocab=_unpackStrings(arrays['tokenVocab']), tokenIds=arrays['tokenIds'],
+                   labelVocab=_unpackStrings(arrays['labelVocab']), labelIds=arrays['labelIds'],
+                   offsets=arrays['offsets'], sepTokenTag=str(arrays['sepTokenTag']),
+                   predIds=arrays.get('predIds'))
+
+    def withLabels(self, labelVocab: list[str], labelIds: np.ndarray, sepTokenTag: str | None = None) -> 'CoNLLCorpus':
+        """
+        Retorna um novo corpus que compartilha tokens e offsets com este, mas com outros rótulos.
+        """
+        return CoNLLCorpus(self.tokenVocab, self.tokenIds, labelVocab, labelIds, self.offsets,
+                           self.sepTokenTag if sepTokenTag is None else sepTokenTag)
+
+    def filterByProfiles(self,
+                         profiles: dict[str, Iterable[str]],
+                         maskForUnacceptLabel: str,
+                         sepTokenTag: str | None = None) -> dict[str, 'CoNLLCorpus']:
+        """
+        Filtra o corpus para vários perfis de categorias em uma única passada vetorizada.
+
+        Para cada perfil é calculada uma máscara booleana sobre o vocabulário de rótulos
+        (o rótulo é mantido se o seu tipo, sem prefixo B-/I-, estiver no perfil). As máscaras
+        de todos os perfis são aplicadas de uma vez sobre os ids de rótulo do corpus inteiro.
+
+        Args:
+            profiles: {nome_do_perfil: rótulos aceitáveis}, ex: {'PER': ['PER'], 'PER+ORG': ['PER', 'ORG']}.
+            maskForUnacceptLabel: Rótulo usado para as entidades fora do perfil (ex: 'O').
+            sepTokenTag: Separador das linhas "token<sep>tag" dos corpus filtrados.
+
+        Returns:
+            {nome_do_perfil: CoNLLCorpus filtrado}, compartilhando tokens e offsets com este corpus.
+        """
+        labelVocab = list(self.labelVocab)
+        if maskForUnacceptLabel in labelVocab:
+            maskId = labelVocab.index(maskForUnacceptLabel)
+        else:
+            maskId = len(labelVocab)
+            labelVocab.append(maskForUnacceptLabel)
+
+        labelTypes = [full_tag.replace('B-', '').replace('I-', '') for full_tag in self.labelVocab]
+        names = list(profiles)
+        keepMasks = np.zeros((len(names), len(labelVocab)), dtype=bool)
+        for row, name in enumerate(names):
+            acceptable = set(profiles[name])
+            keepMasks[row, :len(labelTypes)] = [labelType in acceptable for labelType in labelTypes]
+        keepMasks[:, maskId] = True
+
+        # (perfis x tokens): uma única indexação e um único np.where para todos os perfis
+        keep = keepMasks[:, self.labelIds]
+        filteredIds = np.where(keep, self.labelIds, np.int32(maskId)).astype(np.int32, copy=False)
+
+        return {name: self.withLabels(labelVocab, filteredIds[row], sepTokenTag) for row, name in enumerate(names)}
+
+    def _span(self, i: int) -> tuple[int, int]:
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def sentenceTokens(self, i: int) -> list[str]:
+        start, end = self._span(i)
+        vocab = self.tokenVocab
+        return [vocab[t] for t in self.tokenIds[start:end].tolist()]
+
+    def sentenceLabels(self, i: int) -> list[str]:
+        start, end = self._span(i)
+        vocab = self.labelVocab
+        return [vocab[t] for t in self.labelIds[start:end].tolist()]
+
+    def sentencePreds(self, i: int) -> list[str]:
+        start, end = self._span(i)
+        vocab = self.labelVocab
+        return [vocab[t] for t in self.predIds[start:end].tolist()]
+
+    def sentenceTokenAndLabels(self, i: int) -> list[str]:
+        sep = self.sepTokenTag
+        return [f"{token}{sep}{label}" for token, label in zip(self.sentenceTokens(i), self.sentenceLabels(i))]
+
+    def sentenceTokenKeyPreds(self, i: int) -> list[str]:
+        sep = self.sepTokenTag
+        return [f"{token}{sep}{key}{sep}{pred}"
+                for token, key, pred in zip(self.sentenceTokens(i), self.sentenceLabels(i), self.sentencePreds(i))]
+
+    @property
+    def sentencesTokens(self) -> _CorpusSentencesView:
+        return _CorpusSentencesView(self, self.sentenceTokens)
+
+    @property
+    def sentencesLabels(self) -> _CorpusSentencesView:
+        return _CorpusSentencesView(self, self.sentenceLabels)
+
+    @property
+    def sentencesTokenAndLabels(self) -> _CorpusSentencesView:
+        return _CorpusSentencesView(self, self.sentenceTokenAndLabels)
+
+    @property
+    def sentencesKeys(self) -> _CorpusSentencesView:
+        return self.sentencesLabels
+
+    @property
+    def sentencesPreds(self) -> _CorpusSentencesView:
+        return _CorpusSentencesView(self, self.sentencePreds)
+
+    @property
+    def sentencesTokensKeysPreds(self) -> _CorpusSentencesView:
+        return _CorpusSentencesView(self, self.sentenceTokenKeyPreds)
+
+    def toLists(self) -> dict[str, list[list[str]]]:
+        """
+        Converte o corpus inteiro em listas de sentenças de uma só vez, decodificando os
+        buffers de ids em bloco (mais rápido que materializar as visões sentença a sentença).
+
+        Returns:
+            {nome_da_visão: lista de sentenças}, com as mesmas chaves das propriedades
+            sentencesTokens, sentencesLabels, sentencesTokenAndLabels ou, para corpus
+            preditos, sentencesTokens, sentencesKeys, sentencesPreds, sentencesTokensKeysPreds.
+        """
+        offsets = self.offsets.tolist()
+        bounds = list(zip(offsets, offsets[1:]))
+        sep = self.sepTokenTag
+        labelVocab = np.array(self.labelVocab, dtype=object)
+        tokens = np.array(self.tokenVocab, dtype=object)[self.tokenIds].tolist()
+        labels = labelVocab[self.labelIds].tolist()
+
+        def bySentence(values: list[str]) -> list[list[str]]:
+            return [values[start:end] for start, end in bounds]
+
+        if self.predicted:
+            preds = labelVocab[self.predIds].tolist()
+            lines = [f"{token}{sep}{key}{sep}{pred}" for token, key, pred in zip(tokens, labels, preds)]
+            return {'sentencesTokens': bySentence(tokens), 'sentencesKeys': bySentence(labels),
+                    'sentencesPreds': bySentence(preds), 'sentencesTokensKeysPreds': bySentence(lines)}
+        lines = [f"{token}{sep}{label}" for token, label in zip(tokens, labels)]
+        return {'sentencesTokens': bySentence(tokens), 'sentencesLabels': bySentence(labels),
+                'sentencesTokenAndLabels': bySentence(lines)}
+
+
+class _CoNLLCorpusBuilder:
+    """
+    Acumula tokens e rótulos em buffers `array` e vocabulários internados para montar um CoNLLCorpus.
+    """
+
+    def __init__(self, sepTokenTag: str, predicted: bool):
+        self.sepTokenTag = sepTokenTag
+        self.predicted = predicted
+        self.tokenIndex: dict[str, int] = {}
+        self.labelIndex: dict[str, int] = {}
+        self.tokenIds = array('i')
+        self.labelIds = array('i')
+        self.predIds = array('i')
+        self.offsets = array('q', [0])
+
+    def _id(self, index: dict[str, int], value: str) -> int:
+        valueId = index.get(value)
+        if valueId is None:
+            valueId = index[value] = len(index)
+        return valueId
+
+    def addLine(self, line: str):
+        """
+        Interpreta uma linha CoNLL (token<sep>tag ou token<sep>chave<sep>predição).
+        Linhas malformadas são ignoradas, como em loadCorpusInCoNLLFormat.
+        """
+        parsed = _parseCoNLLLine(line, self.sepTokenTag, self.predicted)
+        if parsed is None:
+            return
+        self.tokenIds.append(self._id(self.tokenIndex, parsed[0]))
+        self.labelIds.append(self._id(self.labelIndex, parsed[1]))
+        if self.predicted:
+            self.predIds.append(self._id(self.labelIndex, parsed[2]))
+
+    def addSentence(self, tokens: list[str], labels: list[str], preds: list[str] | None = None):
+        for token in tokens:
+            self.tokenIds.append(self._id(self.tokenIndex, token))
+        for label in labels:
+            self.labelIds.append(self._id(self.labelIndex, label))
+        if preds is not None:
+            for pred in preds:
+                self.predIds.append(self._id(self.labelIndex, pred))
+        self.endSentence()
+
+    def endSentence(self):
+        """
+        Fecha a sentença atual (sentenças sem tokens são descartadas).
+        """
+        if len(self.tokenIds) > self.offsets[-1]:
+            self.offsets.append(len(self.tokenIds))
+
+    def build(self) -> CoNLLCorpus:
+        self.endSentence()
+        return CoNLLCorpus(
+            tokenVocab=list(self.tokenIndex),
+            tokenIds=np.frombuffer(self.tokenIds, dtype=np.int32) if self.tokenIds else np.zeros(0, dtype=np.int32),
+            labelVocab=list(self.labelIndex),
+            labelIds=np.frombuffer(self.labelIds, dtype=np.int32) if self.labelIds else np.zeros(0, dtype=np.int32),
+            offsets=np.frombuffer(self.offsets, dtype=np.int64),
+            sepTokenTag=self.sepTokenTag,
+            predIds=(np.frombuffer(self.predIds, dtype=np.int32) if self.predIds else np.zeros(0, dtype=np.int32))
+                    if self.predicted else None
+        )
+
+
+class IndexedCoNLLReader(Sequence):
+    """
+    Leitor de arquivos CoNLL com acesso aleatório por sentença, sem carregar o corpus.
+
+    O arquivo é mapeado em memória (mmap) e um índice com os offsets em bytes de cada
+    sentença é construído uma única vez e guardado em um arquivo auxiliar
+    (`<arquivo>.sentidx.npz`). Nas próximas aberturas, se o arquivo não tiver mudado
+    (tamanho e data de modificação), o índice é apenas recarregado.
+
+    Suporta `len()`, indexação (`reader[n]`), fatias e iteração. Cada sentença é
+    retornada como (tokens, tags) ou, para corpus preditos, (tokens, chaves, predições),
+    com as mesmas regras de parsing de loadCorpusInCoNLLFormat.
+
+    O encoding precisa ser compatível com ASCII (ex: utf-8, latin-1), pois as quebras de
+    linha são procuradas diretamente nos bytes do arquivo.
+    """
+
+    _INDEX_SUFFIX = '.sentidx.npz'
+
+    def __init__(self,
+                 inputFilePath: str | Path,
+                 setEncoding: str = 'utf-8',
+                 sepTokenTag: str = ' ',
+                 loadPredictedCorpus: bool = False,
+                 indexFilePath: str | Path | None = None,
+                 rebuildIndex: bool = False):
+        """
+        Args:
+            inputFilePath: Caminho para o arquivo do corpus.
+            setEncoding: Encoding do arquivo.
+            sepTokenTag: Separador entre token e tag (e predição, se aplicável).
+            loadPredictedCorpus: Se True, espera três colunas (token, chave, predição).
+            indexFilePath: Caminho do índice auxiliar. Padrão: `<inputFilePath>.sentidx.npz`.
+            rebuildIndex: Se True, reconstrói o índice mesmo que exista um válido.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não for encontrado.
+        """
+        self.inputFilePath = Path(inputFilePath)
+        if not self.inputFilePath.is_file():
+            raise FileNotFoundError(f"Arquivo não encontrado: {inputFilePath}")
+        self.encoding = setEncoding
+        self.sepTokenTag = sepTokenTag
+        self.predicted = loadPredictedCorpus
+        self.indexFilePath = Path(indexFilePath) if indexFilePath else \
+            self.inputFilePath.with_name(self.inputFilePath.name + self._INDEX_SUFFIX)
+
+        self._file = open(self.inputFilePath, 'rb')
+        fileSize = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if fileSize else b''
+
+        self.offsets: np.ndarray = None if rebuildIndex else self.__loadIndex()
+        if self.offsets is None:
+            self.offsets = self.__buildIndex()
+            self.__saveIndex()
+
+    def __fingerprint(self) -> np.ndarray:
+        stat = self.inputFilePath.stat()
+        return np.array([stat.st_size, stat.st_mtime_ns, int(self.predicted)], dtype=np.int64)
+
+    def __loadIndex(self) -> np.ndarray | None:
+        """
+        Carrega o índice auxiliar, se existir e corresponder ao arquivo e às opções atuais.
+        """
+        if not self.indexFilePath.is_file():
+            return None
+        try:
+            with np.load(self.indexFilePath, allow_pickle=False) as data:
+                if (np.array_equal(data['fingerprint'], self.__fingerprint()) and
+                        str(data['sepTokenTag']) == self.sepTokenTag and str(data['encoding']) == self.encoding):
+                    return data['offsets']
+        except (OSError, KeyError, ValueError):
+            pass
+        return None
+
+    def __saveIndex(self):
+        try:
+            with open(self.indexFilePath, 'wb') as f:
+                np.savez(f, offsets=self.offsets, fingerprint=self.__fingerprint(),
+                         sepTokenTag=np.array(self.sepTokenTag), encoding=np.array(self.encoding))
+        except OSError as e:
+            print(f"Aviso: não foi possível salvar o índice {self.indexFilePath}: {e}")
+
+    def __buildIndex(self) -> np.ndarray:
+        """
+        Percorre o arquivo uma vez e registra (início, fim) em bytes de cada sentença válida,
+        isto é, com ao menos uma linha que seria aceita por loadCorpusInCoNLLFormat.
+        """
+        offsets = array('q')
+        mm = self._mmap
+        size = len(mm)
+        position = 0
+        sentenceStart, sentenceHasTokens = 0, False
+        while position < size:
+            lineEnd = mm.find(b'\n', position)
+            lineEnd = size if lineEnd == -1 else lineEnd + 1
+            line = mm[position:lineEnd]
+            if line in (b'\n', b'\r\n'):
+                if sentenceHasTokens:
+                    offsets.extend((sentenceStart, position))
+                sentenceStart, sentenceHasTokens = lineEnd, False
+            elif not sentenceHasTokens and \
+                    _parseCoNLLLine(line.decode(self.encoding), self.sepTokenTag, self.predicted) is not None:
+                sentenceHasTokens = True
+            position = lineEnd
+        if sentenceHasTokens:
+            offsets.extend((sentenceStart, size))
+        return np.frombuffer(offsets, dtype=np.int64).reshape(-1, 2) if offsets else np.zeros((0, 2), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def sentence(self, i: int) -> tuple[list[str], ...]:
+        """
+        Lê e interpreta a sentença `i` diretamente do arquivo mapeado.
+        """
+        start, end = self.offsets[i]
+        columns: tuple[list[str], ...] = ([], [], []) if self.predicted else ([], [])
+        for line in self._mmap[start:end].decode(self.encoding).split('\n'):
+            parsed = _parseCoNLLLine(line, self.sepTokenTag, self.predicted)
+            if parsed is not None:
+                for column, value in zip(columns, parsed):
+                    column.append(value)
+        return columns
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.sentence(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Índice de sentença fora do intervalo.')
+        return self.sentence(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.sentence(i)
+
+    def close(self):
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'IndexedCoNLLReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Códigos de prefixo usados na decodificação de spans (BIO, BIOES, BILOU e IO).
+_TAG_O, _TAG_B, _TAG_I, _TAG_E, _TAG_S = range(5)
+_TAG_PREFIXES = {'B': _TAG_B, 'I': _TAG_I, 'E': _TAG_E, 'S': _TAG_S, 'L': _TAG_E, 'U': _TAG_S}
+
+def _labelSchemeArrays(labelVocab: list[str]) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """
+    Para cada rótulo do vocabulário, obtém o código do prefixo (O, B, I, E ou S; L- e U-
+    do BILOU equivalem a E- e S-) e o id do tipo da entidade. Rótulos sem prefixo
+    (ex: 'PER', esquema IO) são tratados como I-<rótulo>.
+
+    Returns:
+        Tupla (códigos de prefixo, ids de tipo (-1 para 'O'), nomes dos tipos).
+    """
+    types: dict[str, int] = {}
+    prefixes = np.full(len(labelVocab), _TAG_O, dtype=np.int8)
+    typeIds = np.full(len(labelVocab), -1, dtype=np.int64)
+    for labelId, label in enumerate(labelVocab):
+        if label == 'O':
+            continue
+        prefix, dash, entityType = label.partition('-')
+        if dash and prefix in _TAG_PREFIXES:
+            prefixes[labelId] = _TAG_PREFIXES[prefix]
+        else:
+            prefixes[labelId], entityType = _TAG_I, label
+        typeIds[labelId] = types.setdefault(entityType, len(types))
+    return prefixes, typeIds, list(types)
+
+def decodeEntitySpans(labelIds: np.ndarray,
+                      labelVocab: list[str],
+                      offsets: np.ndarray) -> tuple[np.ndarray, list[str]]:
+    """
+    Decodifica as entidades de uma sequência de rótulos BIO/BIOES, de forma vetorizada
+    sobre os ids de rótulo. As regras de início e fim de entidade são as do conlleval
+    (as mesmas do seqeval no modo padrão), e nenhuma entidade atravessa o limite
+    de uma sentença.
+
+    Args:
+        labelIds: Id do rótulo de cada token do corpus.
+        labelVocab: Vocabulário de rótulos (id -> rótulo).
+        offsets: Posição inicial de cada sentença, seguida do total de tokens (como em CoNLLCorpus).
+
+    Returns:
+        Tupla (spans, nomes dos tipos): `spans` é um array (n, 3) com início, fim (exclusivo)
+        e id do tipo de cada entidade, em ordem.
+    """
+    prefixes, typeIds, typeNames = _labelSchemeArrays(labelVocab)
+    p = prefixes[labelIds]
+    t = typeIds[labelIds]
+    n = len(p)
+    if n == 0:
+        return np.zeros((0, 3), dtype=np.int64), typeNames
+
+    offsets = np.asarray(offsets, dtype=np.int64)
+    nonEmpty = offsets[:-1] < offsets[1:]
+    # Rótulo anterior/seguinte dentro da mesma sentença ('O' nas bordas)
+    prevP = np.empty_like(p)
+    prevP[1:] = p[:-1]
+    prevP[offsets[:-1][nonEmpty]] = _TAG_O
+    prevT = np.empty_like(t)
+    prevT[1:] = t[:-1]
+    prevT[offsets[:-1][nonEmpty]] = -1
+    nextP = np.empty_like(p)
+    nextP[:-1] = p[1:]
+    nextP[offsets[1:][nonEmpty] - 1] = _TAG_O
+    nextT = np.empty_like(t)
+    nextT[:-1] = t[1:]
+    nextT[offsets[1:][nonEmpty] - 1] = -1
+
+    entity = p != _TAG_O
+    inner = (p == _TAG_I) | (p == _TAG_E)
+    starts = entity & ((p == _TAG_B) | (p == _TAG_S) | (prevT != t) |
+                       (inner & ((prevP == _TAG_O) | (prevP == _TAG_E) | (prevP == _TAG_S))))
+    ends = entity & ((p == _TAG_E) | (p == _TAG_S) | (t != nextT) |
+                     (((p == _TAG_B) | (p == _TAG_I)) &
+                      ((nextP == _TAG_O) | (nextP == _TAG_B) | (nextP == _TAG_S))))
+
+    # Cada entidade tem exatamente um início e um fim, e as entidades não se sobrepõem:
+    # o k-ésimo início corresponde ao k-ésimo fim.
+    startPositions = np.flatnonzero(starts)
+    endPositions = np.flatnonzero(ends) + 1
+    return np.stack([startPositions, endPositions, t[startPositions]], axis=1), typeNames
+
+
+class EvaluationResult:
+    """
+    Avaliação de um corpus predito (chaves x predições), nos moldes do seqeval/conlleval:
+
+    - nível de entidade: precisão/revocação/F1 por tipo, considerando acerto apenas
+      quando início, fim e tipo da entidade coincidem;
+    - nível de token: precisão/revocação/F1 por rótulo;
+    - matriz de confusão entre rótulos (chave x predição).
+
+    Guarda apenas contagens, então resultados de vários arquivos podem ser combinados
+    com `merge` ou `+` (ver PortugueseToolNER.evaluatePredictedFiles).
+    """
+
+    def __init__(self):
+        self.entityTruePositives: Counter = Counter() # tipo -> acertos
+        self.entityGold: Counter = Counter() # tipo -> entidades na chave
+        self.entityPredicted: Counter = Counter() # tipo -> entidades preditas
+        self.confusion: Counter = Counter() # (rótulo da chave, rótulo predito) -> tokens
+        self.numSentences: int = 0
+
+    @classmethod
+    def fromCorpus(cls, corpus: CoNLLCorpus) -> 'EvaluationResult':
+        """
+        Avalia um CoNLLCorpus predito (loadPredictedCorpus=True).
+
+        Raises:
+            ValueError: Se o corpus não tiver predições.
+        """
+        if not corpus.predicted:
+            raise ValueError('O corpus não tem predições (carregue-o com loadPredictedCorpus=True).')
+        result = cls()
+        result.numSentences = len(corpus)
+        labelVocab = corpus.labelVocab
+        numLabels = len(labelVocab)
+        if not corpus.numTokens:
+            return result
+
+        keys = corpus.labelIds.astype(np.int64)
+        preds = corpus.predIds.astype(np.int64)
+        confusion = np.bincount(keys * numLabels + preds, minlength=numLabels * numLabels).reshape(numLabels, numLabels)
+        for keyId, predId in zip(*np.nonzero(confusion)):
+            result.confusion[(labelVocab[keyId], labelVocab[predId])] = int(confusion[keyId, predId])
+
+        goldSpans, typeNames = decodeEntitySpans(keys, labelVocab, corpus.offsets)
+        predSpans, _ = decodeEntitySpans(preds, labelVocab, corpus.offsets)
+        # As entidades de uma mesma sequência não se sobrepõem: cada início identifica uma entidade.
+        _, goldIndex, predIndex = np.intersect1d(goldSpans[:, 0], predSpans[:, 0], assume_unique=True,
+                                                 return_indices=True)
+        matched = np.all(goldSpans[goldIndex, 1:] == predSpans[predIndex, 1:], axis=1)
+
+        numTypes = len(typeNames)
+        for counter, typeIds in ((result.entityGold, goldSpans[:, 2]),
+                                 (result.entityPredicted, predSpans[:, 2]),
+                                 (result.entityTruePositives, goldSpans[goldIndex[matched], 2])):
+            for typeId, amount in enumerate(np.bincount(typeIds, minlength=numTypes).tolist()):
+                if amount:
+                    counter[typeNames[typeId]] = amount
+        return result
+
+    def merge(self, other: 'EvaluationResult') -> 'EvaluationResult':
+        """
+        Soma as contagens de `other` a este resultado (in-place).
+        """
+        self.entityTruePositives.update(other.entityTruePositives)
+        self.entityGold.update(other.entityGold)
+        self.entityPredicted.update(other.entityPredicted)
+        self.confusion.update(other.confusion)
+        self.numSentences += other.numSentences
+        return self
+
+    def __iadd__(self, other: 'EvaluationResult') -> 'EvaluationResult':
+        return self.merge(other)
+
+    def __add__(self, other: 'EvaluationResult') -> 'EvaluationResult':
+        return EvaluationResult().merge(self).merge(other)
+
+    @staticmethod
+    def _scores(truePositives: int, predicted: int, gold: int) -> tuple[float, float, float, int]:
+        precision = truePositives / predicted if predicted else 0.0
+        recall = truePositives / gold if gold else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return precision, recall, f1, gold
+
+    def entityScores(self) -> dict[str, tuple[float, float, float, int]]:
+        """
+        Returns:
+            {tipo: (precisão, revocação, F1, suporte)} no nível de entidade, em ordem alfabética.
+        """
+        types = sorted(set(self.entityGold) | set(self.entityPredicted))
+        return {entityType: self._scores(self.entityTruePositives[entityType], self.entityPredicted[entityType],
+                                         self.entityGold[entityType])
+                for entityType in types}
+
+    def microAverage(self) -> tuple[float, float, float, int]:
+        """
+        Precisão, revocação, F1 e suporte no nível de entidade, somando todos os tipos.
+        """
+        return self._scores(sum(self.entityTruePositives.values()), sum(self.entityPredicted.values()),
+                            sum(self.entityGold.values()))
+
+    def macroAverage(self) -> tuple[float, float, float, int]:
+        """
+        Média simples por tipo das métricas no nível de entidade (suporte total).
+        """
+        scores = list(self.entityScores().values())
+        if not scores:
+            return 0.0, 0.0, 0.0, 0
+        return (sum(s[0] for s in scores) / len(scores), sum(s[1] for s in scores) / len(scores),
+                sum(s[2] for s in scores) / len(scores), sum(s[3] for s in scores))
+
+    def tokenScores(self) -> dict[str, tuple[float, float, float, int]]:
+        """
+        Returns:
+            {rótulo: (precisão, revocação, F1, suporte)} no nível de token, em ordem alfabética.
+        """
+        gold, predicted, truePositives = Counter(), Counter(), Counter()
+        for (key, pred), amount in self.confusion.items():
+            gold[key] += amount
+            predicted[pred] += amount
+            if key == pred:
+                truePositives[key] += amount
+        return {label: self._scores(truePositives[label], predicted[label], gold[label])
+                for label in sorted(set(gold) | set(predicted))}
+
+    def tokenAccuracy(self) -> float:
+        total = sum(self.confusion.values())
+        return sum(amount for (key, pred), amount in self.confusion.items() if key == pred) / total if total else 0.0
+
+    def confusionMatrix(self, labels: list[str] | None = None) -> tuple[list[str], np.ndarray]:
+        """
+        Matriz de confusão entre rótulos: linhas são as chaves e colunas as predições.
+
+        Args:
+            labels: Ordem dos rótulos. Padrão: todos os rótulos observados, em ordem alfabética.
+
+        Returns:
+            Tupla (rótulos, matriz (len(rótulos) x len(rótulos))).
+        """
+        if labels is None:
+            labels = sorted({label for pair in self.confusion for label in pair})
+        index = {label: i for i, label in enumerate(labels)}
+        matrix = np.zeros((len(labels), len(labels)), dtype=np.int64)
+        for (key, pred), amount in self.confusion.items():
+            if key in index and pred in index:
+                matrix[index[key], index[pred]] = amount
+        return labels, matrix
+
+    def reportLines(self) -> list[str]:
+        """
+        Linhas de um relatório em texto (entidades, médias e tokens), prontas para generateOutputFile.
+        """
+        def row(name: str, scores: tuple[float, float, float, int]) -> str:
+            precision, recall, f1, support = scores
+            return f"{name:>12} {precision:>10.4f} {recall:>10.4f} {f1:>10.4f} {support:>10}"
+
+        header = f"{'':>12} {'precision':>10} {'recall':>10} {'f1-score':>10} {'support':>10}"
+        lines = [f"ENTITIES ({self.numSentences} sentences)", header]
+        lines += [row(entityType, scores) for entityType, scores in self.entityScores().items()]
+        lines += ['', row('micro avg', self.microAverage()), row('macro avg', self.macroAverage()), '']
+        lines += [f"TOKENS (accuracy {self.tokenAccuracy():.4f})", header]
+        lines += [row(label, scores) for label, scores in self.tokenScores().items()]
+        return lines
+
+
+# Backends de inferência na CPU (ver PortugueseToolNER.loadNamedEntityModel)
+_INFERENCE_BACKENDS = ('eager', 'int8')
+
+def _configureTorchThreads(numThreads: int | None, numInteropThreads: int | None = None):
+    """
+    Ajusta as threads do PyTorch (valores globais do processo). As threads inter-op só podem
+    ser definidas antes do primeiro trabalho paralelo; depois disso, o valor atual é mantido.
+    """
+    import torch # Dependência do Flair, importada apenas quando usada
+    if numThreads is not None:
+        if numThreads < 1:
+            raise ValueError('"numThreads" deve ser maior ou igual a 1.')
+        torch.set_num_threads(numThreads)
+    if numInteropThreads is not None:
+        try:
+            torch.set_num_interop_threads(numInteropThreads)
+        except RuntimeError as e:
+            print(f"Aviso: threads inter-op não alteradas ({torch.get_num_interop_threads()}): {e}")
+
+# Camadas da cabeça do SequenceTagger que ficam em fp32 no backend 'int8': o Flair lê
+# `self.linear.weight.dtype`, que deixa de ser um tensor na camada quantizada.
+_UNQUANTIZED_TAGGER_LAYERS = ('embedding2nn', 'linear')
+
+def _optimizeTaggerForCPU(tagger: SequenceTagger, backend: str, torchScript: bool) -> SequenceTagger:
+    """
+    Prepara o tagger (alterado no próprio objeto) para inferência na CPU: com backend 'int8',
+    quantiza dinamicamente (pesos em int8, ativações quantizadas em tempo de execução) as
+    camadas LSTM/GRU/Linear, incluindo as dos embeddings, exceto as da cabeça listadas em
+    _UNQUANTIZED_TAGGER_LAYERS; com torchScript, converte a reprojeção e a camada linear
+    para TorchScript. A RNN segue em modo eager (o Flair a chama com um PackedSequence,
+    que o módulo convertido não aceita), assim como os embeddings e o decodificador do
+    Flair, que operam sobre objetos Python (Sentence).
+    """
+    import torch
+    tagger.eval()
+    if backend == 'int8':
+        quantization = getattr(torch, 'ao', torch).quantization
+        layers = (torch.nn.LSTM, torch.nn.GRU, torch.nn.Linear)
+        qconfigSpec = {name: quantization.default_dynamic_qconfig for name, module in tagger.named_modules()
+                       if isinstance(module, layers) and name not in _UNQUANTIZED_TAGGER_LAYERS}
+        if qconfigSpec:
+            quantization.quantize_dynamic(tagger, qconfigSpec, dtype=torch.qint8, inplace=True)
+    if torchScript:
+        for name in ('embedding2nn', 'linear'):
+            module = getattr(tagger, name, None)
+            if isinstance(module, torch.nn.Module):
+                try:
+                    setattr(tagger, name, torch.jit.script(module))
+                except Exception as e:
+                    print(f"Aviso: '{name}' não pôde ser convertido para TorchScript e segue em modo eager: {e}")
+    return tagger
+
+def _smokePrediction(tagger: SequenceTagger):
+    """
+    Prediz uma sentença curta, para que um backend incompatível com o tagger falhe ao
+    carregar o modelo, e não no meio do tagging.
+    """
+    import torch
+    with torch.inference_mode():
+        tagger.predict(Sentence('Maria mora em Lisboa .', use_tokenizer=False))
+
+def _timedPrediction(tagger: SequenceTagger,
+                     texts: list[str],
+                     miniBatchSize: int,
+                     inferenceMode: bool) -> tuple[list[list[str]], float]:
+    """
+    Rotula `texts` (tokens separados por espaço) e mede o tempo de predição, após um
+    mini-batch de aquecimento. Retorna os rótulos por sentença, na ordem de `texts`.
+    """
+    import torch
+    context = torch.inference_mode if inferenceMode else nullcontext
+    with context():
+        tagger.predict([Sentence(text, use_tokenizer=False) for text in texts[:miniBatchSize]],
+                       mini_batch_size=miniBatchSize)
+        sentence_objs = [Sentence(text, use_tokenizer=False) for text in texts]
+        start = time.perf_counter()
+        tagger.predict(sorted(sentence_objs, key=len, reverse=True), mini_batch_size=miniBatchSize)
+        elapsed = time.perf_counter() - start
+    return [[_tokenLabel(token) for token in sentence_obj.tokens] for sentence_obj in sentence_objs], elapsed
+
+
+@dataclass
+class InferenceBackendReport:
+    """
+    Paridade e vazão de um backend de inferência em relação ao modelo eager (fp32),
+    medidas sobre um arquivo CoNLL de validação (ver PortugueseToolNER.compareInferenceBackend).
+
+    Attributes:
+        backend: Backend avaliado ('eager' ou 'int8').
+        torchScript: Se a cabeça de rotulagem roda em TorchScript.
+        numThreads: Threads intra-op do PyTorch durante a medição.
+        sentences: Sentenças rotuladas.
+        tokens: Tokens rotulados (base da vazão).
+        skippedSentences: Sentenças fora da comparação, porque a tokenização do Flair não
+                          coincidiu com a do arquivo.
+        labelAgreement: Fração dos tokens com o mesmo rótulo nos dois modelos.
+        sentenceAgreement: Fração das sentenças com todos os rótulos iguais nos dois modelos.
+        eagerEvaluation: Avaliação do modelo eager contra as chaves do arquivo.
+        backendEvaluation: Avaliação do backend contra as chaves do arquivo.
+        eagerSeconds: Tempo de predição do modelo eager.
+        backendSeconds: Tempo de predição do backend.
+    """
+    backend: str
+    torchScript: bool
+    numThreads: int
+    sentences: int = 0
+    tokens: int = 0
+    skippedSentences: int = 0
+    labelAgreement: float = 0.0
+    sentenceAgreement: float = 0.0
+    eagerEvaluation: EvaluationResult = field(default_factory=EvaluationResult)
+    backendEvaluation: EvaluationResult = field(default_factory=EvaluationResult)
+    eagerSeconds: float = 0.0
+    backendSeconds: float = 0.0
+
+    @property
+    def eagerTokensPerSecond(self) -> float:
+        return self.tokens / self.eagerSeconds if self.eagerSeconds > 0 else 0.0
+
+    @property
+    def backendTokensPerSecond(self) -> float:
+        return self.tokens / self.backendSeconds if self.backendSeconds > 0 else 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.eagerSeconds / self.backendSeconds if self.backendSeconds > 0 else 0.0
+
+    @property
+    def f1Drop(self) -> float:
+        """
+        Perda de F1 micro (nível de entidade) do backend em relação ao modelo eager.
+        """
+        return self.eagerEvaluation.microAverage()[2] - self.backendEvaluation.microAverage()[2]
+
+    def withinTolerance(self, maxF1Drop: float = 0.005, minLabelAgreement: float = 0.99) -> bool:
+        """
+        Verifica se o backend preserva a acurácia do modelo eager dentro das tolerâncias.
+        """
+        return self.f1Drop <= maxF1Drop and self.labelAgreement >= minLabelAgreement
+
+    def reportLines(self) -> list[str]:
+        """
+        Linhas de um relatório em texto, prontas para generateOutputFile.
+        """
+        eagerF1, backendF1 = self.eagerEvaluation.microAverage()[2], self.backendEvaluation.microAverage()[2]
+        return [f"BACKEND {self.backend}{' + torchscript' if self.torchScript else ''} "
+                f"({self.numThreads} threads, {self.sentences} sentences, {self.tokens} tokens"
+                f"{f', {self.skippedSentences} skipped' if self.skippedSentences else ''})",
+                f"{'':>12} {'f1-score':>10} {'seconds':>10} {'tokens/s':>12}",
+                f"{'eager':>12} {eagerF1:>10.4f} {self.eagerSeconds:>10.2f} {self.eagerTokensPerSecond:>12,.0f}",
+                f"{self.backend:>12} {backendF1:>10.4f} {self.backendSeconds:>10.2f} {self.backendTokensPerSecond:>12,.0f}",
+                '',
+                f"speedup {self.speedup:.2f}x | f1 drop {self.f1Drop:+.4f} | "
+                f"label agreement {self.labelAgreement:.4f} | sentence agreement {self.sentenceAgreement:.4f}"]
+
+
+class _AsyncTaggingBatcher:
+    """
+    Agrupa as sentenças de chamadas concorrentes a PortugueseToolNER.tagAsync em micro-batches.
+
+    Cada sentença entra em uma fila com o seu próprio Future. Uma tarefa em segundo plano
+    forma um batch assim que ele atinge `maxBatchSize` sentenças ou quando `maxWaitMs`
+    se passaram desde a primeira sentença pendente, e executa o modelo em uma thread
+    dedicada (para não bloquear o event loop). Cada Future recebe a predição da sua sentença.
+    Ao encerrar o batcher (close / discard), as sentenças pendentes recebem um RuntimeError.
+    """
+
+    def __init__(self, tool: 'PortugueseToolNER', maxBatchSize: int, maxWaitMs: float):
+        self.tool = tool
+        self.maxBatchSize = maxBatchSize
+        self.maxWait = maxWaitMs / 1000
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pToolNER-model')
+        self.closed = False
+        self.batch: list[tuple[str, bool, asyncio.Future]] = [] # Batch em formação ou em predição
+        self.task = self.loop.create_task(self.__run())
+
+    async def predict(self, sentences_text: list[str], useTokenizer_flair: bool) -> list:
+        if self.closed:
+            raise RuntimeError('batcher encerrado')
+        futures = []
+        for sentence_text in sentences_text:
+            future = self.loop.create_future()
+            self.queue.put_nowait((sentence_text, useTokenizer_flair, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def __run(self):
+        while True:
+            self.batch = batch = [await self.queue.get()]
+            deadline = self.loop.time() + self.maxWait
+            while len(batch) < self.maxBatchSize:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - self.loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self.__predictBatch(batch)
+            self.batch = []
+
+    async def __predictBatch(self, batch: list[tuple[str, bool, asyncio.Future]]):
+        groups: dict[bool, list[tuple[str, bool, asyncio.Future]]] = {}
+        for item in batch:
+            if not item[2].done(): # Chamadas canceladas não vão para o modelo
+                groups.setdefault(item[1], []).append(item)
+
+        for useTokenizer_flair, items in groups.items():
+            try:
+                sentence_objs = await self.loop.run_in_executor(
+                    self.executor, self.tool._predict_sentences_in_batches,
+                    [sentence_text for sentence_text, _, _ in items], useTokenizer_flair, self.maxBatchSize)
+            except Exception as e:
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, _, future), sentence_obj in zip(items, sentence_objs):
+                if not future.done():
+                    future.set_result(sentence_obj)
+
+    def __failPending(self):
+        """
+        Resolve com erro os Futures do batch atual e das sentenças ainda na fila, para que
+        nenhuma chamada a tagAsync fique esperando por um batcher encerrado.
+        """
+        pending = self.batch
+        self.batch = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError('batcher encerrado'))
+
+    async def close(self):
+        self.closed = True
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.__failPending()
+        self.executor.shutdown(wait=True)
+
+    def discard(self):
+        """
+        Encerra o batcher sem aguardar, a partir de outro event loop (ex: quando tagAsync passa
+        a ser chamada em um loop novo e o loop original já terminou).
+        """
+        self.closed = True
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.task.cancel)
+            self.loop.call_soon_threadsafe(self.__failPending)
+        self.executor.shutdown(wait=False)
+
+
+class _StageTimer:
+    __slots__ = ('metrics', 'stage', 'start')
+
+    def __init__(self, metrics: 'PipelineMetrics', stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self) -> '_StageTimer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.addTime(self.stage, time.perf_counter() - self.start)
+
+
+_NULL_TIMER = nullcontext() # Usado quando a instrumentação está desativada
+
+
+class PipelineMetrics:
+    """
+    Tempos por etapa e contadores do pipeline de tagging (ver PortugueseToolNER.enableMetrics).
+
+    Etapas: sentenceSplit (divisão em sentenças), sentenceBuild (construção das Sentence do
+    Flair), predict (tagger.predict), cacheLookup (PredictionCache), masking (mascaramento
+    de cada sentença, incluindo o tempo de auxLookup), auxLookup (lista auxiliar/gazetteer),
+    spanAggregation (estatísticas de entidades) e outputIO (escrita dos arquivos de saída).
+
+    Contadores: files, sentences, tokens, entities, cacheHits e cacheMisses.
+
+    Os valores acumulam até `reset()`. `flush()` envia um retrato (`snapshot()`) para
+    cada sink (LoggingMetricsSink, JsonLinesMetricsSink, PrometheusMetricsSink ou
+    qualquer objeto com um método `emit(snapshot)`).
+    """
+
+    def __init__(self, sinks: Iterable = ()):
+        self.sinks = list(sinks)
+        self.stageSeconds: Counter = Counter()
+        self.stageCalls: Counter = Counter()
+        self.counters: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def time(self, stage: str) -> _StageTimer:
+        """
+        Context manager que mede o tempo de uma etapa: `with metrics.time('predict'): ...`.
+        """
+        return _StageTimer(self, stage)
+
+    def addTime(self, stage: str, seconds: float):
+        with self._lock:
+            self.stageSeconds[stage] += seconds
+            self.stageCalls[stage] += 1
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {'timestamp': time.time(),
+                    'stages': {stage: {'calls': self.stageCalls[stage], 'seconds': self.stageSeconds[stage]}
+                               for stage in sorted(self.stageSeconds)},
+                    'counters': dict(sorted(self.counters.items()))}
+
+    def merge(self, snapshot: dict) -> 'PipelineMetrics':
+        """
+        Soma os valores de um retrato (ex: vindo de um processo worker) a estas métricas.
+        """
+        with self._lock:
+            for stage, values in snapshot['stages'].items():
+                self.stageSeconds[stage] += values['seconds']
+                self.stageCalls[stage] += values['calls']
+            self.counters.update(snapshot['counters'])
+        return self
+
+    def reset(self):
+        with self._lock:
+            self.stageSeconds.clear()
+            self.stageCalls.clear()
+            self.counters.clear()
+
+    def flush(self) -> dict:
+        """
+        Envia o retrato atual para todos os sinks e o retorna.
+        """
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.emit(snapshot)
+        return snapshot
+
+
+class LoggingMetricsSink:
+    """
+    Sink que registra cada retrato das métricas em um logger.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger('pToolNER.metrics')
+        self.level = level
+
+    def emit(self, snapshot: dict):
+        self.logger.log(self.level, 'pToolNER metrics: %s', json.dumps(snapshot, sort_keys=True))
+
+
+class JsonLinesMetricsSink:
+    """
+    Sink que acrescenta cada retrato das métricas como uma linha JSON em um arquivo.
+    """
+
+    def __init__(self, filePath: str | Path):
+        self.filePath = Path(filePath)
+
+    def emit(self, snapshot: dict):
+        self.filePath.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.filePath, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot, sort_keys=True) + '\n')
+
+
+class PrometheusMetricsSink:
+    """
+    Sink que reescreve um arquivo no formato texto do Prometheus (ex: para o textfile
+    collector do node_exporter) a cada retrato das métricas.
+    """
+
+    def __init__(self, filePath: str | Path, prefix: str = 'ptoolner'):
+        self.filePath = Path(filePath)
+        self.prefix = prefix
+
+    def emit(self, snapshot: dict):
+        prefix = self.prefix
+        lines = [f"# TYPE {prefix}_stage_seconds_total counter"]
+        lines += [f'{prefix}_stage_seconds_total{{stage="{stage}"}} {values["seconds"]:.6f}'
+                  for stage, values in snapshot['stages'].items()]
+        lines.append(f"# TYPE {prefix}_stage_calls_total counter")
+        lines += [f'{prefix}_stage_calls_total{{stage="{stage}"}} {values["calls"]}'
+                  for stage, values in snapshot['stages'].items()]
+        for name, value in snapshot['counters'].items():
+            metric = f"{prefix}_{re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+
+        self.filePath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.filePath.with_name(f"{self.filePath.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.filePath)
+
+
+_OUTPUT_BUFFER_SIZE = 1 << 20 # Buffer de escrita dos arquivos de saída (1 MiB)
+_SHUFFLE_MAX_BUCKETS = 256
+
+def _outputCompression(filePath: str | Path, compression: str | None = None) -> str | None:
+    """
+    Resolve a compressão de um arquivo de saída: a informada ('gzip' ou 'zstd') ou,
+    se None, a indicada pela extensão (.gz, .zst).
+    """
+    if compression is None:
+        suffix = Path(filePath).suffix.lower()
+        compression = {'.gz': 'gzip', '.zst': 'zstd', '.zstd': 'zstd'}.get(suffix)
+    if compression not in (None, 'gzip', 'zstd'):
+        raise ValueError(f'Compressão "{compression}" não suportada. Use "gzip", "zstd" ou None.')
+    return compression
+
+def _openTextOutput(filePath: str | Path, encoding: str = 'utf-8', compression: str | None = None):
+    """
+    Abre um arquivo de saída em modo texto, com buffer grande e compressão opcional
+    (ver _outputCompression). zstd requer o pacote opcional `zstandard`.
+    """
+    compression = _outputCompression(filePath, compression)
+    if compression == 'gzip':
+        return io.TextIOWrapper(io.BufferedWriter(gzip.open(filePath, 'wb', compresslevel=6), _OUTPUT_BUFFER_SIZE),
+                                encoding=encoding)
+    if compression == 'zstd':
+        return _zstandard().open(filePath, 'wt', encoding=encoding)
+    return open(filePath, 'w', encoding=encoding, buffering=_OUTPUT_BUFFER_SIZE)
+
+def _openTextInput(filePath: str | Path, encoding: str = 'utf-8'):
+    """
+    Abre para leitura, em modo texto, um arquivo gravado por _openTextOutput.
+    """
+    compression = _outputCompression(filePath)
+    if compression == 'gzip':
+        return gzip.open(filePath, 'rt', encoding=encoding)
+    if compression == 'zstd':
+        return _zstandard().open(filePath, 'rt', encoding=encoding)
+    return open(filePath, 'r', encoding=encoding)
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError('A compressão zstd requer o pacote "zstandard" (pip install zstandard).') from e
+    return zstandard
+
+def _formatOutputSentences(sentences: Iterable, outputFormat: str, chunkSize: int = 4096) -> Iterator[str]:
+    """
+    Gera o texto das sentenças no formato de saída, em blocos de `chunkSize` sentenças
+    (uma escrita por bloco): 'plain' (uma sentença por linha) ou 'CoNLL' (um
+    "token<sep>tag" por linha e uma linha em branco entre sentenças).
+    """
+    iterator = iter(sentences)
+    isCoNLL = outputFormat.lower() == 'conll'
+    while chunk := list(islice(iterator, chunkSize)):
+        if not isCoNLL:
+            yield '\n'.join(map(str, chunk)) + '\n'
+            continue
+        parts = []
+        for sentence_tokens_and_tags in chunk:
+            if not isinstance(sentence_tokens_and_tags, list): # Espera uma lista de "token-tag"
+                print(f"Aviso: Esperava uma lista de 'token-tag' para o formato CoNLL, mas recebi: {type(sentence_tokens_and_tags)}")
+            elif not sentence_tokens_and_tags:
+                parts.append('\n') # Sentença vazia: apenas o delimitador
+            else:
+                try:
+                    parts.append('\n'.join(sentence_tokens_and_tags) + '\n\n') # Linha em branco delimita a sentença
+                except TypeError: # Itens que não são str
+                    parts.append('\n'.join(map(str, sentence_tokens_and_tags)) + '\n\n')
+        if parts:
+            yield ''.join(parts)
+
+def _externalShuffle(items: Iterable,
+                     memoryLimit: int,
+                     tmpDir: str | Path | None = None,
+                     itemCount: int | None = None) -> Iterator:
+    """
+    Embaralha uma sequência maior que a memória: cada item vai para um balde (arquivo
+    temporário) escolhido ao acaso e cada balde é embaralhado em memória (ou, se ainda
+    for maior que `memoryLimit`, recursivamente). A permutação resultante é uniforme.
+    Usa o gerador global do módulo `random` (reprodutível com random.seed).
+    """
+    iterator = iter(items)
+    head = []
+    for item in iterator:
+        head.append(item)
+        if len(head) > memoryLimit:
+            break
+    if len(head) <= memoryLimit:
+        random.shuffle(head)
+        yield from head
+        return
+
+    if itemCount is None and isinstance(items, Sequence):
+        itemCount = len(items)
+    bucketCount = _SHUFFLE_MAX_BUCKETS # Tamanho desconhecido: baldes que excederem o limite são divididos de novo
+    if itemCount is not None:
+        bucketCount = min(_SHUFFLE_MAX_BUCKETS, max(2, 2 * -(-itemCount // memoryLimit)))
+
+    with tempfile.TemporaryDirectory(prefix='ptoolner-shuffle-', dir=tmpDir) as tmp:
+        paths = [Path(tmp) / f"bucket-{i:03d}.pkl" for i in range(bucketCount)]
+        counts = [0] * bucketCount
+        buckets = [open(path, 'wb', buffering=_OUTPUT_BUFFER_SIZE // 16) for path in paths]
+        try:
+            for item in _chainItems(head, iterator):
+                bucket = random.randrange(bucketCount)
+                pickle.dump(item, buckets[bucket], protocol=pickle.HIGHEST_PROTOCOL)
+                counts[bucket] += 1
+        finally:
+            for bucket in buckets:
+                bucket.close()
+        del head
+
+        for path, count in zip(paths, counts):
+            if count <= memoryLimit:
+                bucketItems = list(_readPickled(path))
+                random.shuffle(bucketItems)
+                yield from bucketItems
+            else:
+                yield from _externalShuffle(_readPickled(path), memoryLimit, tmp, count)
+            path.unlink()
+
+def _chainItems(head: list, iterator: Iterator) -> Iterator:
+    yield from head
+    yield from iterator
+
+def _readPickled(path: Path) -> Iterator:
+    with open(path, 'rb', buffering=_OUTPUT_BUFFER_SIZE // 16) as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+class TaggedOutputArchive(abc.ABC):
+    """
+    Destino alternativo para as saídas por arquivo de sequenceTaggingOnText/OnTheFly
+    (ptTagged-<id> e NamedEntities-<id>.txt): em vez de um arquivo por entrada, todas
+    vão para um único arquivo tar (TarOutputArchive) ou para shards JSONL
+    (JsonlShardOutputArchive). Ver PortugueseToolNER.enableOutputArchive.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.filesWritten = 0
+
+    def addFile(self, name: str, sentences: Iterable, outputFormat: str):
+        """
+        Adiciona um arquivo lógico `name` com as sentenças no formato indicado ('plain' ou 'CoNLL').
+        """
+        with self._lock:
+            self._addFile(name, sentences, outputFormat)
+            self.filesWritten += 1
+
+    @abc.abstractmethod
+    def _addFile(self, name: str, sentences: Iterable, outputFormat: str):
+        """
+        Grava o arquivo lógico no destino (chamado com o lock adquirido).
+        """
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> 'TaggedOutputArchive':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TarOutputArchive(TaggedOutputArchive):
+    """
+    Grava cada arquivo lógico como um membro de um único arquivo tar, com o mesmo
+    conteúdo que teria como arquivo avulso. A extensão define a compressão:
+    .tar, .tar.gz/.tgz ou .tar.xz.
+    """
+
+    def __init__(self, filePath: str | Path, encoding: str = 'utf-8'):
+        super().__init__()
+        self.filePath = Path(filePath)
+        self.encoding = encoding
+        name = self.filePath.name.lower()
+        mode = 'w:gz' if name.endswith(('.tar.gz', '.tgz')) else 'w:xz' if name.endswith('.tar.xz') else 'w'
+        self.filePath.parent.mkdir(parents=True, exist_ok=True)
+        self._tar = tarfile.open(self.filePath, mode)
+
+    def _addFile(self, name: str, sentences: Iterable, outputFormat: str):
+        data = ''.join(_formatOutputSentences(sentences, outputFormat)).encode(self.encoding)
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        with self._lock:
+            if self._tar is not None:
+                self._tar.close()
+                self._tar = None
+
+
+class JsonlShardOutputArchive(TaggedOutputArchive):
+    """
+    Grava cada arquivo lógico como uma linha JSON {"name", "format", "sentences"} em shards
+    `<prefix>-00000.jsonl[.gz|.zst]`, abrindo um novo shard a cada `shardSize` arquivos.
+    Para CoNLL, "sentences" é uma lista de listas de "token<sep>tag".
+    """
+
+    def __init__(self,
+                 directory: str | Path,
+                 prefix: str = 'ptTagged',
+                 shardSize: int = 10_000,
+                 compression: str | None = 'gzip',
+                 encoding: str = 'utf-8'):
+        super().__init__()
+        if shardSize < 1:
+            raise ValueError('"shardSize" deve ser maior ou igual a 1.')
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.shardSize = shardSize
+        self.compression = _outputCompression('', compression)
+        self.encoding = encoding
+        self.shardPaths: list[Path] = []
+        self._shard = None
+        self._shardCount = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _addFile(self, name: str, sentences: Iterable, outputFormat: str):
+        if self._shard is None or self._shardCount >= self.shardSize:
+            self.__openShard()
+        record = {'name': name, 'format': outputFormat, 'sentences': list(sentences)}
+        self._shard.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._shardCount += 1
+
+    def __openShard(self):
+        if self._shard is not None:
+            self._shard.close()
+        extension = {'gzip': '.gz', 'zstd': '.zst', None: ''}[self.compression]
+        path = self.directory / f"{self.prefix}-{len(self.shardPaths):05d}.jsonl{extension}"
+        self._shard = _openTextOutput(path, self.encoding, self.compression)
+        self._shardCount = 0
+        self.shardPaths.append(path)
+
+    def close(self):
+        with self._lock:
+            if self._shard is not None:
+                self._shard.close()
+                self._shard = None
+
+    @staticmethod
+    def iterRecords(directory: str | Path, prefix: str = 'ptTagged', encoding: str = 'utf-8') -> Iterator[dict]:
+        """
+        Lê de volta, em ordem, os registros dos shards de uma pasta.
+        """
+        for path in sorted(Path(directory).glob(f"{prefix}-*.jsonl*")):
+            with _openTextInput(path, encoding) as f:
+                for line in f:
+                    yield json.loads(line)
+
+
 class PortugueseToolNER:
     """
     Classe para realizar Reconhecimento de Entidades Nomeadas (NER) 
@@ -39,11 +2771,23 @@ class PortugueseToolNER:
         self.filteredSentencesLabels: list[list[str]] = []
         self.unMaskedPlainSentences: list[str] = []
         self.uniqueStringNames: list[str] = [] # Considerar usar set para performance se a ordem não importar
+        self.auxNamesIndex: AuxNamesIndex = AuxNamesIndex() # Ver buildAuxNamesIndex
         self.taggedPlainTextTokenAndLabels: list[list[str]] = []
         self.filteredSentencesTokenAndLabels: list[list[str]] = []
 
         self.uniqueLabels: list[str] = []
+        self.corpus: CoNLLCorpus | None = None # Corpus colunar (loadCorpusInCoNLLFormat(columnar=True))
+        self.filteredCorpus: CoNLLCorpus | None = None # Resultado de filterCoNLLCorpusByCategories sobre self.corpus
         self.tagger: SequenceTagger | None = None # Inicializa o tagger como None
+        self.nerTrainedModelPath: str | Path | None = None # Usado para recarregar o modelo em workers
+        self._modelFingerprint: str | None = None # Ver getModelFingerprint
+        self.inferenceSettings: dict = {'inferenceBackend': 'eager'} # Ver loadNamedEntityModel
+        self._inferenceMode: bool = False # Predição dentro de torch.inference_mode (backends otimizados)
+        self.predictionCache: PredictionCache | None = None # Ver enablePredictionCache
+        self.metrics: PipelineMetrics | None = None # Ver enableMetrics
+        self.outputArchive: TaggedOutputArchive | None = None # Ver enableOutputArchive
+        self.sharedModelStartMethod: str | None = None # Ver enableSharedModel
+        self.workerMemoryUsage: dict[int, dict[str, int]] = {} # pid -> memória do worker (workers > 1)
 
         # Atributos para sequenceTaggingOnText / OnTheFly
         self.maskedSentencesToken: list[list[str]] = []
@@ -52,6 +2796,21 @@ class PortugueseToolNER:
         self.taggedFilesDict: dict[str, list[str]] = {}
         self.namedEntitiesDict: dict[str, list] = {} # O valor é uma lista de tuplas
         self.namedEntitiesByFileDict: dict[str, list] = {} # O valor é uma lista de tuplas
+        self.entityStatisticsByFileDict: dict[str, EntityStatistics] = {} # Agregados por arquivo/texto
+        self.generalEntityStatistics: EntityStatistics = EntityStatistics() # Agregado geral, atualizado incrementalmente
+
+        # Política de escrita do GeneralNamedEntities.txt em sequenceTaggingOnTheFly
+        # (ver setGeneralReportFlushPolicy). Por padrão, o relatório é reescrito a cada chamada.
+        self.generalReportFlushEveryNCalls: int | None = 1
+        self.generalReportFlushEverySeconds: float | None = None
+        self._generalReportPendingCalls: int = 0
+        self._generalReportLastFlush: float = time.monotonic()
+        self._generalReportOutputPath: str | Path | None = None
+
+        # Micro-batching de tagAsync (ver setAsyncBatchingPolicy)
+        self.asyncMaxBatchSize: int = 64
+        self.asyncMaxWaitMs: float = 5.0
+        self._asyncBatcher: _AsyncTaggingBatcher | None = None
 
 
     def __getListLabels(self) -> list[str]:
@@ -67,35 +2826,6 @@ class PortugueseToolNER:
         self.uniqueLabels = sorted(list(unique_labels_set)) # Ordenar para consistência
         return self.uniqueLabels
 
-    def __getMaskTokensIndex(self, spans, entitiesToMask: list[str]) -> list[int]:
-        """
-        Obtém os índices dos tokens que devem ser mascarados com base nas entidades e spans fornecidos.
-        Requer que os spans sejam objetos com um método `tokens` e que cada token
-        tenha um método `get_tag('label').value`. (Típico de Flair)
-
-        Args:
-            spans: Lista de spans de entidades (ex: resultado de sentence.get_spans()).
-            entitiesToMask: Lista de strings representando os tipos de entidade a serem mascarados.
-
-        Returns:
-            Lista de índices de tokens a serem mascarados.
-        """
-        toMaskIDX = []
-        for en_span in spans: # Renomeado para evitar conflito com 'en' de enumerate
-            # Assumindo que en_span é um objeto Span do Flair
-            if hasattr(en_span, 'tokens') and callable(getattr(en_span, 'get_tag', None)):
-                 # Verifica se é um span de entidade e não um token simples com tag
-                if en_span.tag in entitiesToMask: # Verifica a tag do span diretamente
-                    for token in en_span.tokens:
-                        toMaskIDX.append(token.idx)
-            # Fallback se spans for uma lista de tokens individuais (menos provável para get_spans)
-            elif hasattr(en_span, 'get_tag') and callable(getattr(en_span, 'get_tag', None)):
-                token = en_span # en_span é um token
-                if token.get_tag('label').value in entitiesToMask:
-                     if token.idx not in toMaskIDX: # Evitar duplicatas se o token fizer parte de múltiplos spans
-                        toMaskIDX.append(token.idx)
-        return sorted(list(set(toMaskIDX))) # Garante unicidade e ordem
-
     def __getSpans(self, spans_data: list[tuple[str, str]]) -> tuple[list[tuple[str, str, str]], list[str], list[str]]:
         """
         Processa spans de entidades para extrair informações como n-gramas e contagens.
@@ -106,30 +2836,13 @@ class PortugueseToolNER:
         Returns:
             Uma tupla contendo:
             - eNsAndAmount: Lista de tuplas (texto_da_entidade, contagem, tag).
+              A contagem considera apenas o texto da entidade.
             - nGramsCount: Lista de strings descrevendo a contagem de n-gramas.
             - uniqueLabels: Lista de tags de entidade únicas encontradas.
         """
-        uniqueLabels_set = set()
-        eNsAndAmount_map = {} # Usar um dicionário para contagem eficiente
-        fullNGrams = []
-
-        texts = [span_text for span_text, _ in spans_data]
-
-        for span_text, tag in spans_data:
-            length = len(span_text.split(' '))
-            fullNGrams.append(length)
-            uniqueLabels_set.add(tag)
-
-            key = (span_text, tag)
-            if key not in eNsAndAmount_map:
-                eNsAndAmount_map[key] = texts.count(span_text) # Contagem baseada apenas no texto
-
-        eNsAndAmount = [(text, str(count), tag) for (text, tag), count in eNsAndAmount_map.items()]
-        
-        uniqueNGrams = sorted(list(set(fullNGrams)))
-        nGramsCount = [f"{ng}-gram: {fullNGrams.count(ng)}" for ng in uniqueNGrams]
-        
-        return eNsAndAmount, nGramsCount, sorted(list(uniqueLabels_set))
+        with self._timed('spanAggregation'):
+            stats = EntityStatistics(spans_data)
+            return stats.entitiesAndAmount(), stats.nGramsCount(), stats.uniqueLabels()
 
     def __getPossiblesTokens(self, token: str) -> list[str]:
         """
@@ -156,12 +2869,19 @@ class PortugueseToolNER:
         }
         return list(variations)
 
-    def __sentenceTokenizer(self, text: str) -> list[str]:
+    def __sentenceTokenizer(self,
+                            text: str,
+                            sentenceSplitter: str | Callable[[str], list[str]] = 'punkt'
+                           ) -> list[str]:
         """
-        Tokeniza o texto em sentenças usando o tokenizador Punkt do NLTK para português.
+        Tokeniza o texto em sentenças. Por padrão usa o tokenizador Punkt do NLTK para
+        português, carregado uma única vez por processo.
 
         Args:
             text: O texto a ser tokenizado.
+            sentenceSplitter: Nome de um divisor registrado em SENTENCE_SPLITTERS
+                              ('punkt' ou 'regex') ou uma função que recebe o texto
+                              e retorna a lista de sentenças.
 
         Returns:
             Lista de sentenças.
@@ -169,13 +2889,14 @@ class PortugueseToolNER:
         Raises:
             LookupError: Se o tokenizador 'punkt' para português não for encontrado.
                          Sugere o download via nltk.download('punkt').
+            ValueError: Se o nome do divisor de sentenças não for conhecido.
         """
-        try:
-            sent_detector = nltk.data.load('tokenizers/punkt/portuguese.pickle')
-        except LookupError:
-            print("Recurso 'punkt' do NLTK não encontrado. Tente nltk.download('punkt')")
-            raise
-        return sent_detector.tokenize(text)
+        if not callable(sentenceSplitter):
+            if sentenceSplitter not in SENTENCE_SPLITTERS:
+                raise ValueError(f'Divisor de sentenças "{sentenceSplitter}" desconhecido. Opções: {sorted(SENTENCE_SPLITTERS)}')
+            sentenceSplitter = SENTENCE_SPLITTERS[sentenceSplitter]
+        with self._timed('sentenceSplit'):
+            return sentenceSplitter(text)
 
     def getUniqueNames(self, rawListNames: list[str], listStopNames: list[str]):
         """
@@ -200,12 +2921,45 @@ class PortugueseToolNER:
         
         self.uniqueStringNames = list(unique_names_set)
 
+    def buildAuxNamesIndex(self, names: Iterable[str] | None = None) -> AuxNamesIndex:
+        """
+        Constrói o índice da lista auxiliar de nomes usado no mascaramento (useAuxListNE=True):
+        um AuxNamesIndex com a forma normalizada (sem acentos e em casefold) de cada nome.
+        A busca de cada token passa a ser O(1), em vez de testar as variações do token
+        contra toda a lista.
+
+        O índice pode ser passado diretamente como `auxListNE` nos métodos de tagging.
+
+        Args:
+            names: Nomes a indexar. Se None, usa self.uniqueStringNames (ver getUniqueNames).
+
+        Returns:
+            O índice (também guardado em self.auxNamesIndex).
+        """
+        if names is None:
+            names = self.uniqueStringNames
+        self.auxNamesIndex = AuxNamesIndex.fromNames(names)
+        return self.auxNamesIndex
+
+    def __asAuxNamesIndex(self, auxListNE: Iterable[str] | AuxNamesIndex | GazetteerMatcher) -> AuxNamesIndex | GazetteerMatcher:
+        """
+        Retorna `auxListNE` como índice normalizado, construindo-o se ainda for uma coleção de
+        nomes (inclusive um set/frozenset comum). AuxNamesIndex e GazetteerMatcher são
+        retornados sem alterações.
+        """
+        if isinstance(auxListNE, (AuxNamesIndex, GazetteerMatcher)):
+            return auxListNE
+        return AuxNamesIndex.fromNames(auxListNE)
+
 
     def loadCorpusInCoNLLFormat(self,
                                 inputFilePath: str | Path,
                                 setEncoding: str = 'utf-8',
                                 sepTokenTag: str = ' ',
-                                loadPredictedCorpus: bool = False
+                                loadPredictedCorpus: bool = False,
+                                columnar: bool = False,
+                                cacheDir: str | Path | None = None,
+                                compressCache: bool = False
                                ) -> tuple[list[list[str]], list[list[str]], list[list[str]]]:
         """
         Carrega um corpus no formato CoNLL.
@@ -216,6 +2970,16 @@ class PortugueseToolNER:
             sepTokenTag: Separador entre token e tag (e predição, se aplicável).
             loadPredictedCorpus: Se True, espera três colunas (token, chave, predição).
                                  Caso contrário, espera duas colunas (token, tag).
+            columnar: Se True, guarda o corpus em um CoNLLCorpus (self.corpus), lido linha a
+                      linha, com vocabulário de tokens e ids de rótulos em buffers NumPy.
+                      Os atributos/retornos em lista passam a ser visões somente leitura,
+                      derivadas sob demanda, e filterCoNLLCorpusByCategories opera direto
+                      sobre o corpus colunar.
+            cacheDir: Pasta do cache binário. Se informada, o corpus é guardado em
+                      `<cacheDir>/conll-<chave>.npz` (ver CoNLLCorpus.save), com chave derivada
+                      do hash do conteúdo do arquivo e das opções de leitura; enquanto o arquivo
+                      não mudar, as próximas cargas apenas leem o cache, sem parsing.
+            compressCache: Se True, o cache binário é gravado comprimido.
 
         Returns:
             Se loadPredictedCorpus for True: (sentencesTokens, sentencesKeys, sentencesTokensKeysPreds)
@@ -227,6 +2991,18 @@ class PortugueseToolNER:
         """
         self.sentencesTokens, self.sentencesLabels, self.sentencesTokenAndLabels = [], [], []
         self.sentencesKeys, self.sentencesPreds, self.sentencesTokensKeysPreds = [], [], []
+        self.corpus = None
+
+        if cacheDir is not None:
+            corpus = self.__loadCachedCorpus(inputFilePath, setEncoding, sepTokenTag, loadPredictedCorpus,
+                                             cacheDir, compressCache)
+            return self.__loadColumnarCorpus(corpus, inputFilePath, materialize=not columnar)
+
+        if columnar:
+            return self.__loadColumnarCorpus(
+                CoNLLCorpus.fromFile(inputFilePath, setEncoding, sepTokenTag, loadPredictedCorpus),
+                inputFilePath
+            )
         
         tokensInSentence, tagsInSentence, tokenAndTagInSentence = [], [], []
         predsInSentence, keysInSentence, tokenKeyPredInSentence = [], [], []
@@ -305,6 +3081,61 @@ class PortugueseToolNER:
             return self.sentencesTokens, self.sentencesLabels, self.sentencesTokenAndLabels
 
 
+    def __loadCachedCorpus(self,
+                           inputFilePath: str | Path,
+                           setEncoding: str,
+                           sepTokenTag: str,
+                           loadPredictedCorpus: bool,
+                           cacheDir: str | Path,
+                           compressCache: bool) -> CoNLLCorpus:
+        """
+        Retorna o corpus do cache binário em `cacheDir`, ou faz o parsing do arquivo e grava o cache.
+        """
+        try:
+            contentHash = _fileContentHash(inputFilePath)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Arquivo não encontrado: {inputFilePath}")
+        cacheFile = Path(cacheDir) / \
+            f"conll-{_cacheKey(contentHash, setEncoding, sepTokenTag, loadPredictedCorpus)}.npz"
+
+        if cacheFile.is_file():
+            try:
+                return CoNLLCorpus.load(cacheFile)
+            except (ValueError, KeyError) as e:
+                print(f"Aviso: cache {cacheFile} inválido, o corpus será recarregado: {e}")
+
+        corpus = CoNLLCorpus.fromFile(inputFilePath, setEncoding, sepTokenTag, loadPredictedCorpus)
+        try:
+            corpus.save(cacheFile, compress=compressCache)
+        except OSError as e:
+            print(f"Aviso: não foi possível salvar o cache {cacheFile}: {e}")
+        return corpus
+
+    def __loadColumnarCorpus(self,
+                             corpus: CoNLLCorpus,
+                             inputFilePath: str | Path,
+                             materialize: bool = False
+                            ) -> tuple[Sequence[list[str]], Sequence[list[str]], Sequence[list[str]]]:
+        """
+        Define `corpus` como o corpus carregado e expõe suas visões nos atributos em lista.
+        Com materialize=True, as visões são convertidas em listas e o corpus colunar é descartado.
+        """
+        columns = corpus.toLists() if materialize else None
+        column = columns.__getitem__ if materialize else (lambda name: getattr(corpus, name))
+        self.corpus = None if materialize else corpus
+        self.sentencesTokens = column('sentencesTokens')
+        if corpus.predicted:
+            self.sentencesKeys = column('sentencesKeys')
+            self.sentencesPreds = column('sentencesPreds')
+            self.sentencesTokensKeysPreds = column('sentencesTokensKeysPreds')
+            print(f"Dataset com {len(corpus)} sentenças (preditas) carregado de {inputFilePath}!")
+            return self.sentencesTokens, self.sentencesKeys, self.sentencesTokensKeysPreds
+
+        self.sentencesLabels = column('sentencesLabels')
+        self.sentencesTokenAndLabels = column('sentencesTokenAndLabels')
+        print(f"Dataset com {len(corpus)} sentenças carregado de {inputFilePath}!")
+        return self.sentencesTokens, self.sentencesLabels, self.sentencesTokenAndLabels
+
     def loadCorpusInPlainFormat(self,
                                 inputFilePath: str | Path,
                                 withNamedEntities: bool = False,
@@ -369,21 +3200,161 @@ class PortugueseToolNER:
         else:
             return self.sentencesPlain
 
-    def loadNamedEntityModel(self, nerTrainedModelPath: str | Path):
+    def loadNamedEntityModel(self,
+                             nerTrainedModelPath: str | Path,
+                             inferenceBackend: str = 'eager',
+                             numThreads: int | None = None,
+                             numInteropThreads: int | None = None,
+                             torchScript: bool = False):
         """
         Carrega um modelo NER treinado (presumivelmente Flair).
 
         Args:
             nerTrainedModelPath: Caminho para o modelo treinado.
+            inferenceBackend: 'eager' (modelo como foi salvo, fp32) ou 'int8' (quantização
+                              dinâmica das camadas LSTM/GRU/Linear, exceto a reprojeção e a
+                              camada de saída do tagger, para CPU). Backends
+                              otimizados predizem dentro de torch.inference_mode. Como as
+                              predições podem mudar, confira a paridade com compareInferenceBackend.
+            numThreads: Threads intra-op do PyTorch (global no processo). Com workers > 1 em
+                        sequenceTaggingOnText, cada worker usa o mesmo valor: divida os núcleos
+                        entre eles (ex: núcleos // workers).
+            numInteropThreads: Threads inter-op do PyTorch.
+            torchScript: Se True, as camadas lineares da cabeça de rotulagem rodam em TorchScript.
+
+        Se o backend otimizado falhar na predição de teste feita após a carga, o modelo é
+        recarregado em modo eager (com um aviso) e inferenceSettings passa a indicar 'eager'.
         """
+        if inferenceBackend not in _INFERENCE_BACKENDS:
+            raise ValueError(f'Backend de inferência "{inferenceBackend}" inválido. Use um de {_INFERENCE_BACKENDS}.')
         try:
+            _configureTorchThreads(numThreads, numInteropThreads)
             self.tagger = SequenceTagger.load(nerTrainedModelPath)
-            print(f"Modelo NER carregado de: {nerTrainedModelPath}")
+            self.nerTrainedModelPath = nerTrainedModelPath
+            self._modelFingerprint = None
+            self.inferenceSettings = {'inferenceBackend': inferenceBackend, 'numThreads': numThreads,
+                                      'numInteropThreads': numInteropThreads, 'torchScript': torchScript}
+            self._inferenceMode = inferenceBackend != 'eager' or torchScript
+            if self._inferenceMode:
+                if not Path(nerTrainedModelPath).is_file():
+                    self.getModelFingerprint() # Dos pesos originais, antes da quantização
+                try:
+                    self.tagger = _optimizeTaggerForCPU(self.tagger, inferenceBackend, torchScript)
+                    _smokePrediction(self.tagger)
+                except Exception as e:
+                    print(f"Aviso: o backend {inferenceBackend}{' com TorchScript' if torchScript else ''} "
+                          f"falhou em uma predição de teste e o modelo segue em modo eager: {e}")
+                    self.tagger = SequenceTagger.load(nerTrainedModelPath) # O tagger otimizado foi alterado
+                    inferenceBackend = 'eager'
+                    self.inferenceSettings.update(inferenceBackend='eager', torchScript=False)
+                    self._inferenceMode = False
+            print(f"Modelo NER carregado de: {nerTrainedModelPath}"
+                  f"{f' (backend {inferenceBackend})' if self._inferenceMode else ''}")
         except Exception as e:
             print(f"Erro ao carregar o modelo NER de {nerTrainedModelPath}: {e}")
             self.tagger = None
             raise
 
+    def getModelFingerprint(self) -> str:
+        """
+        Retorna uma impressão digital do modelo carregado, usada nas chaves do cache binário
+        de sequenceTaggingOnText. É o hash do arquivo do modelo (se carregado de um arquivo)
+        ou, caso contrário, dos pesos do tagger, combinado com o backend de inferência se não
+        for 'eager'. Calculada uma única vez por modelo carregado.
+
+        Raises:
+            ValueError: Se nenhum modelo estiver carregado.
+        """
+        if self.tagger is None:
+            raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
+        if self._modelFingerprint is None:
+            if self.nerTrainedModelPath is not None and Path(self.nerTrainedModelPath).is_file():
+                self._modelFingerprint = _fileContentHash(self.nerTrainedModelPath)
+            else:
+                digest = hashlib.blake2b(digest_size=20)
+                for name, tensor in self.tagger.state_dict().items():
+                    digest.update(name.encode('utf-8'))
+                    digest.update(tensor.detach().cpu().numpy().tobytes())
+                self._modelFingerprint = digest.hexdigest()
+        backend = self.inferenceSettings['inferenceBackend']
+        return self._modelFingerprint if backend == 'eager' else _cacheKey(self._modelFingerprint, backend)
+
+    def compareInferenceBackend(self,
+                                heldOutFilePath: str | Path,
+                                setEncoding: str = 'utf-8',
+                                sepTokenTag: str = ' ',
+                                miniBatchSize: int = 32,
+                                maxSentences: int | None = None,
+                                outputFilePath: str | Path | None = None) -> InferenceBackendReport:
+        """
+        Compara o backend de inferência carregado (loadNamedEntityModel) com o modelo eager
+        (fp32, recarregado do mesmo caminho) sobre um arquivo CoNLL de validação
+        (token<sep>chave): concordância dos rótulos, F1 de cada um contra as chaves e vazão
+        (tokens/s, após um mini-batch de aquecimento, com as mesmas threads).
+
+        Args:
+            heldOutFilePath: Arquivo CoNLL de validação, não usado no treino.
+            setEncoding: Encoding do arquivo.
+            sepTokenTag: Separador das colunas.
+            miniBatchSize: Quantidade de sentenças por mini-batch.
+            maxSentences: Se informado, usa apenas as primeiras sentenças do arquivo.
+            outputFilePath: Se informado, grava o relatório (InferenceBackendReport.reportLines).
+
+        Returns:
+            InferenceBackendReport (ver withinTolerance).
+
+        Raises:
+            ValueError: Se nenhum modelo estiver carregado por loadNamedEntityModel.
+        """
+        if self.tagger is None or self.nerTrainedModelPath is None:
+            raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
+        import torch
+
+        corpus = CoNLLCorpus.fromFile(heldOutFilePath, setEncoding, sepTokenTag)
+        numSentences = len(corpus) if maxSentences is None else min(maxSentences, len(corpus))
+        sentencesTokens = [corpus.sentenceTokens(i) for i in range(numSentences)]
+        texts = [' '.join(tokens) for tokens in sentencesTokens]
+
+        eagerTagger = SequenceTagger.load(self.nerTrainedModelPath)
+        eagerTagger.eval()
+        eagerLabels, eagerSeconds = _timedPrediction(eagerTagger, texts, miniBatchSize, inferenceMode=False)
+        del eagerTagger
+        backendLabels, backendSeconds = _timedPrediction(self.tagger, texts, miniBatchSize,
+                                                         inferenceMode=self._inferenceMode)
+
+        report = InferenceBackendReport(backend=self.inferenceSettings['inferenceBackend'],
+                                        torchScript=bool(self.inferenceSettings.get('torchScript')),
+                                        numThreads=torch.get_num_threads(),
+                                        eagerSeconds=eagerSeconds, backendSeconds=backendSeconds)
+        tokens, keys, eagerPreds, backendPreds = [], [], [], []
+        equalTokens = equalSentences = 0
+        for i, (eager, backend) in enumerate(zip(eagerLabels, backendLabels)):
+            if not (len(eager) == len(backend) == len(sentencesTokens[i])):
+                report.skippedSentences += 1 # Tokenização diferente da do arquivo: não há como alinhar
+                continue
+            tokens.append(sentencesTokens[i])
+            keys.append(corpus.sentenceLabels(i))
+            eagerPreds.append(eager)
+            backendPreds.append(backend)
+            equal = sum(a == b for a, b in zip(eager, backend))
+            equalTokens += equal
+            equalSentences += equal == len(eager)
+
+        report.sentences = numSentences
+        report.tokens = sum(len(sentence) for sentence in sentencesTokens)
+        comparedTokens = sum(len(sentence) for sentence in tokens)
+        if comparedTokens:
+            report.labelAgreement = equalTokens / comparedTokens
+            report.sentenceAgreement = equalSentences / len(tokens)
+            report.eagerEvaluation = EvaluationResult.fromCorpus(
+                CoNLLCorpus.fromSentences(tokens, keys, sepTokenTag, sentencesPreds=eagerPreds))
+            report.backendEvaluation = EvaluationResult.fromCorpus(
+                CoNLLCorpus.fromSentences(tokens, keys, sepTokenTag, sentencesPreds=backendPreds))
+
+        if outputFilePath:
+            self.generateOutputFile(outputFileName=outputFilePath, sentences=report.reportLines(), outputFormat='plain')
+        return report
+
     def filterCoNLLCorpusByCategories(self,
                                       acceptableLabels: list[str],
                                       maskForUnacceptLabel: str,
@@ -401,42 +3372,75 @@ class PortugueseToolNER:
 
         Returns:
             Tupla (filtered_sentencesLabels, filtered_sentencesTokenAndLabels).
+            Com um corpus colunar carregado, são visões de self.filteredCorpus.
+            Para filtrar vários perfis de uma vez, use filterCoNLLCorpusByProfiles.
         """
+        if self.corpus is not None and not self.corpus.predicted:
+            # Corpus colunar: filtro vetorizado sobre os ids de rótulo, mantendo as visões sob demanda
+            self.filteredCorpus = self.corpus.filterByProfiles(
+                {'filtered': acceptableLabels}, maskForUnacceptLabel, sepTokenTag
+            )['filtered']
+            self.filteredSentencesLabels = self.filteredCorpus.sentencesLabels
+            self.filteredSentencesTokenAndLabels = self.filteredCorpus.sentencesTokenAndLabels
+            return self.filteredSentencesLabels, self.filteredSentencesTokenAndLabels
+
+        # Corpus em listas: a decisão (manter ou mascarar) é tomada uma vez por rótulo distinto,
+        # e não por token, e as duas saídas são montadas na mesma passada.
+        acceptable = set(acceptableLabels)
+        filteredLabelOf: dict[str, str] = {}
+        for sentenceLabels in self.sentencesLabels:
+            for full_tag in sentenceLabels:
+                if full_tag not in filteredLabelOf:
+                    current_tag_type = full_tag.replace('B-', '').replace('I-', '')
+                    filteredLabelOf[full_tag] = full_tag if current_tag_type in acceptable else maskForUnacceptLabel
+
         new_sentencesLabels: list[list[str]] = []
         new_sentencesTokenAndLabels: list[list[str]] = []
-
-        for sentence_idx, sentenceLabels in enumerate(self.sentencesLabels):
-            auxSentenceLabels: list[str] = []
-            for tag_idx, full_tag in enumerate(sentenceLabels):
-                # Remove prefixo B- ou I- para verificação
-                current_tag_type = full_tag.replace('B-', '').replace('I-', '')
-                
-                if current_tag_type in acceptableLabels:
-                    auxSentenceLabels.append(full_tag)
-                else:
-                    auxSentenceLabels.append(maskForUnacceptLabel)
+        for sentenceTokens, sentenceLabels in zip(self.sentencesTokens, self.sentencesLabels):
+            auxSentenceLabels = [filteredLabelOf[full_tag] for full_tag in sentenceLabels]
             new_sentencesLabels.append(auxSentenceLabels)
+            new_sentencesTokenAndLabels.append([f"{token}{sepTokenTag}{tag}" for token, tag in zip(sentenceTokens, auxSentenceLabels)])
 
-        for sentenceTokenAndLabels_entry in self.sentencesTokenAndLabels:
-            auxSentenceTokenAnLabels: list[str] = []
-            for tokenTag_entry in sentenceTokenAndLabels_entry:
-                parts = tokenTag_entry.split(sepTokenTag)
-                token = parts[0]
-                full_tag = parts[-1] # A tag é a última parte
-
-                current_tag_type = full_tag.replace('B-', '').replace('I-', '')
-
-                if current_tag_type in acceptableLabels:
-                    auxSentenceTokenAnLabels.append(f"{token}{sepTokenTag}{full_tag}")
-                else:
-                    auxSentenceTokenAnLabels.append(f"{token}{sepTokenTag}{maskForUnacceptLabel}")
-            new_sentencesTokenAndLabels.append(auxSentenceTokenAnLabels)
-
+        self.filteredCorpus = None
         self.filteredSentencesLabels = new_sentencesLabels
         self.filteredSentencesTokenAndLabels = new_sentencesTokenAndLabels
         
         return self.filteredSentencesLabels, self.filteredSentencesTokenAndLabels
 
+    def filterCoNLLCorpusByProfiles(self,
+                                    profiles: dict[str, list[str]],
+                                    maskForUnacceptLabel: str,
+                                    sepTokenTag: str = ' '
+                                   ) -> dict[str, CoNLLCorpus]:
+        """
+        Filtra o corpus CoNLL carregado para vários perfis de categorias de uma só vez
+        (ex: apenas PER, apenas LOC e PER+ORG a partir de um único carregamento).
+        Os rótulos são convertidos em ids e filtrados de forma vetorizada com NumPy.
+
+        Args:
+            profiles: {nome_do_perfil: rótulos aceitáveis (sem prefixo B-/I-)}.
+            maskForUnacceptLabel: Rótulo a ser usado para entidades não aceitáveis (ex: 'O').
+            sepTokenTag: Separador entre token e tag.
+
+        Returns:
+            {nome_do_perfil: CoNLLCorpus filtrado}. Cada corpus pode ser passado diretamente
+            para generateOutputFile.
+
+        Raises:
+            ValueError: Se nenhum corpus foi carregado, ou se o corpus carregado é predito
+                        (loadPredictedCorpus=True), que não tem rótulos a filtrar.
+        """
+        corpus = self.corpus
+        if (corpus is not None and corpus.predicted) or (corpus is None and self.sentencesKeys):
+            raise ValueError('O corpus carregado é predito (loadPredictedCorpus=True) e não pode ser filtrado. '
+                             'Carregue-o com loadCorpusInCoNLLFormat() sem loadPredictedCorpus.')
+        if corpus is None:
+            if not self.sentencesLabels:
+                raise ValueError('Nenhum corpus CoNLL carregado. Use loadCorpusInCoNLLFormat() primeiro.')
+            # Corpus em listas: converte tokens e rótulos para a representação colunar
+            corpus = CoNLLCorpus.fromSentences(self.sentencesTokens, self.sentencesLabels, sepTokenTag)
+        return corpus.filterByProfiles(profiles, maskForUnacceptLabel, sepTokenTag)
+
     def filterPlainCorpusByCategory(self, 
                                     taggedSentence: str, 
                                     allPlainLabels: list[str], 
@@ -474,81 +3478,414 @@ class PortugueseToolNER:
         return [newSentence]
 
 
-    def _process_single_sentence_for_tagging(self, 
-                                             sentence_text: str, 
+    def evaluatePredictedCorpus(self) -> EvaluationResult:
+        """
+        Avalia o corpus predito carregado com loadCorpusInCoNLLFormat(loadPredictedCorpus=True),
+        comparando `sentencesKeys` com `sentencesPreds` (ver EvaluationResult).
+
+        Returns:
+            EvaluationResult com as métricas por entidade e por token e a matriz de confusão.
+
+        Raises:
+            ValueError: Se nenhum corpus predito estiver carregado.
+        """
+        if self.corpus is not None and self.corpus.predicted:
+            corpus = self.corpus
+        elif self.sentencesKeys and self.sentencesPreds:
+            corpus = CoNLLCorpus.fromSentences(self.sentencesTokens, self.sentencesKeys,
+                                               sentencesPreds=self.sentencesPreds)
+        else:
+            raise ValueError('Nenhum corpus predito carregado. Use loadCorpusInCoNLLFormat(..., loadPredictedCorpus=True).')
+        return EvaluationResult.fromCorpus(corpus)
+
+    def evaluatePredictedFiles(self,
+                               inputFilePaths: Iterable[str | Path],
+                               setEncoding: str = 'utf-8',
+                               sepTokenTag: str = ' ',
+                               workers: int = 1,
+                               outputFilePath: str | Path | None = None
+                              ) -> tuple[dict[str, EvaluationResult], EvaluationResult]:
+        """
+        Avalia vários arquivos CoNLL preditos (token<sep>chave<sep>predição), opcionalmente em
+        paralelo, e combina os resultados. Os arquivos não são carregados em `self`.
+
+        Args:
+            inputFilePaths: Arquivos a serem avaliados.
+            setEncoding: Encoding dos arquivos.
+            sepTokenTag: Separador das colunas.
+            workers: Número de processos. Os resultados são combinados na ordem dos arquivos.
+            outputFilePath: Se informado, grava o relatório geral (EvaluationResult.reportLines).
+
+        Returns:
+            Tupla ({arquivo: EvaluationResult}, EvaluationResult combinado).
+        """
+        paths = [Path(path) for path in inputFilePaths]
+        if workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_evaluatePredictedFile, paths,
+                                            [setEncoding] * len(paths), [sepTokenTag] * len(paths)))
+        else:
+            results = [_evaluatePredictedFile(path, setEncoding, sepTokenTag) for path in paths]
+
+        total = EvaluationResult()
+        for result in results:
+            total.merge(result)
+
+        if outputFilePath:
+            self.generateOutputFile(outputFileName=outputFilePath, sentences=total.reportLines(), outputFormat='plain')
+        return {str(path): result for path, result in zip(paths, results)}, total
+
+    def _predict_sentences_in_batches(self,
+                                      sentences_text: list[str],
+                                      useTokenizer_flair: bool,
+                                      miniBatchSize: int = 32
+                                     ) -> list[Sentence | _PredictedSentence]:
+        """
+        Aplica o NER a várias sentenças de uma só vez, em mini-batches.
+
+        As sentenças são ordenadas por tamanho (número de tokens) antes da predição
+        para reduzir o padding dentro de cada mini-batch. Como o Flair anota os
+        objetos Sentence in-place, a lista retornada mantém a ordem original.
+
+        Args:
+            sentences_text: Lista de sentenças (strings) a serem anotadas.
+            useTokenizer_flair: Se o tokenizador interno do Flair deve ser usado.
+            miniBatchSize: Quantidade de sentenças por chamada ao modelo.
+
+        Returns:
+            Lista de objetos Sentence já anotados, na mesma ordem de `sentences_text`.
+        """
+        if self.tagger is None:
+            raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
+        if miniBatchSize < 1:
+            raise ValueError('"miniBatchSize" deve ser maior ou igual a 1.')
+
+        if self.predictionCache is not None:
+            return self.__predictWithCache(sentences_text, useTokenizer_flair, miniBatchSize)
+
+        with self._timed('sentenceBuild'):
+            sentence_objs = [Sentence(text.strip(), use_tokenizer=useTokenizer_flair) for text in sentences_text]
+        if not sentence_objs:
+            return sentence_objs
+
+        # Ordena do maior para o menor para que sentenças de tamanho parecido fiquem no mesmo batch
+        self.__predict(sorted(sentence_objs, key=len, reverse=True), miniBatchSize)
+
+        self.__countSentences(sentence_objs)
+        return sentence_objs
+
+    def __predict(self, sorted_objs: list[Sentence], miniBatchSize: int):
+        if self._inferenceMode:
+            import torch
+            with self._timed('predict'), torch.inference_mode():
+                self.tagger.predict(sorted_objs, mini_batch_size=miniBatchSize)
+        else:
+            with self._timed('predict'):
+                self.tagger.predict(sorted_objs, mini_batch_size=miniBatchSize)
+
+    def __countSentences(self, sentence_objs: list):
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.count('sentences', len(sentence_objs))
+            metrics.count('tokens', sum(len(sentence_obj.tokens) for sentence_obj in sentence_objs))
+
+    def __predictWithCache(self,
+                           sentences_text: list[str],
+                           useTokenizer_flair: bool,
+                           miniBatchSize: int) -> list[_PredictedSentence]:
+        """
+        Como `_predict_sentences_in_batches`, mas consultando o PredictionCache: apenas as
+        sentenças distintas ausentes do cache são enviadas ao modelo.
+        """
+        cache = self.predictionCache
+        fingerprint = self.getModelFingerprint()
+        keys = [cache.key(text, useTokenizer_flair, fingerprint) for text in sentences_text]
+        with self._timed('cacheLookup'):
+            found = cache.getMany(dict.fromkeys(keys))
+
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, sentences_text):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            with self._timed('sentenceBuild'):
+                sentence_objs = [Sentence(text.strip(), use_tokenizer=useTokenizer_flair) for text in missing.values()]
+            self.__predict(sorted(sentence_objs, key=len, reverse=True), miniBatchSize)
+            with self._timed('cacheLookup'):
+                found.update(cache.putMany({key: _PredictedSentence.payloadFromSentence(sentence_obj)
+                                            for key, sentence_obj in zip(missing, sentence_objs)}))
+
+        cache.recordLookups(hits=len(keys) - len(missing), misses=len(missing))
+        predicted = [found[key] for key in keys]
+        if self.metrics is not None:
+            self.metrics.count('cacheHits', len(keys) - len(missing))
+            self.metrics.count('cacheMisses', len(missing))
+        self.__countSentences(predicted)
+        return predicted
+
+    def enablePredictionCache(self,
+                              maxSize: int = 100_000,
+                              persistentPath: str | Path | None = None) -> PredictionCache:
+        """
+        Ativa o cache de predições por sentença (ver PredictionCache): sentenças repetidas
+        (ex: textos padronizados em documentos jurídicos) são rotuladas pelo modelo uma única vez.
+        Vale para todos os métodos de tagging; máscaras e saídas são idênticas às de uma
+        execução sem cache.
+
+        Args:
+            maxSize: Quantidade máxima de sentenças no LRU em memória.
+            persistentPath: Arquivo SQLite para manter as predições entre execuções (opcional).
+                            Com sequenceTaggingOnText(workers > 1), cada worker abre o mesmo
+                            arquivo e tem o seu próprio LRU e os seus próprios contadores.
+
+        Returns:
+            O PredictionCache ativo (também em self.predictionCache), com os contadores hits/misses.
+        """
+        self.disablePredictionCache()
+        self.predictionCache = PredictionCache(maxSize, persistentPath)
+        return self.predictionCache
+
+    def disablePredictionCache(self):
+        """
+        Desativa o cache de predições, fechando o arquivo SQLite se houver.
+        """
+        if self.predictionCache is not None:
+            self.predictionCache.close()
+            self.predictionCache = None
+
+    def enableMetrics(self, sinks: Iterable = ()) -> PipelineMetrics:
+        """
+        Ativa a instrumentação do pipeline de tagging: tempos por etapa e contadores
+        (ver PipelineMetrics). Desativada, cada etapa custa apenas um `with` em um
+        nullcontext compartilhado.
+
+        Args:
+            sinks: Destinos das métricas a cada flushMetrics() (ex: LoggingMetricsSink,
+                   JsonLinesMetricsSink, PrometheusMetricsSink). sequenceTaggingOnText
+                   envia as métricas ao final de cada chamada, somando as dos workers.
+
+        Returns:
+            O PipelineMetrics ativo (também em self.metrics).
+        """
+        self.metrics = PipelineMetrics(sinks)
+        return self.metrics
+
+    def disableMetrics(self):
+        """
+        Desativa a instrumentação do pipeline de tagging.
+        """
+        self.metrics = None
+
+    def flushMetrics(self) -> dict | None:
+        """
+        Envia o retrato atual das métricas para os sinks e o retorna (None se desativadas).
+        """
+        if self.metrics is None:
+            return None
+        return self.metrics.flush()
+
+    def enableOutputArchive(self,
+                            outputPath: str | Path,
+                            archiveFormat: str = 'jsonl',
+                            shardSize: int = 10_000,
+                            compression: str | None = 'gzip') -> TaggedOutputArchive:
+        """
+        Passa a gravar as saídas por arquivo/texto (ptTagged-<id> e NamedEntities-<id>.txt)
+        em um único destino, em vez de um arquivo por entrada. O relatório geral
+        (GeneralNamedEntities.txt) continua em outputFilePath. Vale para
+        sequenceTaggingOnText (inclusive com workers > 1) e sequenceTaggingOnTheFly;
+        iterTagFile continua gravando um arquivo por entrada.
+
+        Args:
+            outputPath: Pasta dos shards ('jsonl') ou caminho do arquivo tar ('tar';
+                        .tar, .tar.gz/.tgz ou .tar.xz).
+            archiveFormat: 'jsonl' (JsonlShardOutputArchive) ou 'tar' (TarOutputArchive).
+            shardSize: Arquivos lógicos por shard (apenas 'jsonl').
+            compression: Compressão dos shards: 'gzip', 'zstd' ou None (apenas 'jsonl').
+
+        Returns:
+            O TaggedOutputArchive ativo (também em self.outputArchive). Feche-o com
+            disableOutputArchive() ao final para concluir a escrita.
+        """
+        self.disableOutputArchive()
+        if archiveFormat == 'jsonl':
+            self.outputArchive = JsonlShardOutputArchive(outputPath, shardSize=shardSize, compression=compression)
+        elif archiveFormat == 'tar':
+            self.outputArchive = TarOutputArchive(outputPath)
+        else:
+            raise ValueError(f'"archiveFormat" deve ser "jsonl" ou "tar", e não "{archiveFormat}".')
+        return self.outputArchive
+
+    def disableOutputArchive(self):
+        """
+        Fecha o TaggedOutputArchive ativo (se houver) e volta a gravar um arquivo por entrada.
+        """
+        if self.outputArchive is not None:
+            self.outputArchive.close()
+            self.outputArchive = None
+
+    def enableSharedModel(self, startMethod: str | None = None):
+        """
+        Ativa a hospedagem compartilhada do modelo para sequenceTaggingOnText com workers > 1:
+        em vez de cada worker carregar o modelo do disco, o SequenceTagger carregado neste
+        processo é congelado (modo eval, sem gradientes), seus tensores são movidos para
+        memória compartilhada e os workers usam essa mesma cópia, somente leitura. A economia
+        pode ser conferida na memória por worker (RSS/PSS) impressa ao final e guardada em
+        `workerMemoryUsage`.
+
+        Args:
+            startMethod: Como criar os workers. 'fork' (padrão, onde disponível): os workers
+                         herdam as páginas do processo principal, compartilhadas enquanto não
+                         forem escritas. 'forkserver' ou 'spawn': os tensores são passados por
+                         memória compartilhada (pesos quantizados, ver loadNamedEntityModel,
+                         são copiados para cada worker).
+        """
+        if self.tagger is None:
+            raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
+        available = multiprocessing.get_all_start_methods()
+        startMethod = startMethod or ('fork' if 'fork' in available else 'spawn')
+        if startMethod not in available:
+            raise ValueError(f'Método de início "{startMethod}" não disponível. Use um de {available}.')
+        self.sharedModelStartMethod = startMethod
+
+    def disableSharedModel(self):
+        """
+        Volta a carregar o modelo do disco em cada worker.
+        """
+        self.sharedModelStartMethod = None
+
+    def __shareTagger(self):
+        """
+        Congela o tagger e move seus tensores para memória compartilhada (idempotente).
+        """
+        import torch.multiprocessing # Registra a serialização de tensores por memória compartilhada
+        self.tagger.eval()
+        for parameter in self.tagger.parameters():
+            parameter.requires_grad_(False)
+        self.tagger.share_memory()
+
+    def _timed(self, stage: str):
+        if self.metrics is None:
+            return _NULL_TIMER
+        return self.metrics.time(stage)
+
+    def _process_single_sentence_for_tagging(self,
+                                             sentence_text: str,
                                              useTokenizer_flair: bool,
                                              maskNamedEntity: bool,
                                              sepTokenTag: str | None,
                                              entitiesToMask: list[str] | None,
                                              specialTokenToMaskNE: str | None,
                                              useAuxListNE: bool,
-                                             auxListNE: list[str] | None,
-                                             createOutputListSpans: bool
-                                            ) -> tuple[list[str], list[str], list[tuple[str, str]]]:
+                                             auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None,
+                                             createOutputListSpans: bool,
+                                             sentence_obj: Sentence | None = None
+                                            ) -> tuple[list[str], list[str], list[tuple[str, str]], str]:
         """
         Método auxiliar para processar uma única sentença: aplicar NER, mascarar, extrair spans.
+        Se `sentence_obj` for fornecido (já anotado, ex: por `_predict_sentences_in_batches`),
+        a predição não é refeita.
+
+        Returns:
+            Tupla (tokens, linhas "token<sep>label", spans (texto, tag), sentença no formato plain).
         """
         if self.tagger is None:
             raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
 
-        sentence_obj = Sentence(sentence_text.strip(), use_tokenizer=useTokenizer_flair)
-        self.tagger.predict(sentence_obj)
+        if sentence_obj is None:
+            sentence_obj = self._predict_sentences_in_batches([sentence_text], useTokenizer_flair)[0]
         sentenceSpans = sentence_obj.get_spans(label_type='label') # 'label' é o tipo padrão no Flair
+        if self.metrics is not None:
+            self.metrics.count('entities', len(sentenceSpans))
 
-        current_masked_tokens: list[str] = []
-        current_masked_token_and_label: list[str] = []
-        current_sentence_named_entities: list[tuple[str,str]] = [] # (text, tag)
+        if maskNamedEntity and not all([sepTokenTag, entitiesToMask, specialTokenToMaskNE]):
+            raise ValueError('Para mascaramento, "sepTokenTag", "entitiesToMask" e "specialTokenToMaskNE" são obrigatórios.')
 
-        if maskNamedEntity:
-            if not all([sepTokenTag, entitiesToMask, specialTokenToMaskNE]):
-                raise ValueError('Para mascaramento, "sepTokenTag", "entitiesToMask" e "specialTokenToMaskNE" são obrigatórios.')
-            
-            _toMaskIDX = self.__getMaskTokensIndex(sentenceSpans, entitiesToMask)
-
-            if useAuxListNE and auxListNE:
-                additional_mask_indices = set()
-                for token in sentence_obj.tokens:
-                    pTokens = self.__getPossiblesTokens(token.text)
-                    if any(pT in auxListNE for pT in pTokens):
-                        additional_mask_indices.add(token.idx)
-                
-                _toMaskIDX = sorted(list(set(_toMaskIDX) | additional_mask_indices))
-
-
-            last_token_was_mask = False
-            for token in sentence_obj.tokens:
-                if token.idx in _toMaskIDX:
-                    if not last_token_was_mask: # Adiciona o token de máscara apenas uma vez por sequência
-                        current_masked_tokens.append(specialTokenToMaskNE)
-                        # A tag associada ao token de máscara pode ser a do primeiro token da entidade mascarada
-                        # ou uma tag genérica de máscara. Aqui, usa a tag do token atual.
-                        current_masked_token_and_label.append(f"{specialTokenToMaskNE}{sepTokenTag}{token.get_tag('label').value}")
-                        last_token_was_mask = True
-                else:
-                    current_masked_tokens.append(token.text)
-                    current_masked_token_and_label.append(f"{token.text}{sepTokenTag}{token.get_tag('label').value}")
-                    last_token_was_mask = False
-        else: # Sem mascaramento, apenas texto tageado
-            # self.unMaskedPlainSentences.append(sentence_obj.to_tagged_string())
-            # Esta função auxiliar não deve modificar atributos de self diretamente para unMaskedPlainSentences
-            # Ela deve retornar os dados para o chamador agregar.
-            # Para consistência, vamos retornar tokens e tokens+labels como se fosse mascarado, mas sem máscara.
-            for token in sentence_obj.tokens:
-                current_masked_tokens.append(token.text) # Na verdade, são os tokens originais
-                current_masked_token_and_label.append(f"{token.text}{sepTokenTag or ' '}{token.get_tag('label').value}")
+        auxNamesIndex = None
+        if maskNamedEntity and useAuxListNE and auxListNE:
+            auxNamesIndex = self.__asAuxNamesIndex(auxListNE)
 
+        current_masked_tokens, current_masked_token_and_label, tagged_string = self.__renderSentence(
+            sentence_obj, sentenceSpans, maskNamedEntity, sepTokenTag, entitiesToMask,
+            specialTokenToMaskNE, auxNamesIndex)
 
+        current_sentence_named_entities: list[tuple[str,str]] = [] # (text, tag)
         if createOutputListSpans:
-            for span in sentenceSpans:
-                current_sentence_named_entities.append((span.text, span.tag))
+            current_sentence_named_entities = [(span.text, span.tag) for span in sentenceSpans]
         
-        # Se não houver mascaramento, current_masked_tokens é só a lista de tokens da sentença
-        # e current_masked_token_and_label são os tokens com suas tags.
-        # Se houver mascaramento, eles contêm os tokens/NEs mascarados.
-        
-        # Retornando os tokens processados (mascarados ou não) e suas labels, e os spans.
-        # O chamador decidirá se são "masked" ou "unmasked" com base no parâmetro maskNamedEntity.
-        return current_masked_tokens, current_masked_token_and_label, current_sentence_named_entities
+        # Retorna os tokens processados (mascarados ou não) e suas labels, os spans e a sentença
+        # no formato plain (mascarada, ou a tageada pelo Flair se não houver mascaramento).
+        return current_masked_tokens, current_masked_token_and_label, current_sentence_named_entities, tagged_string
+
+    def __renderSentence(self,
+                         sentence_obj: Sentence,
+                         sentenceSpans: list,
+                         maskNamedEntity: bool,
+                         sepTokenTag: str | None,
+                         entitiesToMask: list[str] | None,
+                         specialTokenToMaskNE: str | None,
+                         auxNamesIndex: AuxNamesIndex | GazetteerMatcher | None
+                        ) -> tuple[list[str], list[str], str]:
+        """
+        Gera, em uma única passada linear pelos tokens, os tokens (mascarados ou não), as linhas
+        "token<sep>label" e a sentença no formato plain.
+
+        Tokens consecutivos a mascarar viram um único token de máscara, com o rótulo do primeiro
+        token da sequência. Se `specialTokenToMaskNE` contiver '{type}' (ex: '[{type}]'), o tipo
+        da entidade é inserido na máscara ('[PER]', '[LOC]', ...) e só tokens consecutivos com a
+        mesma máscara são agrupados; tokens mascarados apenas pela lista auxiliar de nomes
+        usam o tipo PER.
+        """
+        tokens = sentence_obj.tokens
+        texts = [token.text for token in tokens]
+        labels = [_tokenLabel(token) for token in tokens]
+
+        if not maskNamedEntity:
+            sep = sepTokenTag or ' '
+            return texts, [f"{text}{sep}{label}" for text, label in zip(texts, labels)], sentence_obj.to_tagged_string()
+
+        with self._timed('masking'): # Uma medição por sentença, com auxLookup aninhado
+            # Tipo da entidade a mascarar em cada posição (None = mantém o token)
+            maskTypes: list[str | None] = [None] * len(tokens)
+            masked = frozenset(entitiesToMask)
+            position = None
+            for span in sentenceSpans:
+                if span.tag in masked:
+                    if position is None:
+                        position = {token.idx: i for i, token in enumerate(tokens)}
+                    for token in span.tokens:
+                        maskTypes[position[token.idx]] = span.tag
+
+            if auxNamesIndex is not None:
+                with self._timed('auxLookup'):
+                    if isinstance(auxNamesIndex, GazetteerMatcher):
+                        # Nomes com vários tokens: mascara apenas sequências completas do gazetteer
+                        for start, end in auxNamesIndex.findMatches(texts):
+                            for i in range(start, end):
+                                maskTypes[i] = maskTypes[i] or 'PER'
+                    else:
+                        for i, text in enumerate(texts):
+                            if maskTypes[i] is None and normalizeNameToken(text) in auxNamesIndex:
+                                maskTypes[i] = 'PER'
+
+            perType = '{type}' in specialTokenToMaskNE
+            masked_tokens: list[str] = []
+            masked_token_and_label: list[str] = []
+            previous_mask = None
+            for text, label, maskType in zip(texts, labels, maskTypes):
+                if maskType is None:
+                    masked_tokens.append(text)
+                    masked_token_and_label.append(f"{text}{sepTokenTag}{label}")
+                    previous_mask = None
+                    continue
+                mask = specialTokenToMaskNE.replace('{type}', maskType) if perType else specialTokenToMaskNE
+                if mask != previous_mask: # Adiciona o token de máscara apenas uma vez por sequência
+                    masked_tokens.append(mask)
+                    masked_token_and_label.append(f"{mask}{sepTokenTag}{label}")
+                    previous_mask = mask
+
+        return masked_tokens, masked_token_and_label, ' '.join(masked_tokens)
 
 
     def _sequence_tagging_logic(self,
@@ -564,122 +3901,119 @@ class PortugueseToolNER:
                                 entitiesToMask: list[str] | None = None,
                                 specialTokenToMaskNE: str | None = None,
                                 useAuxListNE: bool = False,
-                                auxListNE: list[str] | None = None
+                                auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None = None,
+                                miniBatchSize: int = 32
                                ) -> tuple[list[list[str]], dict[str, list[str]], dict[str, list], dict[str, list]]:
         """
         Lógica principal de tagging de sequência, compartilhada por `sequenceTaggingOnText` e `sequenceTaggingOnTheFly`.
+        Todas as sentenças do 'identifier' são anotadas em mini-batches de `miniBatchSize`.
+        """
+        document = self._tag_document(sentences_to_predict, useTokenizer_flair, maskNamedEntity,
+                                      createOutputListSpans, sepTokenTag, entitiesToMask,
+                                      specialTokenToMaskNE, useAuxListNE, auxListNE, miniBatchSize)
+        return self._store_tagged_document(identifier, document, createOutputListSpans,
+                                           createOutputFile, outputFilePath, outFormat)
+
+    def _tag_document(self,
+                      sentences_to_predict: list[str],
+                      useTokenizer_flair: bool,
+                      maskNamedEntity: bool,
+                      createOutputListSpans: bool,
+                      sepTokenTag: str | None = ' ',
+                      entitiesToMask: list[str] | None = None,
+                      specialTokenToMaskNE: str | None = None,
+                      useAuxListNE: bool = False,
+                      auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None = None,
+                      miniBatchSize: int = 32
+                     ) -> TaggedDocument:
+        """
+        Anota as sentenças de um arquivo/texto e retorna o TaggedDocument correspondente,
+        sem alterar o estado da instância.
         """
         if self.tagger is None:
             raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
 
-        # Listas para acumular resultados de todas as sentenças processadas sob este 'identifier'
-        all_processed_tokens_for_identifier: list[list[str]] = [] # Lista de listas de tokens
-        all_processed_token_labels_for_identifier: list[list[str]] = [] # Lista de listas de "token<sep>label"
-        all_plain_tagged_sentences_for_identifier: list[str] = [] # Lista de sentenças como string tageada
+        sentences_text = [sentence_text for sentence_text in sentences_to_predict if sentence_text.strip()]
+        tagged_sentence_objs = self._predict_sentences_in_batches(sentences_text, useTokenizer_flair, miniBatchSize)
+        return self._build_tagged_document(sentences_text, tagged_sentence_objs, useTokenizer_flair, maskNamedEntity,
+                                           createOutputListSpans, sepTokenTag, entitiesToMask,
+                                           specialTokenToMaskNE, useAuxListNE, auxListNE)
 
-        all_named_entities_for_identifier: list[tuple[str,str]] = [] # Acumula spans de todas as sents para este ID
-        # generalNamedEntities é melhor acumulado fora, se for para todos os identifiers
+    def _build_tagged_document(self,
+                               sentences_text: list[str],
+                               tagged_sentence_objs: list,
+                               useTokenizer_flair: bool,
+                               maskNamedEntity: bool,
+                               createOutputListSpans: bool,
+                               sepTokenTag: str | None = ' ',
+                               entitiesToMask: list[str] | None = None,
+                               specialTokenToMaskNE: str | None = None,
+                               useAuxListNE: bool = False,
+                               auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None = None
+                              ) -> TaggedDocument:
+        """
+        Monta o TaggedDocument a partir de sentenças já anotadas pelo modelo (máscaras, linhas
+        "token<sep>label", sentenças no formato plain e spans).
+        """
+        # Acumula os resultados de todas as sentenças processadas sob este 'identifier'
+        document = TaggedDocument()
 
-        for sentence_text in sentences_to_predict:
-            if not sentence_text.strip():
-                continue
+        if useAuxListNE and auxListNE:
+            auxListNE = self.__asAuxNamesIndex(auxListNE) # Constrói o índice uma vez por chamada
 
-            processed_tokens, processed_token_labels, sentence_nes = \
+        for sentence_text, sentence_obj in zip(sentences_text, tagged_sentence_objs):
+            processed_tokens, processed_token_labels, sentence_nes, tagged_string = \
                 self._process_single_sentence_for_tagging(
                     sentence_text, useTokenizer_flair, maskNamedEntity,
                     sepTokenTag, entitiesToMask, specialTokenToMaskNE,
-                    useAuxListNE, auxListNE, createOutputListSpans
+                    useAuxListNE, auxListNE, createOutputListSpans,
+                    sentence_obj=sentence_obj
                 )
             
-            all_processed_tokens_for_identifier.append(processed_tokens)
-            all_processed_token_labels_for_identifier.append(processed_token_labels) # Para CoNLL output
-            
-            # Cria a string da sentença (mascarada ou não)
-            # Se maskNamedEntity for True, processed_tokens já contêm o specialTokenToMaskNE.
-            # Se maskNamedEntity for False, processed_tokens são os tokens originais,
-            # e to_tagged_string() é o Flair quem faz.
-            # Para manter a consistência com o código original que usava maskedPlainSentencesToken:
-            if maskNamedEntity:
-                 all_plain_tagged_sentences_for_identifier.append(' '.join(processed_tokens))
-            else:
-                # Recria o objeto Sentence para usar o to_tagged_string() original se não mascarar
-                # Isso evita a necessidade de reimplementar to_tagged_string() perfeitamente.
-                # No entanto, _process_single_sentence_for_tagging já retorna os tokens e labels
-                # que podem ser usados para construir a string tageada.
-                # O código original usava sentenceToPred.to_tagged_string() para o caso não mascarado.
-                # Para simplificar e usar o que já temos:
-                # Se não mascarou, processed_token_labels tem "token<sep>label"
-                # Podemos juntá-los para formar a sentença tageada, mas o Flair `to_tagged_string`
-                # é mais robusto pois lida com <...> em volta das entidades.
-                # Vamos simular to_tagged_string() de forma básica ou usar o que temos:
-                # A lista all_processed_token_labels_for_identifier é o que seria escrito no CoNLL.
-                # Para a versão "plain tagged", se não mascarado, o ideal seria realmente:
-                temp_sentence_obj = Sentence(sentence_text.strip(), use_tokenizer=useTokenizer_flair)
-                self.tagger.predict(temp_sentence_obj)
-                all_plain_tagged_sentences_for_identifier.append(temp_sentence_obj.to_tagged_string())
+            document.tokens.append(processed_tokens)
+            document.tokenAndLabels.append(processed_token_labels) # Para CoNLL output
+            document.numTokens += len(sentence_obj.tokens)
+            # Sentença mascarada ou, sem mascaramento, a to_tagged_string() do objeto Sentence já
+            # anotado pelo batch (o Flair lida com as <...> em volta das entidades).
+            document.plainSentences.append(tagged_string)
 
 
             if createOutputListSpans:
-                all_named_entities_for_identifier.extend(sentence_nes)
+                document.namedEntities.extend(sentence_nes)
+
+        return document
 
+    def _store_tagged_document(self,
+                               identifier: str,
+                               document: TaggedDocument,
+                               createOutputListSpans: bool,
+                               createOutputFile: bool,
+                               outputFilePath: str | Path | None = None,
+                               outFormat: str | None = None
+                              ) -> tuple[list[list[str]], dict[str, list[str]], dict[str, list], dict[str, list]]:
+        """
+        Registra o resultado do tagging de um arquivo/texto (taggedFilesDict e estatísticas)
+        e gera os arquivos de saída pedidos.
+        """
         # Armazenar resultados para este identifier
         # O nome da chave no dicionário é o 'identifier' (nome do arquivo ou textId)
-        self.taggedFilesDict[str(identifier)] = all_plain_tagged_sentences_for_identifier
+        self.taggedFilesDict[str(identifier)] = document.plainSentences
         
         # self.maskedSentencesToken e self.maskedSentencesTokenAndLabel
         # Se a intenção é que estes guardem os resultados da ÚLTIMA chamada a sequenceTagging,
         # então devem ser atribuídos aqui. Se for para acumular entre chamadas, a lógica muda.
         # Pelo retorno de sequenceTaggingOnTheFly, parece que é o resultado da chamada atual.
-        current_call_masked_tokens = all_processed_tokens_for_identifier # Pode ser mascarado ou não
-
-        if createOutputFile:
-            if not outputFilePath or not outFormat:
-                raise ValueError('"outputFilePath" e "outputFormat" são obrigatórios para criar arquivo de saída.')
-            
-            output_file_path = Path(outputFilePath)
-            output_file_path.mkdir(parents=True, exist_ok=True) # Garante que o diretório exista
-            
-            output_filename_base = output_file_path / f"ptTagged-{identifier}"
-            
-            if outFormat.lower() == 'plain':
-                # all_plain_tagged_sentences_for_identifier já contém as sentenças corretas (mascaradas ou flair tagged)
-                self.generateOutputFile(outputFileName=str(output_filename_base) + ".txt",
-                                        sentences=all_plain_tagged_sentences_for_identifier,
-                                        outputFormat='plain')
-            elif outFormat.lower() == 'conll':
-                # all_processed_token_labels_for_identifier é uma lista de listas [token<sep>label, ...]
-                # A função generateOutputFile para CoNLL espera uma lista de listas de strings "token<sep>label"
-                self.generateOutputFile(outputFileName=str(output_filename_base) + ".conll",
-                                        sentences=all_processed_token_labels_for_identifier, # Passando a lista de listas
-                                        outputFormat='CoNLL')
-            else:
-                print(f"Formato de saída '{outFormat}' não suportado para ptTagged.")
-
+        current_call_masked_tokens = document.tokens # Pode ser mascarado ou não
 
+        fileStats = None
         if createOutputListSpans:
             # Named entities específicas para este identifier (arquivo/texto)
-            nEsAndAmount_file, nGramsCountByFile, uniqueLabelsByFile = self.__getSpans(all_named_entities_for_identifier)
-            self.namedEntitiesByFileDict[str(identifier)] = nEsAndAmount_file
-
-            if createOutputFile and outputFilePath: # Verifica se o caminho de saída é válido
-                output_file_path = Path(outputFilePath) # Garante que é um objeto Path
-                fileSpansToOut: list[str] = []
-                for uL in uniqueLabelsByFile:
-                    fileSpansToOut.append(f'CATEGORY:{uL}\n')
-                    for text, count, tag_val in nEsAndAmount_file:
-                        if tag_val == uL:
-                            fileSpansToOut.append(f'{text}: {count}\n') # Removido .join que não fazia sentido
-                    fileSpansToOut.append('\n') # Adiciona uma linha em branco entre categorias
-
-                fileSpansToOut.append('\n-------\n')
-                for nGCG in nGramsCountByFile:
-                    fileSpansToOut.append(f'{nGCG}\n') # Adiciona \n para cada linha
+            with self._timed('spanAggregation'):
+                fileStats = EntityStatistics(document.namedEntities)
+                self._store_identifier_statistics(str(identifier), fileStats)
 
-                self.generateOutputFile(
-                    outputFileName=output_file_path / f"NamedEntities-{identifier}.txt",
-                    sentences=fileSpansToOut, # Já é uma lista de strings prontas para escrever
-                    outputFormat='plain'
-                )
+        if createOutputFile:
+            self._write_tagged_outputs(identifier, document, fileStats, outputFilePath, outFormat)
         
         # Retorna os tokens (potencialmente mascarados) da chamada atual,
         # o dicionário de arquivos tageados (que é um atributo de self, mas pode ser útil retornar),
@@ -687,6 +4021,160 @@ class PortugueseToolNER:
         return current_call_masked_tokens, self.taggedFilesDict, self.namedEntitiesByFileDict, self.namedEntitiesDict
 
 
+    def _write_tagged_outputs(self,
+                              identifier: str,
+                              document: TaggedDocument,
+                              fileStats: EntityStatistics | None,
+                              outputFilePath: str | Path | None,
+                              outFormat: str | None):
+        """
+        Gera as saídas de um arquivo/texto: ptTagged-<id> (.txt ou .conll) e, se houver
+        estatísticas, NamedEntities-<id>.txt. Com um TaggedOutputArchive ativo
+        (enableOutputArchive), elas vão para o arquivo tar/shards em vez de arquivos avulsos.
+        Identificadores com subpastas ('sub/arquivo.txt', ver sequenceTaggingDistributed)
+        geram as saídas na subpasta correspondente ('sub/ptTagged-arquivo.txt.txt').
+        """
+        if not outputFilePath or not outFormat:
+            raise ValueError('"outputFilePath" e "outputFormat" são obrigatórios para criar arquivo de saída.')
+        
+        output_file_path = Path(outputFilePath)
+        if self.outputArchive is None:
+            output_file_path.mkdir(parents=True, exist_ok=True) # Garante que o diretório exista
+        subdir, _, name = str(identifier).rpartition('/')
+        prefix = f"{subdir}/" if subdir else ''
+        
+        if outFormat.lower() == 'plain':
+            # plainSentences já contém as sentenças corretas (mascaradas ou flair tagged)
+            self.__writeIdentifierOutput(output_file_path, f"{prefix}ptTagged-{name}.txt",
+                                         document.plainSentences, 'plain')
+        elif outFormat.lower() == 'conll':
+            # tokenAndLabels é uma lista de listas [token<sep>label, ...]
+            self.__writeIdentifierOutput(output_file_path, f"{prefix}ptTagged-{name}.conll",
+                                         document.tokenAndLabels, 'CoNLL')
+        else:
+            print(f"Formato de saída '{outFormat}' não suportado para ptTagged.")
+
+        if fileStats is not None:
+            with self._timed('spanAggregation'):
+                fileSpansToOut = fileStats.reportLines()
+            self.__writeIdentifierOutput(output_file_path, f"{prefix}NamedEntities-{name}.txt",
+                                         fileSpansToOut, 'plain') # Já é uma lista de strings prontas para escrever
+
+    def __writeIdentifierOutput(self, output_dir: Path, name: str, sentences: list, outputFormat: str):
+        if self.outputArchive is not None:
+            with self._timed('outputIO'):
+                self.outputArchive.addFile(name, sentences, outputFormat)
+        else:
+            self.generateOutputFile(outputFileName=output_dir / name, sentences=sentences, outputFormat=outputFormat)
+
+    def __rebuildStatisticsInOrder(self, files: list[Path], storedStats: dict[str, EntityStatistics | None]):
+        """
+        Junta as estatísticas guardadas no manifesto (arquivos não rotulados de novo) às dos
+        arquivos rotulados nesta execução e refaz o agregado geral na ordem da listagem,
+        como em uma execução completa.
+        """
+        statsByFile = dict(self.entityStatisticsByFileDict)
+        self.entityStatisticsByFileDict.clear()
+        self.namedEntitiesByFileDict.clear()
+        self.generalEntityStatistics = EntityStatistics()
+        for file_path in files:
+            stats = statsByFile.get(file_path.name, storedStats.get(file_path.name))
+            if stats is not None:
+                self._store_identifier_statistics(file_path.name, stats)
+
+    def _store_identifier_statistics(self, identifier: str, stats: EntityStatistics):
+        """
+        Registra as estatísticas de entidades de um arquivo/texto e atualiza o agregado geral
+        de forma incremental. Se o identificador já tinha sido processado, o agregado geral é
+        refeito na ordem dos identificadores, para que as entidades mantenham a posição da
+        primeira ocorrência (como se todos os textos fossem processados de novo).
+        """
+        replaced = identifier in self.entityStatisticsByFileDict
+        self.entityStatisticsByFileDict[identifier] = stats
+        self.namedEntitiesByFileDict[identifier] = stats.entitiesAndAmount()
+        if replaced:
+            self.generalEntityStatistics = EntityStatistics.combineDistinct(self.entityStatisticsByFileDict.values())
+        else:
+            self.generalEntityStatistics.merge(stats.distinct())
+
+    def _tag_single_file(self,
+                         file_path: Path,
+                         tagging_kwargs: dict,
+                         cacheSettings: dict | None = None,
+                         identifier: str | None = None) -> TaggedDocument:
+        """
+        Carrega um arquivo de texto plano, rotula suas sentenças (`_tag_document`) e armazena
+        o resultado (`_store_tagged_document`), usando `identifier` (por padrão, o nome do
+        arquivo) como identificador.
+        Ao final, imprime um resumo de vazão do arquivo (sentenças, tokens, tokens/s).
+
+        Com `cacheSettings` ({'cacheDir', 'optionsKey', 'compress'}, ver sequenceTaggingOnText),
+        o resultado do tagging é lido do cache binário se o arquivo e as opções não mudaram,
+        ou gravado nele após o tagging.
+        """
+        start = time.perf_counter()
+        identifier = identifier or file_path.name
+        document, cacheFile = None, None
+        if cacheSettings is not None:
+            cacheFile = Path(cacheSettings['cacheDir']) / \
+                f"tagged-{_cacheKey(_fileContentHash(file_path), cacheSettings['optionsKey'])}.npz"
+            if cacheFile.is_file():
+                try:
+                    document = TaggedDocument.load(cacheFile)
+                except (ValueError, KeyError) as e:
+                    print(f"Aviso: cache {cacheFile} inválido, o arquivo será rotulado novamente: {e}")
+        fromCache = document is not None
+
+        if document is None:
+            # Carrega o conteúdo do arquivo como uma lista de sentenças
+            # Assume que loadCorpusInPlainFormat retorna uma lista de strings (sentenças)
+            # e não lida com withNamedEntities=True aqui, pois o tagging é feito pelo Flair.
+            sentencesToPredict = self.loadCorpusInPlainFormat(file_path, withNamedEntities=False)
+            if not isinstance(sentencesToPredict, list): # Garante que é uma lista de strings
+                 print(f"Aviso: loadCorpusInPlainFormat não retornou uma lista para {file_path.name}")
+                 sentencesToPredict = []
+
+            outputOptions = ('createOutputFile', 'outputFilePath', 'outFormat')
+            document = self._tag_document(sentencesToPredict,
+                                          **{k: v for k, v in tagging_kwargs.items() if k not in outputOptions})
+            if cacheFile is not None:
+                try:
+                    document.save(cacheFile, compress=cacheSettings['compress'])
+                except OSError as e:
+                    print(f"Aviso: não foi possível salvar o cache {cacheFile}: {e}")
+
+        self._store_tagged_document(identifier, document, tagging_kwargs['createOutputListSpans'],
+                                    tagging_kwargs['createOutputFile'], tagging_kwargs['outputFilePath'],
+                                    tagging_kwargs['outFormat'])
+
+        # Resumo de vazão por arquivo (tempo total: leitura, tagging e escrita das saídas)
+        elapsed = time.perf_counter() - start
+        if self.metrics is not None:
+            self.metrics.count('files')
+        rate = document.numTokens / elapsed if elapsed > 0 else 0.0
+        print(f" :: Tagging Text: {identifier} | {len(document.tokens)} sentenças | "
+              f"{document.numTokens} tokens | {elapsed:.2f}s | {rate:,.0f} tokens/s"
+              f"{' | cache' if fromCache else ''}")
+        return document
+
+    def __taggingCacheKey(self, tagging_kwargs: dict) -> str:
+        """
+        Chave das opções que alteram o resultado do tagging: modelo, tokenização, mascaramento
+        e conteúdo da lista auxiliar de nomes.
+        """
+        auxFingerprint = ''
+        auxIndex = tagging_kwargs['auxListNE']
+        if tagging_kwargs['useAuxListNE'] and auxIndex:
+            if isinstance(auxIndex, GazetteerMatcher):
+                auxFingerprint = _cacheKey('gazetteer', *sorted(auxIndex.names), '', *sorted(auxIndex.stopNames))
+            else:
+                auxFingerprint = _cacheKey('names', *sorted(auxIndex))
+        return _cacheKey(_CACHE_FORMAT_VERSION, self.getModelFingerprint(), auxFingerprint,
+                         *(repr(tagging_kwargs[k]) for k in ('useTokenizer_flair', 'maskNamedEntity',
+                                                             'createOutputListSpans', 'sepTokenTag',
+                                                             'entitiesToMask', 'specialTokenToMaskNE',
+                                                             'useAuxListNE')))
+
     def sequenceTaggingOnText(self,
                               rootFolderPath: str | Path,
                               fileExtension: str = '.txt',
@@ -700,7 +4188,14 @@ class PortugueseToolNER:
                               entitiesToMask: list[str] | None = None,
                               specialTokenToMaskNE: str | None = None,
                               useAuxListNE: bool = False,
-                              auxListNE: list[str] | None = None
+                              auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None = None,
+                              miniBatchSize: int = 32,
+                              workers: int = 1,
+                              chunkSize: int = 16,
+                              cacheDir: str | Path | None = None,
+                              compressCache: bool = False,
+                              incremental: bool = False,
+                              changeDetection: str = 'mtime'
                              ) -> tuple[dict[str, list[str]], dict[str, list], dict[str, list]]:
         """
         Aplica NER a todos os arquivos de texto em um diretório.
@@ -716,12 +4211,38 @@ class PortugueseToolNER:
             outFormat: Formato do arquivo de saída ('plain' ou 'CoNLL').
             sepTokenTag: Separador entre token e tag.
             entitiesToMask: Lista de tipos de entidade a serem mascarados.
-            specialTokenToMaskNE: Token especial para substituir entidades mascaradas.
+            specialTokenToMaskNE: Token especial para substituir entidades mascaradas. Com '{type}'
+                                  (ex: '[{type}]'), a máscara traz o tipo da entidade ('[PER]', '[LOC]').
             useAuxListNE: Se True, usa uma lista auxiliar de NEs para mascaramento adicional.
-            auxListNE: Lista auxiliar de NEs.
+            auxListNE: Lista auxiliar de NEs, índice já construído por buildAuxNamesIndex()
+                       ou um GazetteerMatcher (nomes com vários tokens).
+            miniBatchSize: Quantidade de sentenças enviadas ao modelo por mini-batch.
+            workers: Número de processos usados para rotular os arquivos. Com workers > 1,
+                     cada processo carrega o modelo uma vez (a partir do caminho usado em
+                     loadNamedEntityModel) e os resultados são combinados na ordem serial,
+                     gerando arquivos de saída idênticos aos da execução com um processo.
+                     Com enableSharedModel, os workers usam o modelo já carregado neste processo.
+                     Ao final, a memória de cada worker é impressa (ver workerMemoryUsage).
+            chunkSize: Quantidade de arquivos entregues a um worker por vez (usado se workers > 1).
+            cacheDir: Pasta do cache binário. Se informada, o resultado de cada arquivo é guardado
+                      em `<cacheDir>/tagged-<chave>.npz` (ver TaggedDocument.save), com chave
+                      derivada do hash do conteúdo do arquivo, da impressão digital do modelo
+                      (getModelFingerprint) e das opções de tagging. Arquivos que não mudaram
+                      não são rotulados de novo; as saídas são geradas a partir do cache.
+            compressCache: Se True, o cache binário é gravado comprimido.
+            incremental: Se True, mantém um manifesto (TaggingManifest) em
+                         `<outputFilePath>/ptToolNER-manifest.sqlite` e rotula apenas os arquivos
+                         novos ou alterados desde a última execução (ou com outro modelo/opções);
+                         as saídas dos demais são mantidas. Uma execução interrompida é retomada
+                         de onde parou. O relatório geral é refeito a partir das estatísticas
+                         guardadas de cada arquivo. Requer createOutputFile e outputFilePath, e
+                         não pode ser usado com enableOutputArchive.
+            changeDetection: Com incremental=True, como detectar arquivos alterados: 'mtime'
+                             (tamanho e data de modificação) ou 'hash' (confirma pelo conteúdo).
 
         Returns:
             Tupla (taggedFilesDict, namedEntitiesByFileDict, namedEntitiesDict (geral)).
+            Com incremental=True, taggedFilesDict traz apenas os arquivos rotulados nesta execução.
         """
         if self.tagger is None:
             raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
@@ -732,88 +4253,353 @@ class PortugueseToolNER:
         # Limpa/reseta dicionários de estado que são preenchidos por esta função
         self.taggedFilesDict.clear()
         self.namedEntitiesByFileDict.clear()
+        self.entityStatisticsByFileDict.clear()
+        self.generalEntityStatistics = EntityStatistics()
         self.namedEntitiesDict.clear() # Para as entidades gerais de todos os arquivos
 
-        generalNamedEntities_all_files: list[tuple[str,str]] = []
+        if useAuxListNE and auxListNE:
+            auxListNE = self.__asAuxNamesIndex(auxListNE) # Constrói o índice uma vez para todos os arquivos
 
-        for file_path in files:
-            print(f" :: Tagging Text: {file_path.name}")
-            # Carrega o conteúdo do arquivo como uma lista de sentenças
-            # Assume que loadCorpusInPlainFormat retorna uma lista de strings (sentenças)
-            # e não lida com withNamedEntities=True aqui, pois o tagging é feito pelo Flair.
-            sentencesToPredict = self.loadCorpusInPlainFormat(file_path, withNamedEntities=False)
-            if not isinstance(sentencesToPredict, list): # Garante que é uma lista de strings
-                 print(f"Aviso: loadCorpusInPlainFormat não retornou uma lista para {file_path.name}")
-                 sentencesToPredict = []
+        tagging_kwargs = dict(
+            useTokenizer_flair=useTokenizer_flair,
+            maskNamedEntity=maskNamedEntity,
+            createOutputListSpans=createOutputListSpans,
+            createOutputFile=createOutputFile,
+            outputFilePath=outputFilePath,
+            outFormat=outFormat,
+            sepTokenTag=sepTokenTag,
+            entitiesToMask=entitiesToMask,
+            specialTokenToMaskNE=specialTokenToMaskNE,
+            useAuxListNE=useAuxListNE,
+            auxListNE=auxListNE,
+            miniBatchSize=miniBatchSize
+        )
 
+        cacheSettings = None
+        if cacheDir is not None:
+            cacheSettings = dict(cacheDir=str(cacheDir),
+                                 optionsKey=self.__taggingCacheKey(tagging_kwargs),
+                                 compress=compressCache)
 
-            _, _, _, current_file_nes_dict = self._sequence_tagging_logic(
-                sentences_to_predict=sentencesToPredict,
-                identifier=file_path.name,
-                useTokenizer_flair=useTokenizer_flair,
-                maskNamedEntity=maskNamedEntity,
-                createOutputListSpans=createOutputListSpans,
-                createOutputFile=createOutputFile,
-                outputFilePath=outputFilePath,
-                outFormat=outFormat,
-                sepTokenTag=sepTokenTag,
-                entitiesToMask=entitiesToMask,
-                specialTokenToMaskNE=specialTokenToMaskNE,
-                useAuxListNE=useAuxListNE,
-                auxListNE=auxListNE
-            )
-            
-            # Acumula entidades para o relatório geral, se createOutputListSpans for True
-            if createOutputListSpans:
-                 # self.namedEntitiesByFileDict já foi preenchido por _sequence_tagging_logic
-                 # Agora precisamos obter os spans brutos para acumular em generalNamedEntities
-                 # Isso requer que _sequence_tagging_logic retorne os spans brutos do arquivo atual,
-                 # o que não está fazendo. Precisamos refatorar para obter isso.
-                 # Por agora, vamos assumir que podemos acessar os spans brutos de alguma forma.
-                 # Temporariamente, vamos reconstruir a partir do dicionário (não ideal)
-                 # Ou melhor, _sequence_tagging_logic deveria retornar os spans do identifier atual.
-                 # Para este exemplo, vou simular pegando do dicionário.
-                 # O ideal seria: all_nes_current_file = retornado_por_logic
-                 # generalNamedEntities_all_files.extend(all_nes_current_file)
-                 
-                 # Assumindo que _getSpans foi chamado dentro de _sequence_tagging_logic
-                 # e namedEntitiesByFileDict[file_path.name] contém [(text, count, tag), ...]
-                 # Precisamos de [(text, tag), ...]
-                 # Esta parte precisa de um retorno mais explícito de _sequence_tagging_logic
-                 # ou que ele popule uma lista de spans brutos passada como argumento.
-                 # Para uma solução rápida, mas não ideal:
-                if file_path.name in self.namedEntitiesByFileDict:
-                    spans_with_counts = self.namedEntitiesByFileDict[file_path.name]
-                    for text, _, tag_val in spans_with_counts: # Ignora a contagem para a lista geral
-                        generalNamedEntities_all_files.append((text, tag_val))
-
-
-        if createOutputListSpans and generalNamedEntities_all_files:
-            generalSpansToOut: list[str] = []
-            generalNEsAndAmount, nGramsCountGeneral, uniqueLabels = self.__getSpans(generalNamedEntities_all_files)
-            self.namedEntitiesDict['allFiles'] = generalNEsAndAmount # Armazena no atributo da classe
+        manifest = None
+        all_files = files
+        try:
+            if incremental:
+                if not (createOutputFile and outputFilePath and outFormat):
+                    raise ValueError('"incremental" requer createOutputFile, outputFilePath e outFormat '
+                                     '(o manifesto fica na pasta de saída).')
+                if self.outputArchive is not None:
+                    raise ValueError('"incremental" não pode ser usado com enableOutputArchive().')
+                manifest = TaggingManifest(Path(outputFilePath) / _MANIFEST_FILE_NAME)
+                modelFingerprint = self.getModelFingerprint()
+                manifestOptionsKey = _cacheKey(self.__taggingCacheKey(tagging_kwargs), repr(outFormat.lower()))
+                files, unchanged_stats, file_states, removed = manifest.plan(files, modelFingerprint, manifestOptionsKey,
+                                                                             changeDetection)
+                print(f" :: Manifesto: {len(unchanged_stats)} arquivo(s) inalterado(s), {len(files)} a rotular, "
+                      f"{len(removed)} removido(s)")
+                for file_name in removed: # Saídas de arquivos que não existem mais na pasta de entrada
+                    for output_name in (f"ptTagged-{file_name}.txt", f"ptTagged-{file_name}.conll",
+                                        f"NamedEntities-{file_name}.txt"):
+                        (Path(outputFilePath) / output_name).unlink(missing_ok=True)
+
+                def recordFile(file_name: str):
+                    manifest.record(file_name, file_states[file_name], modelFingerprint, manifestOptionsKey,
+                                    self.entityStatisticsByFileDict.get(file_name))
+
+            if workers > 1 and len(files) > 1:
+                if self.nerTrainedModelPath is None and self.sharedModelStartMethod is None:
+                    raise ValueError('"workers" > 1 requer que o modelo tenha sido carregado por loadNamedEntityModel().')
+                if chunkSize < 1:
+                    raise ValueError('"chunkSize" deve ser maior ou igual a 1.')
+
+                predictionCacheSettings = None
+                if self.predictionCache is not None:
+                    predictionCacheSettings = (self.predictionCache.maxSize, self.predictionCache.persistentPath)
+
+                # Com um TaggedOutputArchive, os workers não escrevem saídas: devolvem os documentos
+                # e o processo principal os grava no arquivo/shards, na ordem serial.
+                archiveOutputs = self.outputArchive is not None and createOutputFile
+                worker_kwargs = dict(tagging_kwargs, createOutputFile=False) if archiveOutputs else tagging_kwargs
+
+                # Cada worker carrega o modelo uma única vez (initializer) e recebe os arquivos em blocos.
+                # executor.map preserva a ordem dos blocos, então o merge segue a mesma ordem da execução serial.
+                file_chunks = [files[i:i + chunkSize] for i in range(0, len(files), chunkSize)]
+                initargs = (self.nerTrainedModelPath, predictionCacheSettings, self.metrics is not None,
+                            self.inferenceSettings)
+                mp_context = None
+                if self.sharedModelStartMethod is not None:
+                    # Os workers recebem o tagger deste processo (herdado no fork ou por memória compartilhada)
+                    self.__shareTagger()
+                    initargs += (self.tagger, self.getModelFingerprint())
+                    mp_context = multiprocessing.get_context(self.sharedModelStartMethod)
+                    if self.sharedModelStartMethod == 'fork':
+                        gc.freeze() # Evita que a coleta de lixo escreva nos objetos herdados (cópia na escrita)
+                self.workerMemoryUsage.clear()
+                try:
+                    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                             initializer=_initTaggingWorker, initargs=initargs) as executor:
+                        for chunk_results, metrics_snapshot, (pid, memory) in executor.map(
+                                _tagFilesChunk, file_chunks, [worker_kwargs] * len(file_chunks),
+                                [cacheSettings] * len(file_chunks), [archiveOutputs] * len(file_chunks)):
+                            if metrics_snapshot is not None:
+                                self.metrics.merge(metrics_snapshot)
+                            self.workerMemoryUsage[pid] = memory
+                            for file_name, tagged_sentences, file_stats, document in chunk_results:
+                                self.taggedFilesDict[file_name] = tagged_sentences
+                                if file_stats is not None:
+                                    self._store_identifier_statistics(file_name, file_stats)
+                                if document is not None:
+                                    self._write_tagged_outputs(file_name, document, file_stats, outputFilePath, outFormat)
+                                if manifest is not None:
+                                    recordFile(file_name)
+                finally:
+                    if self.sharedModelStartMethod == 'fork':
+                        gc.unfreeze()
+
+                # Memória por worker (ao final do último bloco de cada um), para comparar com/sem enableSharedModel
+                if self.workerMemoryUsage:
+                    print(f" :: Memória do processo principal: {_formatMemoryUsage(_processMemoryUsage())}")
+                    for pid, memory in self.workerMemoryUsage.items():
+                        print(f" :: Memória do worker {pid}: {_formatMemoryUsage(memory)}")
+            else:
+                for file_path in files:
+                    self._tag_single_file(file_path, tagging_kwargs, cacheSettings)
+                    if manifest is not None:
+                        recordFile(file_path.name)
+        finally:
+            if manifest is not None:
+                manifest.close() # Fecha a conexão SQLite mesmo se o tagging falhar
+
+        if manifest is not None and createOutputListSpans:
+            self.__rebuildStatisticsInOrder(all_files, unchanged_stats)
+
+        # O agregado geral foi atualizado arquivo a arquivo, na ordem em que os arquivos foram listados.
+        # Cada par (texto, tag) conta uma vez por arquivo.
+        generalStats = self.generalEntityStatistics
+
+        if createOutputListSpans and len(generalStats):
+            self.namedEntitiesDict['allFiles'] = generalStats.entitiesAndAmount() # Armazena no atributo da classe
 
             if createOutputFile and outputFilePath:
                 output_file_path = Path(outputFilePath)
-                for uL in uniqueLabels:
-                    generalSpansToOut.append(f'CATEGORY:{uL}\n')
-                    for text, count, tag_val in generalNEsAndAmount:
-                        if tag_val == uL:
-                            generalSpansToOut.append(f'{text}: {count}\n')
-                    generalSpansToOut.append('\n')
-
-                generalSpansToOut.append('\n-------\n')
-                for nGCG in nGramsCountGeneral:
-                    generalSpansToOut.append(f'{nGCG}\n')
+                with self._timed('spanAggregation'):
+                    generalSpansToOut = generalStats.reportLines()
 
                 self.generateOutputFile(
                     outputFileName=output_file_path / "GeneralNamedEntities.txt",
                     sentences=generalSpansToOut,
                     outputFormat='plain'
                 )
+        elif manifest is not None and createOutputListSpans:
+            # Execução incremental sem entidades (ex: os arquivos com entidades foram removidos):
+            # o relatório geral de uma execução anterior não vale mais.
+            self.namedEntitiesDict.pop('allFiles', None)
+            (Path(outputFilePath) / "GeneralNamedEntities.txt").unlink(missing_ok=True)
+
+        if self.metrics is not None:
+            self.metrics.flush()
         
         return self.taggedFilesDict, self.namedEntitiesByFileDict, self.namedEntitiesDict
 
+    def sequenceTaggingDistributed(self,
+                                   rootFolderPath: str | Path,
+                                   queuePath: str | Path,
+                                   outputFilePath: str | Path,
+                                   outFormat: str = 'plain', # 'plain' ou 'CoNLL'
+                                   fileExtension: str = '.txt',
+                                   recursive: bool = True,
+                                   nodeId: str | None = None,
+                                   batchSize: int = 64,
+                                   leaseSeconds: float = 600.0,
+                                   useTokenizer_flair: bool = False,
+                                   maskNamedEntity: bool = False,
+                                   createOutputListSpans: bool = True,
+                                   sepTokenTag: str = ' ',
+                                   entitiesToMask: list[str] | None = None,
+                                   specialTokenToMaskNE: str | None = None,
+                                   useAuxListNE: bool = False,
+                                   auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None = None,
+                                   miniBatchSize: int = 32,
+                                   cacheDir: str | Path | None = None,
+                                   compressCache: bool = False
+                                  ) -> dict:
+        """
+        Rotula uma árvore de pastas em vários nós (máquinas com o mesmo disco compartilhado,
+        ou vários processos), coordenados por uma DistributedTaggingQueue em `queuePath`.
+        Basta executar este método, com os mesmos argumentos, em cada nó.
+
+        O primeiro nó enumera os arquivos (os.scandir, sem montar a árvore em memória) e cria
+        os lotes; cada nó reserva um lote por vez, rotula seus arquivos e grava as saídas em
+        `outputFilePath`, mantendo as subpastas da entrada ('sub/ptTagged-arquivo.txt.txt').
+        Se um nó cair, seus lotes voltam à fila quando a reserva vence (`leaseSeconds`), e
+        podem ser retomados por qualquer nó (inclusive pelo mesmo, ao ser reiniciado).
+        O nó que encontrar todos os lotes concluídos gera o GeneralNamedEntities.txt
+        (mergeDistributedReport), igual ao de uma execução em um único processo na ordem da
+        enumeração; com a árvore sem arquivos, a fila é dada como concluída logo após a criação.
+
+        Args:
+            rootFolderPath: Pasta de entrada (igual em todos os nós).
+            queuePath: Arquivo SQLite da fila, no disco compartilhado.
+            outputFilePath: Pasta de saída, no disco compartilhado.
+            outFormat: Formato dos arquivos ptTagged ('plain' ou 'CoNLL').
+            fileExtension: Extensão dos arquivos a serem processados.
+            recursive: Se True, inclui os arquivos das subpastas.
+            nodeId: Identificador do nó na fila (padrão: '<hostname>-<pid>').
+            batchSize: Arquivos por lote da fila.
+            leaseSeconds: Duração da reserva de um lote; renovada por uma thread a cada
+                          leaseSeconds / 3, inclusive durante um arquivo demorado.
+            cacheDir: Pasta do cache binário (ver sequenceTaggingOnText).
+            compressCache: Se True, o cache binário é gravado comprimido.
+            ... (demais argumentos similares a sequenceTaggingOnText)
+
+        Returns:
+            Resumo do nó: {'nodeId', 'batches', 'files', 'merged'}.
+        """
+        if self.tagger is None:
+            raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
+        if self.outputArchive is not None:
+            raise ValueError('sequenceTaggingDistributed não pode ser usado com enableOutputArchive().')
+
+        root_path = Path(rootFolderPath)
+        nodeId = nodeId or f"{socket.gethostname()}-{os.getpid()}"
+
+        self.taggedFilesDict.clear()
+        self.namedEntitiesByFileDict.clear()
+        self.entityStatisticsByFileDict.clear()
+        self.generalEntityStatistics = EntityStatistics()
+        self.namedEntitiesDict.clear()
+
+        if useAuxListNE and auxListNE:
+            auxListNE = self.__asAuxNamesIndex(auxListNE)
+
+        tagging_kwargs = dict(
+            useTokenizer_flair=useTokenizer_flair,
+            maskNamedEntity=maskNamedEntity,
+            createOutputListSpans=createOutputListSpans,
+            createOutputFile=True,
+            outputFilePath=outputFilePath,
+            outFormat=outFormat,
+            sepTokenTag=sepTokenTag,
+            entitiesToMask=entitiesToMask,
+            specialTokenToMaskNE=specialTokenToMaskNE,
+            useAuxListNE=useAuxListNE,
+            auxListNE=auxListNE,
+            miniBatchSize=miniBatchSize
+        )
+        optionsKey = self.__taggingCacheKey(tagging_kwargs)
+        cacheSettings = None
+        if cacheDir is not None:
+            cacheSettings = dict(cacheDir=str(cacheDir), optionsKey=optionsKey, compress=compressCache)
+
+        summary = {'nodeId': nodeId, 'batches': 0, 'files': 0, 'merged': False}
+        queue = DistributedTaggingQueue(queuePath)
+        queueOptionsKey = _cacheKey(optionsKey, repr(outFormat.lower()))
+
+        def seed() -> bool:
+            if not queue.seed(_iterInputFiles(root_path, fileExtension, recursive), batchSize,
+                              queueOptionsKey, nodeId, leaseSeconds):
+                return False
+            progress = queue.progress()
+            if progress['files'] == 0:
+                print(f" :: Fila {queuePath}: nenhum arquivo '{fileExtension}' em {root_path}")
+            else:
+                print(f" :: Fila {queuePath}: {progress['files']} arquivo(s) em "
+                      f"{progress['pending'] + progress['leased'] + progress['done']} lote(s)")
+            return True
+
+        try:
+            seed()
+            while True:
+                claimed = queue.claim(nodeId, leaseSeconds)
+                if claimed is None:
+                    if not queue.isSeeding():
+                        break
+                    # Outro nó ainda está criando os lotes: aguarda (ou assume, se ele parou)
+                    if not seed():
+                        time.sleep(min(1.0, leaseSeconds / 10))
+                    continue
+                batchId, batchFiles = claimed
+                batchStatistics = {}
+                try:
+                    with queue.keepLeased(batchId, nodeId, leaseSeconds) as leaseLost:
+                        for position, relativePath in batchFiles:
+                            if leaseLost.is_set():
+                                break
+                            self._tag_single_file(root_path / relativePath, tagging_kwargs, cacheSettings,
+                                                  identifier=relativePath)
+                            # Os resultados já estão nas saídas e vão para a fila: o estado do arquivo
+                            # é descartado, para a memória do nó não crescer com o tamanho da árvore.
+                            self.taggedFilesDict.pop(relativePath, None)
+                            self.namedEntitiesByFileDict.pop(relativePath, None)
+                            batchStatistics[position] = (relativePath,
+                                                         self.entityStatisticsByFileDict.pop(relativePath, None))
+                except BaseException:
+                    queue.release(batchId, nodeId)
+                    raise
+                self.generalEntityStatistics = EntityStatistics()
+
+                if leaseLost.is_set():
+                    print(f"Aviso: a reserva do lote {batchId} foi perdida; ele fica com o nó que o reservou.")
+                    continue
+                if queue.complete(batchId, nodeId, batchStatistics): # False: já concluído por outro nó
+                    summary['batches'] += 1
+                    summary['files'] += len(batchFiles)
+
+            # O nó que encontra a fila concluída (inclusive vazia) gera o relatório geral
+            if queue.finish(nodeId) and createOutputListSpans:
+                self.mergeDistributedReport(queuePath, outputFilePath)
+                summary['merged'] = True
+        finally:
+            queue.close()
+
+        if self.metrics is not None:
+            self.metrics.flush()
+
+        return summary
+
+    def mergeDistributedReport(self,
+                               queuePath: str | Path,
+                               outputFilePath: str | Path | None = None) -> dict[str, list]:
+        """
+        Monta o relatório geral de uma execução de sequenceTaggingDistributed a partir das
+        estatísticas guardadas na fila, na ordem da enumeração dos arquivos, e o grava em
+        `<outputFilePath>/GeneralNamedEntities.txt`. Chamado automaticamente pelo nó que
+        encontra a fila concluída; pode ser chamado de novo a qualquer momento (com lotes ainda
+        pendentes, o relatório é parcial). Sem nenhuma entidade, o relatório não é gerado
+        (e um relatório anterior na pasta é removido).
+
+        Returns:
+            namedEntitiesDict, com o relatório geral em 'allFiles'.
+        """
+        queue = DistributedTaggingQueue(queuePath)
+        try:
+            progress = queue.progress()
+            generalStats = EntityStatistics()
+            for _, stats in queue.iterStatistics():
+                if stats is not None:
+                    generalStats.merge(stats.distinct())
+        finally:
+            queue.close()
+
+        if progress['seeding']:
+            print("Aviso: os lotes ainda estão sendo criados; o relatório geral é parcial.")
+        elif progress['pending'] or progress['leased']:
+            print(f"Aviso: {progress['pending'] + progress['leased']} lote(s) ainda não concluído(s); "
+                  f"o relatório geral é parcial.")
+
+        self.generalEntityStatistics = generalStats
+        self.namedEntitiesDict.clear()
+        if len(generalStats):
+            self.namedEntitiesDict['allFiles'] = generalStats.entitiesAndAmount()
+            if outputFilePath:
+                with self._timed('spanAggregation'):
+                    generalSpansToOut = generalStats.reportLines()
+                self.generateOutputFile(outputFileName=Path(outputFilePath) / "GeneralNamedEntities.txt",
+                                        sentences=generalSpansToOut, outputFormat='plain')
+        elif outputFilePath:
+            (Path(outputFilePath) / "GeneralNamedEntities.txt").unlink(missing_ok=True)
+        return self.namedEntitiesDict
+
 
     def sequenceTaggingOnTheFly(self,
                                 textToPredict: str,
@@ -829,7 +4615,9 @@ class PortugueseToolNER:
                                 entitiesToMask: list[str] | None = None,
                                 specialTokenToMaskNE: str | None = None,
                                 useAuxListNE: bool = False,
-                                auxListNE: list[str] | None = None
+                                auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None = None,
+                                miniBatchSize: int = 32,
+                                sentenceSplitter: str | Callable[[str], list[str]] = 'punkt'
                                ) -> tuple[str | int, list[list[str]], dict[str, list[str]], dict[str, list], dict[str, list]]:
         """
         Aplica NER a um texto fornecido dinamicamente.
@@ -837,9 +4625,12 @@ class PortugueseToolNER:
         Args:
             textToPredict: O texto a ser processado.
             textId: Um identificador para este texto.
-            useSentenceTokenize_nltk: Se True, usa NLTK para dividir o texto em sentenças.
+            useSentenceTokenize_nltk: Se True, divide o texto em sentenças com `sentenceSplitter`.
             useTokenizer_flair: Se o tokenizador interno do Flair deve ser usado para a sentença.
             maskNamedEntity: Se True, mascara as entidades nomeadas.
+            miniBatchSize: Quantidade de sentenças enviadas ao modelo por mini-batch.
+            sentenceSplitter: Divisor de sentenças: 'punkt' (NLTK, padrão), 'regex' (mais rápido)
+                              ou uma função str -> list[str].
             ... (demais argumentos similares a sequenceTaggingOnText)
 
         Returns:
@@ -850,7 +4641,7 @@ class PortugueseToolNER:
             raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
 
         if useSentenceTokenize_nltk:
-            sentencesToPredict = self.__sentenceTokenizer(textToPredict)
+            sentencesToPredict = self.__sentenceTokenizer(textToPredict, sentenceSplitter)
         else:
             sentencesToPredict = [textToPredict]
         
@@ -878,99 +4669,489 @@ class PortugueseToolNER:
                 entitiesToMask=entitiesToMask,
                 specialTokenToMaskNE=specialTokenToMaskNE,
                 useAuxListNE=useAuxListNE,
-                auxListNE=auxListNE
+                auxListNE=auxListNE,
+                miniBatchSize=miniBatchSize
             )
         
-        # Lógica para "GeneralNamedEntities" (acumulando de múltiplas chamadas OnTheFly)
-        # Se createOutputListSpans for True, as entidades deste textId foram adicionadas
-        # ao self.namedEntitiesByFileDict[str(textId)].
-        # Se a intenção é ter um "GeneralNamedEntities.txt" que acumule de todas as chamadas
-        # OnTheFly (ou uma combinação com OnText), a lógica de acumulação
-        # para 'generalNamedEntities' e a sua escrita precisam ser cuidadosamente gerenciadas.
-        # O código original parecia recriar/sobrescrever GeneralNamedEntities.txt a cada chamada.
-
-        # Para este exemplo, vamos assumir que se createOutputListSpans e createOutputFile
-        # forem verdadeiros, ele gera o NamedEntities-<textId>.txt e também tenta
-        # atualizar/recriar o GeneralNamedEntities.txt com base no estado ATUAL de self.namedEntitiesByFileDict.
-        # Esta parte pode precisar de um design mais robusto se o acúmulo for complexo.
-        
+        # "GeneralNamedEntities" acumula as entidades de todas as chamadas OnTheFly.
+        # O agregado geral já foi atualizado de forma incremental por _sequence_tagging_logic;
+        # aqui apenas decidimos, conforme a política de escrita, se o arquivo deve ser reescrito.
         if createOutputListSpans and createOutputFile and outputFilePath:
-            all_accumulated_nes: list[tuple[str,str]] = []
-            for id_key in self.namedEntitiesByFileDict: # Acumula de todos os IDs processados até agora
-                 spans_with_counts = self.namedEntitiesByFileDict[id_key]
-                 for text, _, tag_val in spans_with_counts:
-                     all_accumulated_nes.append((text, tag_val))
-            
-            if all_accumulated_nes: # Só gera se houver entidades
-                generalSpansToOut: list[str] = []
-                generalNEsAndAmount, nGramsCountGeneral, uniqueLabels = self.__getSpans(all_accumulated_nes)
-                self.namedEntitiesDict['allFiles'] = generalNEsAndAmount # Atualiza o geral
+            self._generalReportOutputPath = outputFilePath
+            self._generalReportPendingCalls += 1
+            if self.__shouldFlushGeneralReport():
+                self.flushGeneralReport()
+        
+        return textId, current_call_masked_tokens, tagged_files_dict, id_specific_nes_dict, self.namedEntitiesDict
 
-                output_file_path = Path(outputFilePath)
-                for uL in uniqueLabels:
-                    generalSpansToOut.append(f'CATEGORY:{uL}\n')
-                    for text, count, tag_val in generalNEsAndAmount:
-                        if tag_val == uL:
-                            generalSpansToOut.append(f'{text}: {count}\n')
-                    generalSpansToOut.append('\n')
 
-                generalSpansToOut.append('\n-------\n')
-                for nGCG in nGramsCountGeneral:
-                    generalSpansToOut.append(f'{nGCG}\n')
+    def setGeneralReportFlushPolicy(self,
+                                    everyNCalls: int | None = 1,
+                                    everySeconds: float | None = None):
+        """
+        Define quando sequenceTaggingOnTheFly reescreve o GeneralNamedEntities.txt
+        (e atualiza namedEntitiesDict['allFiles']). O relatório é escrito quando
+        qualquer um dos critérios for atingido. Com ambos None, ele só é escrito
+        sob demanda, via flushGeneralReport().
+
+        Args:
+            everyNCalls: Escreve a cada N chamadas com createOutputListSpans e createOutputFile.
+            everySeconds: Escreve se tiverem passado pelo menos T segundos desde a última escrita.
+        """
+        if everyNCalls is not None and everyNCalls < 1:
+            raise ValueError('"everyNCalls" deve ser maior ou igual a 1 (ou None).')
+        if everySeconds is not None and everySeconds < 0:
+            raise ValueError('"everySeconds" deve ser maior ou igual a 0 (ou None).')
+        self.generalReportFlushEveryNCalls = everyNCalls
+        self.generalReportFlushEverySeconds = everySeconds
 
-                self.generateOutputFile(
-                    outputFileName= output_file_path / "GeneralNamedEntities.txt",
-                    sentences=generalSpansToOut,
-                    outputFormat='plain'
+    def __shouldFlushGeneralReport(self) -> bool:
+        """
+        Verifica se a política de escrita do relatório geral foi atingida.
+        """
+        if (self.generalReportFlushEveryNCalls is not None and
+                self._generalReportPendingCalls >= self.generalReportFlushEveryNCalls):
+            return True
+        if (self.generalReportFlushEverySeconds is not None and
+                time.monotonic() - self._generalReportLastFlush >= self.generalReportFlushEverySeconds):
+            return True
+        return False
+
+    def flushGeneralReport(self, outputFilePath: str | Path | None = None) -> dict[str, list]:
+        """
+        Escreve o GeneralNamedEntities.txt a partir do agregado geral mantido em memória,
+        sem reprocessar as entidades de cada texto.
+
+        Args:
+            outputFilePath: Pasta de saída. Se None, usa a última pasta informada em
+                            sequenceTaggingOnTheFly.
+
+        Returns:
+            namedEntitiesDict (geral), com 'allFiles' atualizado.
+        """
+        outputFilePath = outputFilePath or self._generalReportOutputPath
+        if outputFilePath is None:
+            raise ValueError('"outputFilePath" não informado e nenhuma chamada anterior definiu a pasta de saída.')
+
+        if len(self.generalEntityStatistics): # Só gera se houver entidades
+            self.namedEntitiesDict['allFiles'] = self.generalEntityStatistics.entitiesAndAmount() # Atualiza o geral
+            with self._timed('spanAggregation'):
+                generalSpansToOut = self.generalEntityStatistics.reportLines()
+            self.generateOutputFile(
+                outputFileName=Path(outputFilePath) / "GeneralNamedEntities.txt",
+                sentences=generalSpansToOut,
+                outputFormat='plain'
+            )
+
+        self._generalReportPendingCalls = 0
+        self._generalReportLastFlush = time.monotonic()
+        return self.namedEntitiesDict
+
+    def tagSentences(self,
+                     sentences: Iterable[str],
+                     identifier: int | str | None = None,
+                     useTokenizer_flair: bool = False,
+                     maskNamedEntity: bool = False,
+                     sepTokenTag: str = ' ',
+                     entitiesToMask: list[str] | None = None,
+                     specialTokenToMaskNE: str | None = None,
+                     useAuxListNE: bool = False,
+                     auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None = None,
+                     miniBatchSize: int = 32,
+                     collector: TaggingCollector | None = None
+                    ) -> TaggingResult:
+        """
+        Aplica NER a uma lista de sentenças sem alterar nenhum atributo da instância.
+
+        Diferente de sequenceTaggingOnText / sequenceTaggingOnTheFly, os resultados não são
+        acumulados em taggedFilesDict, namedEntitiesByFileDict ou namedEntitiesDict: tudo é
+        devolvido no TaggingResult, e o acúmulo fica a cargo de um `collector` opcional.
+        Assim, uma mesma instância (e um único SequenceTagger carregado) pode atender
+        várias threads ao mesmo tempo.
+
+        Args:
+            sentences: Sentenças a serem rotuladas. Sentenças vazias são ignoradas.
+            identifier: Identificador do texto (obrigatório se `collector` for informado).
+            collector: TaggingCollector que recebe o resultado (opcional).
+            ... (demais argumentos similares a sequenceTaggingOnText)
+
+        Returns:
+            TaggingResult com tokens, rótulos, texto mascarado, spans e estatísticas.
+        """
+        if self.tagger is None:
+            raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
+
+        if useAuxListNE and auxListNE:
+            auxListNE = self.__asAuxNamesIndex(auxListNE)
+
+        tagging_options = (useTokenizer_flair, maskNamedEntity, sepTokenTag, entitiesToMask,
+                           specialTokenToMaskNE, useAuxListNE, auxListNE)
+        sentences_text = [sentence_text for sentence_text in sentences if sentence_text.strip()]
+        tagged_sentence_objs = self._predict_sentences_in_batches(sentences_text, useTokenizer_flair, miniBatchSize)
+
+        result = self._build_tagging_result(identifier, sentences_text, tagged_sentence_objs, tagging_options)
+        if collector is not None:
+            collector.add(result)
+        return result
+
+    def tagText(self,
+                textToPredict: str,
+                identifier: int | str | None = None,
+                useSentenceTokenize_nltk: bool = True,
+                useTokenizer_flair: bool = False,
+                maskNamedEntity: bool = False,
+                sepTokenTag: str = ' ',
+                entitiesToMask: list[str] | None = None,
+                specialTokenToMaskNE: str | None = None,
+                useAuxListNE: bool = False,
+                auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None = None,
+                miniBatchSize: int = 32,
+                sentenceSplitter: str | Callable[[str], list[str]] = 'punkt',
+                collector: TaggingCollector | None = None
+               ) -> TaggingResult:
+        """
+        Versão sem estado de sequenceTaggingOnTheFly: divide o texto em sentenças e chama
+        tagSentences. Não altera nenhum atributo da instância.
+
+        Args:
+            textToPredict: O texto a ser processado.
+            useSentenceTokenize_nltk: Se True, divide o texto em sentenças com `sentenceSplitter`.
+            ... (demais argumentos como em tagSentences)
+
+        Returns:
+            TaggingResult com tokens, rótulos, texto mascarado, spans e estatísticas.
+        """
+        if useSentenceTokenize_nltk:
+            sentencesToPredict = self.__sentenceTokenizer(textToPredict, sentenceSplitter)
+        else:
+            sentencesToPredict = [textToPredict]
+        return self.tagSentences(sentencesToPredict, identifier, useTokenizer_flair, maskNamedEntity,
+                                 sepTokenTag, entitiesToMask, specialTokenToMaskNE, useAuxListNE,
+                                 auxListNE, miniBatchSize, collector)
+
+    def setAsyncBatchingPolicy(self, maxBatchSize: int = 64, maxWaitMs: float = 5.0):
+        """
+        Define como tagAsync agrupa as sentenças de chamadas concorrentes.
+
+        Args:
+            maxBatchSize: Quantidade máxima de sentenças por execução do modelo.
+            maxWaitMs: Tempo máximo (em milissegundos) que uma sentença espera por outras
+                       antes de o batch ser enviado ao modelo.
+        """
+        if maxBatchSize < 1:
+            raise ValueError('"maxBatchSize" deve ser maior ou igual a 1.')
+        if maxWaitMs < 0:
+            raise ValueError('"maxWaitMs" deve ser maior ou igual a 0.')
+        self.asyncMaxBatchSize = maxBatchSize
+        self.asyncMaxWaitMs = maxWaitMs
+        if self._asyncBatcher is not None:
+            self._asyncBatcher.maxBatchSize = maxBatchSize
+            self._asyncBatcher.maxWait = maxWaitMs / 1000
+
+    async def tagAsync(self,
+                       textToPredict: str,
+                       identifier: int | str | None = None,
+                       useSentenceTokenize_nltk: bool = True,
+                       useTokenizer_flair: bool = False,
+                       maskNamedEntity: bool = False,
+                       sepTokenTag: str = ' ',
+                       entitiesToMask: list[str] | None = None,
+                       specialTokenToMaskNE: str | None = None,
+                       useAuxListNE: bool = False,
+                       auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None = None,
+                       sentenceSplitter: str | Callable[[str], list[str]] = 'punkt',
+                       collector: TaggingCollector | None = None
+                      ) -> TaggingResult:
+        """
+        Versão assíncrona de tagText, para serviços asyncio (ex: um servidor web).
+
+        As sentenças de chamadas concorrentes são agrupadas em micro-batches (ver
+        setAsyncBatchingPolicy) e o modelo roda em uma thread dedicada, sem bloquear o
+        event loop; a divisão em sentenças, o mascaramento e a montagem do resultado
+        também rodam nessa thread. Cada chamada recebe apenas os seus resultados: nenhum atributo da
+        instância (taggedFilesDict, namedEntitiesByFileDict, ...) é alterado e nenhum
+        arquivo de saída é gerado.
+
+        Args:
+            textToPredict: O texto a ser processado.
+            identifier: Identificador do texto (obrigatório se `collector` for informado).
+            collector: TaggingCollector que recebe o resultado (opcional).
+            ... (demais argumentos como em tagText)
+
+        Returns:
+            TaggingResult com tokens, rótulos, texto mascarado, spans e estatísticas.
+        """
+        if self.tagger is None:
+            raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
+
+        loop = asyncio.get_running_loop()
+        batcher = self._asyncBatcher
+        if batcher is None or batcher.loop is not loop or batcher.task.done():
+            if batcher is not None:
+                batcher.discard() # Loop anterior (ou tarefa encerrada): libera a thread do modelo
+            batcher = self._asyncBatcher = _AsyncTaggingBatcher(self, self.asyncMaxBatchSize, self.asyncMaxWaitMs)
+
+        def prepare() -> tuple[list[str], tuple]:
+            if useSentenceTokenize_nltk:
+                sentencesToPredict = self.__sentenceTokenizer(textToPredict, sentenceSplitter)
+            else:
+                sentencesToPredict = [textToPredict]
+            auxNames = self.__asAuxNamesIndex(auxListNE) if useAuxListNE and auxListNE else auxListNE
+            return ([sentence_text for sentence_text in sentencesToPredict if sentence_text.strip()],
+                    (useTokenizer_flair, maskNamedEntity, sepTokenTag, entitiesToMask,
+                     specialTokenToMaskNE, useAuxListNE, auxNames))
+
+        sentences_text, tagging_options = await loop.run_in_executor(batcher.executor, prepare)
+        tagged_sentence_objs = await batcher.predict(sentences_text, useTokenizer_flair)
+        result = await loop.run_in_executor(batcher.executor, self._build_tagging_result,
+                                            identifier, sentences_text, tagged_sentence_objs, tagging_options)
+        if collector is not None:
+            collector.add(result)
+        return result
+
+    async def closeAsync(self):
+        """
+        Encerra a tarefa de micro-batching e a thread do modelo usadas por tagAsync.
+        """
+        if self._asyncBatcher is not None:
+            batcher, self._asyncBatcher = self._asyncBatcher, None
+            await batcher.close()
+
+    def iterTagSentences(self,
+                         sentences: Iterable[str],
+                         useTokenizer_flair: bool = False,
+                         maskNamedEntity: bool = False,
+                         sepTokenTag: str = ' ',
+                         entitiesToMask: list[str] | None = None,
+                         specialTokenToMaskNE: str | None = None,
+                         useAuxListNE: bool = False,
+                         auxListNE: list[str] | AuxNamesIndex | GazetteerMatcher | None = None,
+                         miniBatchSize: int = 32,
+                         lookAhead: int = 256
+                        ) -> Iterator[TaggedSentence]:
+        """
+        Aplica NER de forma preguiçosa (streaming) sobre um iterável de sentenças.
+
+        Apenas `lookAhead` sentenças são lidas antecipadamente para formar os mini-batches,
+        e nenhum resultado é guardado em atributos da classe, então o uso de memória
+        não cresce com o tamanho da entrada.
+
+        Args:
+            sentences: Iterável de sentenças (strings). Sentenças vazias são ignoradas.
+            lookAhead: Quantidade máxima de sentenças mantidas em memória antes da predição.
+            ... (demais argumentos similares a sequenceTaggingOnText)
+
+        Yields:
+            Um TaggedSentence por sentença, na ordem de entrada.
+        """
+        if self.tagger is None:
+            raise ValueError("Modelo NER (tagger) não carregado. Chame loadNamedEntityModel() primeiro.")
+        if lookAhead < 1:
+            raise ValueError('"lookAhead" deve ser maior ou igual a 1.')
+
+        if useAuxListNE and auxListNE:
+            auxListNE = self.__asAuxNamesIndex(auxListNE) # Constrói o índice uma vez para todo o stream
+
+        tagging_options = (useTokenizer_flair, maskNamedEntity, sepTokenTag, entitiesToMask,
+                           specialTokenToMaskNE, useAuxListNE, auxListNE)
+
+        buffer: list[str] = []
+        for sentence_text in sentences:
+            if not sentence_text.strip():
+                continue
+            buffer.append(sentence_text)
+            if len(buffer) >= lookAhead:
+                yield from self._tag_sentences_buffer(buffer, tagging_options, miniBatchSize)
+                buffer = []
+
+        if buffer:
+            yield from self._tag_sentences_buffer(buffer, tagging_options, miniBatchSize)
+
+    def _tag_sentences_buffer(self,
+                              buffer: list[str],
+                              tagging_options: tuple,
+                              miniBatchSize: int
+                             ) -> Iterator[TaggedSentence]:
+        """
+        Prediz um bloco de sentenças em mini-batches e gera um TaggedSentence para cada uma.
+        """
+        tagged_sentence_objs = self._predict_sentences_in_batches(buffer, tagging_options[0], miniBatchSize)
+        return self._build_tagged_sentences(buffer, tagged_sentence_objs, tagging_options)
+
+    def _build_tagging_result(self,
+                              identifier: int | str | None,
+                              sentences_text: list[str],
+                              tagged_sentence_objs: list,
+                              tagging_options: tuple
+                             ) -> TaggingResult:
+        """
+        Monta o TaggingResult a partir de sentenças já anotadas pelo modelo.
+        """
+        tagged_sentences = list(self._build_tagged_sentences(sentences_text, tagged_sentence_objs, tagging_options))
+        return TaggingResult(identifier=identifier,
+                             sentences=tagged_sentences,
+                             statistics=EntityStatistics(span for tagged in tagged_sentences for span in tagged.spans))
+
+    def _build_tagged_sentences(self,
+                                sentences_text: list[str],
+                                tagged_sentence_objs: list,
+                                tagging_options: tuple
+                               ) -> Iterator[TaggedSentence]:
+        """
+        Gera um TaggedSentence para cada sentença já anotada pelo modelo (máscaras, linha
+        "token<sep>label", sentença no formato plain e spans).
+        """
+        (useTokenizer_flair, maskNamedEntity, sepTokenTag, entitiesToMask,
+         specialTokenToMaskNE, useAuxListNE, auxListNE) = tagging_options
+
+        for sentence_text, sentence_obj in zip(sentences_text, tagged_sentence_objs):
+            processed_tokens, processed_token_labels, sentence_nes, tagged_string = \
+                self._process_single_sentence_for_tagging(
+                    sentence_text, useTokenizer_flair, maskNamedEntity,
+                    sepTokenTag, entitiesToMask, specialTokenToMaskNE,
+                    useAuxListNE, auxListNE, True,
+                    sentence_obj=sentence_obj
                 )
+            yield TaggedSentence(
+                text=sentence_text,
+                tokens=[token.text for token in sentence_obj.tokens],
+                labels=[_tokenLabel(token) for token in sentence_obj.tokens],
+                maskedTokens=processed_tokens,
+                maskedTokenAndLabels=processed_token_labels,
+                taggedString=tagged_string,
+                spans=sentence_nes
+            )
+
+    def iterTagFile(self,
+                    inputFilePath: str | Path,
+                    encoding: str = 'utf-8',
+                    outputFilePath: str | Path | None = None,
+                    outFormat: str | None = None,
+                    **taggingOptions
+                   ) -> Iterator[TaggedSentence]:
+        """
+        Aplica NER de forma preguiçosa (streaming) sobre um arquivo em texto plano,
+        uma sentença por linha, sem carregar o arquivo inteiro em memória.
+
+        Se `outputFilePath` for informado, cada sentença é escrita em
+        `<outputFilePath>/ptTagged-<nome_do_arquivo>.txt` (plain) ou `.conll` (CoNLL)
+        assim que é rotulada. O arquivo de saída só é fechado quando o gerador é
+        consumido por completo (ou fechado).
+
+        Args:
+            inputFilePath: Caminho para o arquivo de entrada.
+            encoding: Encoding dos arquivos de entrada e saída.
+            outputFilePath: Caminho da pasta para salvar o arquivo de saída (opcional).
+            outFormat: Formato do arquivo de saída ('plain' ou 'CoNLL').
+            **taggingOptions: Argumentos repassados para iterTagSentences.
+
+        Yields:
+            Um TaggedSentence por linha não vazia do arquivo.
         
-        return textId, current_call_masked_tokens, tagged_files_dict, id_specific_nes_dict, self.namedEntitiesDict
+        Raises:
+            FileNotFoundError: Se o arquivo não for encontrado.
+        """
+        input_path = Path(inputFilePath)
+        if not input_path.is_file():
+            raise FileNotFoundError(f"Arquivo não encontrado: {inputFilePath}")
 
+        outputFile = None
+        if outputFilePath is not None:
+            if not outFormat or outFormat.lower() not in ('plain', 'conll'):
+                raise ValueError('"outFormat" deve ser "plain" ou "CoNLL" para criar arquivo de saída.')
+            output_dir = Path(outputFilePath)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            suffix = '.txt' if outFormat.lower() == 'plain' else '.conll'
+            outputFile = _openTextOutput(output_dir / f"ptTagged-{input_path.name}{suffix}", encoding)
+
+        try:
+            with open(input_path, 'r', encoding=encoding) as inputFile:
+                lines = (line.strip() for line in inputFile)
+                for tagged in self.iterTagSentences(lines, **taggingOptions):
+                    if outputFile is not None:
+                        with self._timed('outputIO'):
+                            if outFormat.lower() == 'plain':
+                                outputFile.write(tagged.taggedString + '\n')
+                            else:
+                                outputFile.write(''.join(tokenTag + '\n' for tokenTag in tagged.maskedTokenAndLabels) + '\n')
+                    yield tagged
+        finally:
+            if outputFile is not None:
+                outputFile.close()
 
     def generateOutputFile(self,
                            outputFileName: str | Path,
-                           sentences: list[str] | list[list[str]], # Pode ser lista de sentenças (strings) ou lista de listas de "token-tag"
+                           sentences: list[str] | list[list[str]] | CoNLLCorpus, # Pode ser lista de sentenças (strings) ou lista de listas de "token-tag"
                            outputFormat: str,
                            shuffleSentences: bool = False,
-                           encoding: str = 'utf-8'):
+                           encoding: str = 'utf-8',
+                           compression: str | None = None,
+                           shuffleMemoryLimit: int | None = None):
         """
         Gera um arquivo de saída com as sentenças processadas.
 
+        As sentenças são lidas do iterável à medida que são escritas (sem cópia em memória,
+        exceto para embaralhar) e gravadas com um buffer de escrita grande.
+
         Args:
             outputFileName: Nome/caminho do arquivo de saída.
             sentences: Lista de sentenças. Para CoNLL, espera-se uma lista de listas,
                        onde cada sublista contém strings "token<sep>tag".
                        Para Plain, uma lista de strings (sentenças).
+                       Também aceita um CoNLLCorpus (ou suas visões), escrito sem ser materializado,
+                       ou qualquer iterável (ex: um gerador), consumido uma única vez.
             outputFormat: Formato de saída ('CoNLL' ou 'Plain').
             shuffleSentences: Se True, embaralha as sentenças antes de salvar.
             encoding: Encoding do arquivo de saída.
+            compression: 'gzip', 'zstd' (requer o pacote `zstandard`) ou None. Se None, é
+                         definida pela extensão do arquivo (.gz, .zst); sem ela, o arquivo é texto puro.
+            shuffleMemoryLimit: Máximo de sentenças mantidas em memória ao embaralhar. Acima disso,
+                                o embaralhamento é externo, com arquivos temporários na pasta de
+                                saída (ver _externalShuffle). Visões de um CoNLLCorpus sempre
+                                embaralham apenas os índices.
+
+        Raises:
+            ValueError: Se `shuffleMemoryLimit` for menor que 1.
         """
+        if shuffleMemoryLimit is not None and shuffleMemoryLimit < 1:
+            raise ValueError('"shuffleMemoryLimit" deve ser maior ou igual a 1 (ou None).')
+
         output_path = Path(outputFileName)
         output_path.parent.mkdir(parents=True, exist_ok=True) # Garante que o diretório pai exista
+        compression = _outputCompression(output_path, compression)
+        if compression == 'zstd':
+            _zstandard() # Falha cedo se o pacote opcional não estiver instalado
 
-        # Copia a lista para não modificar a original se shuffle for True
-        sentences_to_write = list(sentences)
+        if isinstance(sentences, CoNLLCorpus):
+            sentences = sentences.sentencesTokenAndLabels
 
-        if shuffleSentences:
+        if not shuffleSentences:
+            sentences_to_write = sentences
+        elif isinstance(sentences, _CorpusSentencesView):
+            # Corpus colunar: embaralha apenas os índices e monta cada sentença na hora da escrita
+            order = list(range(len(sentences)))
+            random.shuffle(order)
+            sentences_to_write = (sentences[i] for i in order)
+        elif shuffleMemoryLimit is not None:
+            sentences_to_write = _externalShuffle(sentences, shuffleMemoryLimit, output_path.parent)
+        else:
+            # Copia a lista para não modificar a original
+            sentences_to_write = list(sentences)
             random.shuffle(sentences_to_write)
 
+        with self._timed('outputIO'):
+            self.__writeOutputFile(output_path, sentences_to_write, outputFormat, encoding, compression)
+
+    def __writeOutputFile(self,
+                          output_path: Path,
+                          sentences_to_write: Iterable,
+                          outputFormat: str,
+                          encoding: str,
+                          compression: str | None = None):
         try:
-            with open(output_path, 'w', encoding=encoding) as outputFile:
-                if outputFormat.lower() == 'conll':
-                    # sentences_to_write é esperado ser list[list[str]]
-                    # onde cada sub-lista são os "token<sep>tag" de uma sentença
-                    for sentence_tokens_and_tags in sentences_to_write:
-                        if isinstance(sentence_tokens_and_tags, list): # Verifica se é uma lista de "token-tag"
-                            for tokenTag in sentence_tokens_and_tags:
-                                outputFile.write(str(tokenTag) + '\n')
-                            outputFile.write('\n') # Delimitador de sentença para CoNLL
-                        else:
-                            print(f"Aviso: Esperava uma lista de 'token-tag' para o formato CoNLL, mas recebi: {type(sentence_tokens_and_tags)}")
-                
-                elif outputFormat.lower() == 'plain':
-                    # sentences_to_write é esperado ser list[str]
-                    for sentence_line in sentences_to_write:
-                        outputFile.write(str(sentence_line) + '\n')
+            with _openTextOutput(output_path, encoding, compression) as outputFile:
+                if outputFormat.lower() in ('conll', 'plain'):
+                    outputFile.writelines(_formatOutputSentences(sentences_to_write, outputFormat))
                 else:
                     print(f"Formato de saída '{outputFormat}' não reconhecido. Nenhum arquivo gerado.")
             
@@ -980,3 +5161,106 @@ class PortugueseToolNER:
             print(f"Erro de I/O ao escrever o arquivo {output_path}: {e}")
         except Exception as e:
             print(f"Erro inesperado ao gerar o arquivo {output_path}: {e}")
+
+
+def _evaluatePredictedFile(inputFilePath: Path, setEncoding: str, sepTokenTag: str) -> EvaluationResult:
+    """
+    Avalia um arquivo CoNLL predito (usado por PortugueseToolNER.evaluatePredictedFiles).
+    """
+    return EvaluationResult.fromCorpus(CoNLLCorpus.fromFile(inputFilePath, setEncoding, sepTokenTag,
+                                                            loadPredictedCorpus=True))
+
+
+# Estado e funções dos processos workers de sequenceTaggingOnText(workers > 1).
+# Ficam no nível do módulo para que possam ser serializados pelo multiprocessing.
+_workerTool: PortugueseToolNER | None = None
+
+def _processMemoryUsage() -> dict[str, int]:
+    """
+    Memória do processo atual, em bytes: 'rss' (residente), 'pss' (residente proporcional:
+    cada página compartilhada é dividida entre os processos que a usam), 'shared' e 'private'.
+    Lida de /proc/self/smaps_rollup (Linux); em outros sistemas, apenas o pico de 'rss'.
+    """
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            values = {}
+            for line in f:
+                key, _, rest = line.partition(':')
+                amount = rest.split()
+                if len(amount) == 2 and amount[1] == 'kB':
+                    values[key] = int(amount[0]) * 1024
+        return {'rss': values.get('Rss', 0), 'pss': values.get('Pss', 0),
+                'shared': values.get('Shared_Clean', 0) + values.get('Shared_Dirty', 0),
+                'private': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)}
+    except OSError:
+        try:
+            import resource
+        except ImportError: # Windows
+            return {}
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {'rss': peak if sys.platform == 'darwin' else peak * 1024} # bytes no macOS, KiB nos demais
+
+def _formatMemoryUsage(usage: dict[str, int]) -> str:
+    names = {'rss': 'RSS', 'pss': 'PSS', 'shared': 'compartilhada', 'private': 'privada'}
+    return ' | '.join(f"{names[key]} {value / (1 << 20):,.1f} MiB" for key, value in usage.items() if key in names)
+
+def _initTaggingWorker(nerTrainedModelPath: str | Path,
+                       predictionCacheSettings: tuple[int, Path | None] | None = None,
+                       metricsEnabled: bool = False,
+                       inferenceSettings: dict | None = None,
+                       sharedTagger: SequenceTagger | None = None,
+                       modelFingerprint: str | None = None):
+    """
+    Inicializador de cada processo worker: carrega o modelo NER uma única vez (com o mesmo
+    backend de inferência do processo principal) ou, com `sharedTagger` (enableSharedModel),
+    usa o tagger compartilhado pelo processo principal sem carregá-lo de novo. Se o processo
+    principal usa um PredictionCache ou métricas, ativa equivalentes no worker.
+    """
+    global _workerTool
+    _workerTool = PortugueseToolNER()
+    if sharedTagger is not None:
+        inferenceSettings = inferenceSettings or {'inferenceBackend': 'eager'}
+        _configureTorchThreads(inferenceSettings.get('numThreads'))
+        _workerTool.tagger = sharedTagger
+        _workerTool.nerTrainedModelPath = nerTrainedModelPath
+        _workerTool._modelFingerprint = modelFingerprint
+        _workerTool.inferenceSettings = inferenceSettings
+        _workerTool._inferenceMode = inferenceSettings['inferenceBackend'] != 'eager' or \
+            bool(inferenceSettings.get('torchScript'))
+    else:
+        _workerTool.loadNamedEntityModel(nerTrainedModelPath, **(inferenceSettings or {}))
+    if predictionCacheSettings is not None:
+        _workerTool.enablePredictionCache(*predictionCacheSettings)
+    if metricsEnabled:
+        _workerTool.enableMetrics() # Sem sinks: os retratos são somados no processo principal
+
+def _tagFilesChunk(file_paths: list[Path],
+                   tagging_kwargs: dict,
+                   cacheSettings: dict | None = None,
+                   returnDocuments: bool = False
+                   ) -> tuple[list[tuple[str, list[str], EntityStatistics | None, TaggedDocument | None]],
+                              dict | None, tuple[int, dict[str, int]]]:
+    """
+    Rotula um bloco de arquivos no worker atual.
+
+    Returns:
+        Tupla (resultados, retrato_das_métricas ou None, (pid, memória do worker)), com
+        resultados sendo uma lista de tuplas (nome_do_arquivo, sentenças_tageadas,
+        estatísticas_de_entidades ou None, TaggedDocument se returnDocuments, senão None).
+        As métricas do worker são zeradas a cada bloco, para que o processo principal
+        some cada valor uma única vez.
+    """
+    results = []
+    for file_path in file_paths:
+        document = _workerTool._tag_single_file(file_path, tagging_kwargs, cacheSettings)
+        _workerTool.namedEntitiesByFileDict.pop(file_path.name, None)
+        results.append((file_path.name,
+                        _workerTool.taggedFilesDict.pop(file_path.name),
+                        _workerTool.entityStatisticsByFileDict.pop(file_path.name, None),
+                        document if returnDocuments else None))
+
+    metrics_snapshot = None
+    if _workerTool.metrics is not None:
+        metrics_snapshot = _workerTool.metrics.snapshot()
+        _workerTool.metrics.reset()
+    return results, metrics_snapshot, (os.getpid(), _processMemoryUsage())
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+TINY_TAGGER_TRAIN = [('Maria mora em Lisboa', ['PER', 'O', 'O', 'LOC']),
+                     ('Pedro viajou para Porto', ['PER', 'O', 'O', 'LOC'])]
+
+
+@pytest.fixture(scope='session')
+def tinyTaggerPath(tmp_path_factory):
+    """
+    SequenceTagger real do Flair, mínimo (one-hot + reprojeção + LSTM + camada linear) e sem
+    treino, salvo em disco: basta para exercitar o carregamento do modelo, os workers e os
+    backends de inferência sem baixar nenhum modelo.
+    """
+    torch = pytest.importorskip('torch')
+    from flair.data import Corpus, Dictionary, Sentence
+    from flair.embeddings import OneHotEmbeddings
+    from flair.models import SequenceTagger
+
+    torch.manual_seed(0)
+    sentences = []
+    for text, tags in TINY_TAGGER_TRAIN:
+        sentence = Sentence(text)
+        for token, tag in zip(sentence, tags):
+            token.set_label('label', tag)
+        sentences.append(sentence)
+    embeddings = OneHotEmbeddings.from_corpus(Corpus(train=sentences, sample_missing_splits=False),
+                                              embedding_length=8, min_freq=1)
+    tagDictionary = Dictionary(add_unk=False)
+    for tag in ('O', 'PER', 'LOC'):
+        tagDictionary.add_item(tag)
+    tagger = SequenceTagger(hidden_size=8, embeddings=embeddings, tag_dictionary=tagDictionary,
+                            tag_type='label', use_crf=False, use_rnn=True, reproject_embeddings=True)
+    path = tmp_path_factory.mktemp('modelo') / 'tiny-tagger.pt'
+    tagger.save(path)
+    return path
@@ -0,0 +1,105 @@
+import pytest
+
+import pToolNER
+from pToolNER import IndexedCoNLLReader, PortugueseToolNER
+
+
+CONLL = "Maria B-PER\nmora O\nem O\nLisboa B-LOC\n\nPedro B-PER\nsaiu O\n"
+PREDICTED = "Maria B-PER B-PER\nmora O O\n\nPedro B-PER O\nsaiu O O\n"
+
+
+@pytest.fixture
+def tool():
+    return PortugueseToolNER()
+
+
+def test_filter_by_profiles_without_corpus_raises(tool):
+    with pytest.raises(ValueError):
+        tool.filterCoNLLCorpusByProfiles({'pessoas': ['PER']}, 'O')
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_filter_by_profiles_on_predicted_corpus_raises(tool, tmp_path, columnar):
+    path = tmp_path / 'predito.conll'
+    path.write_text(PREDICTED, encoding='utf-8')
+    tool.loadCorpusInCoNLLFormat(path, loadPredictedCorpus=True, columnar=columnar)
+
+    with pytest.raises(ValueError):
+        tool.filterCoNLLCorpusByProfiles({'pessoas': ['PER']}, 'O')
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_filter_by_profiles_keeps_requested_categories(tool, tmp_path, columnar):
+    path = tmp_path / 'corpus.conll'
+    path.write_text(CONLL, encoding='utf-8')
+    tool.loadCorpusInCoNLLFormat(path, columnar=columnar)
+
+    profiles = tool.filterCoNLLCorpusByProfiles({'pessoas': ['PER']}, 'O')
+
+    assert set(profiles) == {'pessoas'}
+    assert len(profiles['pessoas']) == 2
+
+
+@pytest.mark.parametrize('predicted, expected', [
+    (False, [(['Maria', 'mora', 'em', 'Lisboa'], ['B-PER', 'O', 'O', 'B-LOC']), (['Pedro', 'saiu'], ['B-PER', 'O'])]),
+    (True, [(['Maria', 'mora'], ['B-PER', 'O'], ['B-PER', 'O']), (['Pedro', 'saiu'], ['B-PER', 'O'], ['O', 'O'])]),
+])
+def test_indexed_reader_matches_loader(tool, tmp_path, predicted, expected):
+    path = tmp_path / 'corpus.conll'
+    path.write_text('\n\n' + (PREDICTED if predicted else CONLL) + '\n\n', encoding='utf-8')
+    tokens, labels, _ = tool.loadCorpusInCoNLLFormat(path, loadPredictedCorpus=predicted)
+    assert [(sentence[0], sentence[1]) for sentence in expected] == list(zip(tokens, labels))
+
+    with IndexedCoNLLReader(path, loadPredictedCorpus=predicted) as reader:
+        assert len(reader) == 2
+        assert [tuple(sentence) for sentence in reader] == expected
+        assert [tuple(sentence) for sentence in reader[1:]] == expected[1:]
+        assert tuple(reader[-1]) == expected[-1]
+        with pytest.raises(IndexError):
+            reader[2]
+
+
+def test_indexed_reader_reads_crlf_files(tmp_path):
+    lfPath, crlfPath = tmp_path / 'lf.conll', tmp_path / 'crlf.conll'
+    lfPath.write_bytes(CONLL.encode('utf-8'))
+    crlfPath.write_bytes(CONLL.replace('\n', '\r\n').encode('utf-8'))
+
+    with IndexedCoNLLReader(lfPath) as lf, IndexedCoNLLReader(crlfPath) as crlf:
+        assert len(crlf) == 2
+        assert list(crlf) == list(lf)
+
+
+def test_indexed_reader_rebuilds_stale_index(tmp_path):
+    path = tmp_path / 'corpus.conll'
+    path.write_text(CONLL, encoding='utf-8')
+    with IndexedCoNLLReader(path) as reader:
+        assert len(reader) == 2
+    assert (tmp_path / 'corpus.conll.sentidx.npz').is_file()
+
+    path.write_text(CONLL + '\nAna B-PER\nvoltou O\n', encoding='utf-8')
+    with IndexedCoNLLReader(path) as reader:
+        assert len(reader) == 3
+        assert reader[2] == (['Ana', 'voltou'], ['B-PER', 'O'])
+
+
+def test_corpus_cache_is_reused_until_the_file_changes(tool, tmp_path, monkeypatch):
+    path, cacheDir = tmp_path / 'corpus.conll', tmp_path / 'cache'
+    path.write_text(CONLL, encoding='utf-8')
+    expected = tool.loadCorpusInCoNLLFormat(path)
+    assert tool.loadCorpusInCoNLLFormat(path, cacheDir=cacheDir) == expected
+    assert len(list(cacheDir.glob('conll-*.npz'))) == 1
+
+    parse = pToolNER.CoNLLCorpus.fromFile
+    parsed = []
+    monkeypatch.setattr(pToolNER.CoNLLCorpus, 'fromFile',
+                        staticmethod(lambda *args, **kwargs: parsed.append(args) or parse(*args, **kwargs)))
+
+    assert tool.loadCorpusInCoNLLFormat(path, cacheDir=cacheDir) == expected
+    assert tool.loadCorpusInCoNLLFormat(path, columnar=True, cacheDir=cacheDir)[0][1] == ['Pedro', 'saiu']
+    assert parsed == []
+
+    path.write_text(CONLL.replace('Lisboa B-LOC', 'Lisboa O'), encoding='utf-8')
+    _, labels, _ = tool.loadCorpusInCoNLLFormat(path, cacheDir=cacheDir)
+    assert labels[0] == ['B-PER', 'O', 'O', 'O']
+    assert len(parsed) == 1
+    assert len(list(cacheDir.glob('conll-*.npz'))) == 2
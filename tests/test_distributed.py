@@ -0,0 +1,149 @@
+import sqlite3
+import time
+
+import pytest
+
+import pToolNER
+from pToolNER import DistributedTaggingQueue, PortugueseToolNER
+
+
+FILES = [f'pasta/arquivo{i:03d}.txt' for i in range(2 * pToolNER._SEED_BATCHES_PER_TRANSACTION + 5)]
+
+
+def batchFiles(queue, nodeId='n'):
+    files = []
+    while (claimed := queue.claim(nodeId, 60)) is not None:
+        files.extend(claimed[1])
+        queue.complete(claimed[0], nodeId, {})
+    return files
+
+
+def test_seed_commits_batches_while_enumerating(tmp_path):
+    queuePath = tmp_path / 'fila.sqlite'
+    observed = {}
+
+    def enumerate_files():
+        for i, relativePath in enumerate(FILES):
+            if i == pToolNER._SEED_BATCHES_PER_TRANSACTION + 1:
+                other = DistributedTaggingQueue(queuePath, timeout=1)
+                try:
+                    observed['seeding'] = other.isSeeding()
+                    observed['claimed'] = other.claim('outro', 60)
+                    observed['finished'] = other.finish('outro')
+                    observed['seed'] = other.seed(iter(FILES), 1, 'opcoes', 'outro')
+                finally:
+                    other.close()
+            yield relativePath
+
+    queue = DistributedTaggingQueue(queuePath)
+    try:
+        assert queue.seed(enumerate_files(), 1, 'opcoes', 'n')
+        assert observed == {'seeding': True, 'claimed': (1, [(0, FILES[0])]), 'finished': False, 'seed': False}
+        assert not queue.isSeeding()
+        assert queue.progress()['files'] == len(FILES)
+        assert queue.finish('n') is False # O lote reservado pelo outro nó ainda não foi concluído
+        assert [path for _, path in batchFiles(queue)] == FILES[1:]
+        queue.complete(1, 'outro', {})
+        assert queue.finish('n') is True
+        assert queue.finish('outro') is False # Apenas um nó gera o relatório geral
+    finally:
+        queue.close()
+
+
+def test_interrupted_seed_is_resumed_by_another_node(tmp_path):
+    queuePath = tmp_path / 'fila.sqlite'
+
+    def failing_files():
+        yield from FILES[:pToolNER._SEED_BATCHES_PER_TRANSACTION + 3]
+        raise OSError('disco indisponível')
+
+    queue = DistributedTaggingQueue(queuePath)
+    try:
+        with pytest.raises(OSError):
+            queue.seed(failing_files(), 1, 'opcoes', 'n', leaseSeconds=0)
+        assert queue.isSeeding()
+        assert queue.seed(iter(FILES), 1, 'opcoes', 'outro')
+        assert batchFiles(queue) == list(enumerate(FILES))
+    finally:
+        queue.close()
+
+
+def test_seed_rejects_other_options(tmp_path):
+    queue = DistributedTaggingQueue(tmp_path / 'fila.sqlite')
+    try:
+        queue.seed(iter(FILES), 4, 'opcoes', 'n')
+        with pytest.raises(ValueError):
+            queue.seed(iter(FILES), 4, 'outras', 'n')
+    finally:
+        queue.close()
+
+
+class IdleTagger:
+    def predict(self, sentences, **kwargs):
+        raise AssertionError('nenhum arquivo deveria ser rotulado')
+
+    def state_dict(self) -> dict:
+        return {}
+
+
+def test_empty_tree_finishes_the_queue(tmp_path):
+    (tmp_path / 'entrada').mkdir()
+    outputDir = tmp_path / 'saida'
+    outputDir.mkdir()
+    (outputDir / 'GeneralNamedEntities.txt').write_text('relatório antigo\n', encoding='utf-8')
+    tool = PortugueseToolNER()
+    tool.tagger = IdleTagger()
+
+    summary = tool.sequenceTaggingDistributed(tmp_path / 'entrada', tmp_path / 'fila.sqlite', outputDir,
+                                              nodeId='n')
+
+    assert summary == {'nodeId': 'n', 'batches': 0, 'files': 0, 'merged': True}
+    assert not (outputDir / 'GeneralNamedEntities.txt').exists()
+    assert tool.namedEntitiesDict == {}
+
+
+def test_keep_leased_renews_while_a_file_is_tagged(tmp_path):
+    queue = DistributedTaggingQueue(tmp_path / 'fila.sqlite')
+    other = DistributedTaggingQueue(tmp_path / 'fila.sqlite')
+    try:
+        queue.seed(iter(FILES[:2]), 1, 'opcoes', 'n')
+        batchId, _ = queue.claim('n', 0.3)
+        with queue.keepLeased(batchId, 'n', 0.3) as leaseLost:
+            time.sleep(0.8) # Um arquivo mais demorado que a reserva
+            assert other.claim('outro', 0.3)[0] != batchId
+        assert not leaseLost.is_set()
+    finally:
+        other.close()
+        queue.close()
+
+
+class StealingTagger(IdleTagger):
+    """
+    Simula um nó que perde a reserva no meio de um arquivo: o lote passa a outro nó.
+    """
+
+    def __init__(self, queuePath):
+        self.queuePath = queuePath
+
+    def predict(self, sentences, **kwargs):
+        with sqlite3.connect(self.queuePath) as connection:
+            connection.execute("UPDATE batches SET owner = 'outro', leaseExpires = ?", (time.time() + 3600,))
+        time.sleep(0.5)
+
+
+def test_lost_lease_does_not_complete_the_batch(tmp_path):
+    inputDir = tmp_path / 'entrada'
+    inputDir.mkdir()
+    (inputDir / 'a.txt').write_text('Maria viajou\n', encoding='utf-8')
+    tool = PortugueseToolNER()
+    tool.tagger = StealingTagger(tmp_path / 'fila.sqlite')
+
+    summary = tool.sequenceTaggingDistributed(inputDir, tmp_path / 'fila.sqlite', tmp_path / 'saida',
+                                              nodeId='n', leaseSeconds=0.3)
+
+    assert summary['batches'] == 0 and summary['files'] == 0 and not summary['merged']
+    queue = DistributedTaggingQueue(tmp_path / 'fila.sqlite')
+    try:
+        assert queue.progress()['done'] == 0
+    finally:
+        queue.close()
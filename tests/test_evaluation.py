@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from pToolNER import EvaluationResult, PortugueseToolNER, decodeEntitySpans
+
+
+def test_decode_bio_spans_do_not_cross_sentences():
+    vocab = ['O', 'B-PER', 'I-PER', 'B-LOC', 'I-LOC']
+    labels = ['B-PER', 'I-PER', 'O', 'I-LOC',  # I- sem B- abre uma entidade
+              'I-LOC', 'B-PER', 'I-PER']       # continuação na sentença seguinte é outra entidade
+    labelIds = np.array([vocab.index(label) for label in labels])
+
+    spans, typeNames = decodeEntitySpans(labelIds, vocab, np.array([0, 4, 7]))
+
+    assert typeNames == ['PER', 'LOC']
+    assert spans.tolist() == [[0, 2, 0], [3, 4, 1], [4, 5, 1], [5, 7, 0]]
+
+
+def test_decode_bioes_spans():
+    vocab = ['O', 'B-PER', 'I-PER', 'E-PER', 'S-PER', 'S-LOC']
+    labels = ['S-LOC', 'B-PER', 'I-PER', 'E-PER', 'S-PER', 'O']
+    labelIds = np.array([vocab.index(label) for label in labels])
+
+    spans, typeNames = decodeEntitySpans(labelIds, vocab, np.array([0, 6]))
+
+    assert typeNames == ['PER', 'LOC']
+    assert spans.tolist() == [[0, 1, 1], [1, 4, 0], [4, 5, 0]]
+
+
+FIRST = ("Maria B-PER B-PER\nSilva I-PER I-PER\nmora O O\nem O O\nLisboa B-LOC B-PER\n\n"
+         "Pedro B-PER B-PER\nviajou O O\n")
+SECOND = "Ana B-PER O\nfoi O O\na O O\nRoma B-LOC B-LOC\n"
+
+
+def test_evaluation_of_two_files_is_merged(tmp_path):
+    paths = [tmp_path / 'a.conll', tmp_path / 'b.conll']
+    for path, content in zip(paths, (FIRST, SECOND)):
+        path.write_text(content, encoding='utf-8')
+
+    byFile, total = PortugueseToolNER().evaluatePredictedFiles(paths)
+
+    first, second = byFile[str(paths[0])], byFile[str(paths[1])]
+    assert first.entityScores() == pytest.approx({'LOC': (0.0, 0.0, 0.0, 1), 'PER': (2 / 3, 1.0, 0.8, 2)})
+    assert second.entityScores() == pytest.approx({'LOC': (1.0, 1.0, 1.0, 1), 'PER': (0.0, 0.0, 0.0, 1)})
+
+    assert total.numSentences == 3
+    assert total.entityScores() == pytest.approx({'LOC': (1.0, 0.5, 2 / 3, 2), 'PER': (2 / 3, 2 / 3, 2 / 3, 3)})
+    assert total.microAverage() == pytest.approx((0.75, 0.6, 2 / 3, 5))
+    assert total.macroAverage() == pytest.approx((5 / 6, 7 / 12, 2 / 3, 5))
+
+    labels, matrix = total.confusionMatrix()
+    assert labels == ['B-LOC', 'B-PER', 'I-PER', 'O']
+    assert matrix.tolist() == [[1, 1, 0, 0],
+                               [0, 2, 0, 1],
+                               [0, 0, 1, 0],
+                               [0, 0, 0, 5]]
+    assert total.tokenAccuracy() == pytest.approx(9 / 11)
+
+    added = first + second
+    assert added.confusion == total.confusion
+    assert added.entityScores() == total.entityScores()
+    assert first.entityScores() == pytest.approx({'LOC': (0.0, 0.0, 0.0, 1), 'PER': (2 / 3, 1.0, 0.8, 2)}) # `+` não altera os operandos
+
+
+def test_evaluation_requires_predictions(tmp_path):
+    path = tmp_path / 'chave.conll'
+    path.write_text("Maria B-PER\nmora O\n", encoding='utf-8')
+    tool = PortugueseToolNER()
+    tool.loadCorpusInCoNLLFormat(path)
+
+    with pytest.raises(ValueError):
+        tool.evaluatePredictedCorpus()
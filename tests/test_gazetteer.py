@@ -0,0 +1,25 @@
+import pickle
+
+import pytest
+
+from pToolNER import GazetteerMatcher
+
+
+def test_save_and_load_round_trip(tmp_path):
+    matcher = GazetteerMatcher(['Manoel Francisco das Neves', 'Ana'], listStopNames=['das'])
+    matcher.save(tmp_path / 'nomes.gaz')
+
+    loaded = GazetteerMatcher.load(tmp_path / 'nomes.gaz')
+
+    assert loaded.names == matcher.names
+    assert loaded.prefixes == matcher.prefixes
+    assert loaded.stopNames == matcher.stopNames
+    assert loaded.findMatches('ontem manoel francisco das neves e ana'.split()) == [(1, 5), (6, 7)]
+
+
+def test_load_rejects_files_that_are_not_gazetteer_json(tmp_path):
+    path = tmp_path / 'pickle.gaz' # Carregar um pickle poderia executar código
+    path.write_bytes(pickle.dumps({'version': 1, 'names': 'ana', 'prefixes': '',
+                                   'maxNameLength': 1, 'stopNames': ''}))
+    with pytest.raises(ValueError):
+        GazetteerMatcher.load(path)
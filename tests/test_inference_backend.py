@@ -0,0 +1,45 @@
+import pytest
+
+torch = pytest.importorskip('torch')
+
+import pToolNER
+from pToolNER import PortugueseToolNER
+
+
+HELD_OUT = 'Maria B-PER\nmora O\nem O\nLisboa B-LOC\n\nPedro B-PER\nviajou O\npara O\nPorto B-LOC\n'
+
+
+@pytest.fixture
+def heldOutPath(tmp_path):
+    path = tmp_path / 'validacao.conll'
+    path.write_text(HELD_OUT, encoding='utf-8')
+    return path
+
+
+@pytest.mark.parametrize('inferenceBackend, torchScript',
+                         [('eager', False), ('int8', False), ('eager', True), ('int8', True)])
+def test_each_backend_predicts_like_eager(tinyTaggerPath, heldOutPath, inferenceBackend, torchScript):
+    tool = PortugueseToolNER()
+    tool.loadNamedEntityModel(tinyTaggerPath, inferenceBackend=inferenceBackend, torchScript=torchScript)
+
+    assert tool.inferenceSettings['inferenceBackend'] == inferenceBackend # Sem recair no modo eager
+    assert ('quantized' in type(tool.tagger.rnn).__module__) == (inferenceBackend == 'int8')
+    assert tool.tagger.linear.weight.dtype == torch.float32
+    report = tool.compareInferenceBackend(heldOutPath)
+
+    assert report.sentences == 2 and report.tokens == 8 and report.skippedSentences == 0
+    assert report.labelAgreement == 1.0
+
+
+def test_failing_backend_falls_back_to_eager(tinyTaggerPath, heldOutPath, monkeypatch):
+    def brokenOptimization(tagger, backend, torchScript):
+        tagger.rnn = torch.jit.script(tagger.rnn) # Sem forward para PackedSequence
+        return tagger
+
+    monkeypatch.setattr(pToolNER, '_optimizeTaggerForCPU', brokenOptimization)
+    tool = PortugueseToolNER()
+    tool.loadNamedEntityModel(tinyTaggerPath, inferenceBackend='int8')
+
+    assert tool.inferenceSettings['inferenceBackend'] == 'eager'
+    assert not isinstance(tool.tagger.rnn, torch.jit.ScriptModule)
+    assert tool.compareInferenceBackend(heldOutPath).labelAgreement == 1.0
@@ -0,0 +1,25 @@
+import pytest
+
+from pToolNER import PortugueseToolNER, TaggedOutputArchive
+
+
+SENTENCES = [f'Sentença número {i}.' for i in range(50)]
+
+
+@pytest.mark.parametrize('shuffleMemoryLimit', [0, -3])
+def test_shuffle_memory_limit_must_be_positive(tmp_path, shuffleMemoryLimit):
+    with pytest.raises(ValueError):
+        PortugueseToolNER().generateOutputFile(tmp_path / 'saida.txt', SENTENCES, 'plain',
+                                               shuffleSentences=True, shuffleMemoryLimit=shuffleMemoryLimit)
+
+
+def test_external_shuffle_keeps_every_sentence(tmp_path):
+    output = tmp_path / 'saida.txt'
+    PortugueseToolNER().generateOutputFile(output, SENTENCES, 'plain',
+                                           shuffleSentences=True, shuffleMemoryLimit=1)
+    assert sorted(output.read_text(encoding='utf-8').splitlines()) == sorted(SENTENCES)
+
+
+def test_output_archive_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        TaggedOutputArchive()
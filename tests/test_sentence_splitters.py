@@ -0,0 +1,28 @@
+import pytest
+
+from pToolNER import regexSentenceSplitter
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Ele foi ao mar. Depois voltou.', ['Ele foi ao mar.', 'Depois voltou.']),
+    ('Formam um par. Outro chegou.', ['Formam um par.', 'Outro chegou.']),
+    ('Ele disse no. Bem.', ['Ele disse no.', 'Bem.']),
+    ('Chegou em out. Saiu em nov. 2020.', ['Chegou em out.', 'Saiu em nov. 2020.']),
+    ('Que dia! Foi ótimo? Sim… Talvez.', ['Que dia!', 'Foi ótimo?', 'Sim…', 'Talvez.']),
+])
+def test_splits_after_ordinary_words(text, expected):
+    assert regexSentenceSplitter(text) == expected
+
+
+@pytest.mark.parametrize('text', [
+    'O Sr. Silva chegou cedo.',
+    'Veja o art. 5 da lei.',
+    'A reunião foi em set. 2020 na sede.',
+    'O relator foi o Des. Fulano de Tal.',
+    'O Pe. José celebrou a missa.',
+    'Consulte o par. 2 do contrato.',
+    'Mora na casa no. 10 da rua.',
+    'Falou com J. Silva ontem.',
+])
+def test_keeps_abbreviations_inside_the_sentence(text):
+    assert regexSentenceSplitter(text) == [text]
@@ -0,0 +1,312 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+import pToolNER
+from pToolNER import PortugueseToolNER, TaggingResult
+
+
+class CountingTagger:
+    """
+    Substituto do SequenceTagger: marca como PER as palavras com inicial maiúscula
+    (exceto a primeira da sentença) e conta as chamadas a predict.
+    """
+
+    def __init__(self):
+        self.predictCalls = 0
+        self.predictedTexts = Counter()
+        self.miniBatchSizes = []
+
+    def predict(self, sentences, mini_batch_size=32, **kwargs):
+        if not isinstance(sentences, list):
+            sentences = [sentences]
+        self.predictCalls += 1
+        self.miniBatchSizes.append(mini_batch_size)
+        for sentence in sentences:
+            self.predictedTexts[sentence.to_original_text()] += 1
+            for i, token in enumerate(sentence.tokens):
+                if i > 0 and token.text[:1].isupper():
+                    token.set_label('label', 'S-PER')
+                    sentence[i:i + 1].add_label('label', 'PER')
+
+    def state_dict(self) -> dict:
+        return {}
+
+
+TEXT = 'Ontem Maria viajou. Hoje ela encontrou Pedro. Depois todos voltaram.'
+SENTENCES = ['Ontem Maria viajou.', 'Hoje ela encontrou Pedro.', 'Depois todos voltaram.']
+
+
+@pytest.fixture
+def tool():
+    tool = PortugueseToolNER()
+    tool.tagger = CountingTagger()
+    return tool
+
+
+@pytest.mark.parametrize('outFormat', ['plain', 'CoNLL'])
+def test_unmasked_on_the_fly_predicts_each_sentence_once(tool, tmp_path, outFormat):
+    tool.sequenceTaggingOnTheFly(TEXT, 'texto', sentenceSplitter='regex', useTokenizer_flair=True,
+                                 maskNamedEntity=False,
+                                 createOutputListSpans=True, createOutputFile=True,
+                                 outputFilePath=tmp_path, outFormat=outFormat, miniBatchSize=2)
+
+    assert tool.tagger.predictedTexts == Counter(SENTENCES)
+    assert tool.tagger.predictCalls == 1 # O Flair divide a chamada em mini-batches
+    assert tool.tagger.miniBatchSizes == [2]
+    assert [entry[0] for entry in tool.namedEntitiesByFileDict['texto']] == ['Maria', 'Pedro']
+
+
+def test_unmasked_folder_tagging_predicts_each_sentence_once(tool, tmp_path):
+    inputDir = tmp_path / 'entrada'
+    inputDir.mkdir()
+    for name in ('a.txt', 'b.txt'):
+        (inputDir / name).write_text('\n'.join(SENTENCES) + '\n', encoding='utf-8')
+
+    tool.sequenceTaggingOnText(inputDir, maskNamedEntity=False, createOutputListSpans=True,
+                               createOutputFile=True, outputFilePath=tmp_path / 'saida', outFormat='plain')
+
+    assert tool.tagger.predictedTexts == Counter({sentence: 2 for sentence in SENTENCES})
+    assert tool.tagger.predictCalls == 2 # Uma chamada por arquivo
+    assert (tmp_path / 'saida' / 'ptTagged-a.txt.txt').is_file()
+
+
+def test_masking_replaces_predicted_spans(tool, tmp_path):
+    (tmp_path / 'a.txt').write_text('\n'.join(SENTENCES) + '\n', encoding='utf-8')
+
+    taggedFilesDict, _, _ = tool.sequenceTaggingOnText(tmp_path, useTokenizer_flair=True, maskNamedEntity=True,
+                                                       entitiesToMask=['PER'], specialTokenToMaskNE='[X]')
+
+    assert taggedFilesDict['a.txt'] == ['Ontem [X] viajou .', 'Hoje ela encontrou [X] .', 'Depois todos voltaram .']
+
+
+def test_retagging_an_identifier_keeps_the_general_report_order(tool, tmp_path):
+    def tag(text, textId):
+        tool.sequenceTaggingOnTheFly(text, textId, useSentenceTokenize_nltk=False, useTokenizer_flair=True,
+                                     createOutputListSpans=True, createOutputFile=True,
+                                     outputFilePath=tmp_path, outFormat='plain')
+
+    tag('Ontem Maria viajou', 't1')
+    tag('Hoje Pedro chegou', 't2')
+    tag('Ontem Maria e Ana viajaram', 't1') # Substitui as entidades de t1
+
+    assert [entry[0] for entry in tool.namedEntitiesDict['allFiles']] == ['Maria', 'Ana', 'Pedro']
+    report = (tmp_path / 'GeneralNamedEntities.txt').read_text(encoding='utf-8')
+    assert report.index('Maria') < report.index('Ana') < report.index('Pedro')
+
+
+def maskWithAuxNames(tool, text, auxListNE):
+    _, _, taggedFilesDict, _, _ = tool.sequenceTaggingOnTheFly(
+        text, 't', useSentenceTokenize_nltk=False, maskNamedEntity=True, entitiesToMask=['PER'],
+        specialTokenToMaskNE='[X]', useAuxListNE=True, auxListNE=auxListNE)
+    return taggedFilesDict['t']
+
+
+@pytest.mark.parametrize('auxListNE', [['João'], frozenset({'João'}), {'JOÃO'}])
+def test_aux_names_are_normalized_unless_already_indexed(tool, auxListNE):
+    assert maskWithAuxNames(tool, 'ontem joão saiu', auxListNE) == ['ontem [X] saiu']
+
+
+def test_prebuilt_aux_names_index_is_used_as_is(tool):
+    index = tool.buildAuxNamesIndex(['João'])
+    assert 'joao' in index
+    assert maskWithAuxNames(tool, 'ontem João saiu', index) == ['ontem [X] saiu']
+
+
+@pytest.mark.parametrize('outFormat', ['plain', 'CoNLL'])
+def test_prediction_cache_output_matches_uncached_runs(tmp_path, outFormat):
+    inputDir = tmp_path / 'entrada'
+    inputDir.mkdir()
+    (inputDir / 'a.txt').write_text('\n'.join(SENTENCES) + '\n', encoding='utf-8')
+    (inputDir / 'b.txt').write_text(f'{SENTENCES[0]}\nDepois Joana voltou.\n', encoding='utf-8')
+    database = tmp_path / 'cache' / 'predicoes.sqlite'
+
+    def run(outputName, cacheOptions=None):
+        tool = PortugueseToolNER()
+        tool.tagger = CountingTagger()
+        cache = tool.enablePredictionCache(**cacheOptions) if cacheOptions is not None else None
+        results = tool.sequenceTaggingOnText(inputDir, useTokenizer_flair=True, maskNamedEntity=True,
+                                             entitiesToMask=['PER'], specialTokenToMaskNE='[X]',
+                                             createOutputListSpans=True, createOutputFile=True,
+                                             outputFilePath=tmp_path / outputName, outFormat=outFormat)
+        stats = cache.stats() if cache is not None else None
+        tool.disablePredictionCache()
+        return results, stats, sum(tool.tagger.predictedTexts.values())
+
+    uncached, _, uncachedPredictions = run('sem-cache')
+    assert uncachedPredictions == 5
+    outputNames = sorted(path.name for path in (tmp_path / 'sem-cache').iterdir())
+    assert 'ptTagged-b.txt.txt' in outputNames or 'ptTagged-b.txt.conll' in outputNames
+
+    expected = [
+        ('lru', {}, {'hits': 1, 'misses': 4, 'persistentHits': 0, 'entries': 4}, 4),
+        ('sqlite', {'persistentPath': database}, {'hits': 1, 'misses': 4, 'persistentHits': 0, 'entries': 4}, 4),
+        ('sqlite-reaberto', {'persistentPath': database}, {'hits': 5, 'misses': 0, 'persistentHits': 4, 'entries': 4}, 0),
+    ]
+    for outputName, cacheOptions, expectedStats, expectedPredictions in expected:
+        results, stats, predictions = run(outputName, cacheOptions)
+        assert results == uncached
+        assert stats == expectedStats
+        assert predictions == expectedPredictions
+        assert sorted(path.name for path in (tmp_path / outputName).iterdir()) == outputNames
+        for name in outputNames:
+            assert (tmp_path / outputName / name).read_bytes() == (tmp_path / 'sem-cache' / name).read_bytes()
+
+
+def test_tag_async_splits_off_the_event_loop_and_replaces_stale_batchers(tool):
+    splitterThreads = []
+
+    def splitter(text):
+        splitterThreads.append(threading.current_thread().name)
+        return SENTENCES
+
+    async def tag():
+        return await tool.tagAsync(TEXT, 't', useTokenizer_flair=True, sentenceSplitter=splitter)
+
+    asyncio.run(tag())
+    firstBatcher = tool._asyncBatcher
+    result = asyncio.run(tag()) # Novo event loop: o batcher anterior é encerrado
+
+    assert tool._asyncBatcher is not firstBatcher
+    with pytest.raises(RuntimeError):
+        firstBatcher.executor.submit(print)
+    assert all(name.startswith('pToolNER-model') for name in splitterThreads)
+    assert isinstance(result, TaggingResult)
+    assert result.identifier == 't'
+    assert result.spans == [('Maria', 'PER'), ('Pedro', 'PER')]
+
+
+@pytest.mark.parametrize('stage', ['forming', 'predicting'])
+def test_close_async_fails_pending_calls(tool, monkeypatch, stage):
+    if stage == 'forming':
+        tool.setAsyncBatchingPolicy(maxBatchSize=64, maxWaitMs=60_000) # O batch nunca fica completo
+    else:
+        predict = tool.tagger.predict
+
+        def slowPredict(*args, **kwargs):
+            time.sleep(0.3)
+            return predict(*args, **kwargs)
+
+        monkeypatch.setattr(tool.tagger, 'predict', slowPredict)
+
+    async def main():
+        calls = [asyncio.create_task(tool.tagAsync(sentence, useSentenceTokenize_nltk=False))
+                 for sentence in SENTENCES]
+        await asyncio.sleep(0.1)
+        await tool.closeAsync()
+        return await asyncio.wait_for(asyncio.gather(*calls, return_exceptions=True), 2)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_async_stateless_and_streaming_apis_share_the_sentence_model(tool):
+    synchronous = tool.tagText(TEXT, 't', sentenceSplitter='regex', useTokenizer_flair=True)
+    asynchronous = asyncio.run(tool.tagAsync(TEXT, 't', sentenceSplitter='regex', useTokenizer_flair=True))
+    streamed = list(tool.iterTagSentences(SENTENCES, useTokenizer_flair=True))
+
+    assert asynchronous.sentences == synchronous.sentences == streamed
+
+
+def test_masking_is_timed_once_per_sentence(tool):
+    metrics = tool.enableMetrics()
+    tool.tagSentences(SENTENCES, useTokenizer_flair=True, maskNamedEntity=True, entitiesToMask=['PER'],
+                      specialTokenToMaskNE='[X]', useAuxListNE=True, auxListNE=['todos'])
+
+    stages = metrics.snapshot()['stages']
+    assert stages['masking']['calls'] == len(SENTENCES)
+    assert stages['auxLookup']['calls'] == len(SENTENCES)
+
+
+class TypedTagger(CountingTagger):
+    """
+    Substituto do SequenceTagger com tipos fixos por palavra: tokens consecutivos do mesmo
+    tipo formam uma entidade (BIO).
+    """
+
+    TYPES = {'Maria': 'PER', 'Silva': 'PER', 'Lisboa': 'LOC'}
+
+    def predict(self, sentences, mini_batch_size=32, **kwargs):
+        if not isinstance(sentences, list):
+            sentences = [sentences]
+        for sentence in sentences:
+            types = [self.TYPES.get(token.text) for token in sentence.tokens]
+            start = 0
+            while start < len(types):
+                end = start + 1
+                while end < len(types) and types[start] is not None and types[end] == types[start]:
+                    end += 1
+                if types[start] is not None:
+                    for i in range(start, end):
+                        sentence.tokens[i].set_label('label', ('B-' if i == start else 'I-') + types[start])
+                    sentence[start:end].add_label('label', types[start])
+                start = end
+
+
+MASKING_TEXT = 'Ontem Maria Silva Lisboa viu Joana .'
+
+
+@pytest.mark.parametrize('specialToken, entitiesToMask, expected', [
+    ('[X]', ['PER', 'LOC'], ['Ontem O', '[X] B-PER', 'viu O', '[X] O', '. O']),
+    ('[X]', ['PER'], ['Ontem O', '[X] B-PER', 'Lisboa B-LOC', 'viu O', '[X] O', '. O']),
+    ('[{type}]', ['PER', 'LOC'], ['Ontem O', '[PER] B-PER', '[LOC] B-LOC', 'viu O', '[PER] O', '. O']),
+])
+def test_masking_merges_consecutive_tokens(specialToken, entitiesToMask, expected):
+    tool = PortugueseToolNER()
+    tool.tagger = TypedTagger()
+
+    result = tool.tagText(MASKING_TEXT, useSentenceTokenize_nltk=False, maskNamedEntity=True,
+                          entitiesToMask=entitiesToMask, specialTokenToMaskNE=specialToken,
+                          useAuxListNE=True, auxListNE=['Joana'])
+
+    sentence, = result.sentences
+    assert sentence.maskedTokenAndLabels == expected
+    assert sentence.maskedTokens == [line.split(' ')[0] for line in expected]
+    assert sentence.taggedString == ' '.join(sentence.maskedTokens)
+    assert sentence.spans == [('Maria Silva', 'PER'), ('Lisboa', 'LOC')]
+
+
+def test_incremental_run_without_entities_removes_the_general_report(tool, tmp_path):
+    inputDir, outputDir = tmp_path / 'entrada', tmp_path / 'saida'
+    inputDir.mkdir()
+    (inputDir / 'a.txt').write_text('ontem Maria viajou\n', encoding='utf-8')
+    (inputDir / 'b.txt').write_text('todos voltaram\n', encoding='utf-8')
+
+    def run():
+        return tool.sequenceTaggingOnText(inputDir, useTokenizer_flair=True, createOutputListSpans=True,
+                                          createOutputFile=True, outputFilePath=outputDir, outFormat='plain',
+                                          incremental=True)
+
+    run()
+    assert (outputDir / 'GeneralNamedEntities.txt').is_file()
+
+    (inputDir / 'a.txt').unlink()
+    _, _, namedEntitiesDict = run()
+    assert not (outputDir / 'GeneralNamedEntities.txt').exists()
+    assert 'allFiles' not in namedEntitiesDict
+
+
+def test_incremental_run_closes_the_manifest_on_errors(tool, tmp_path, monkeypatch):
+    inputDir = tmp_path / 'entrada'
+    inputDir.mkdir()
+    (inputDir / 'a.txt').write_text('ontem Maria viajou\n', encoding='utf-8')
+    manifests = []
+    originalInit = pToolNER.TaggingManifest.__init__
+
+    def trackingInit(self, *args, **kwargs):
+        originalInit(self, *args, **kwargs)
+        manifests.append(self)
+
+    def failingPredict(*args, **kwargs):
+        raise RuntimeError('falha no modelo')
+
+    monkeypatch.setattr(pToolNER.TaggingManifest, '__init__', trackingInit)
+    monkeypatch.setattr(tool.tagger, 'predict', failingPredict)
+
+    with pytest.raises(RuntimeError):
+        tool.sequenceTaggingOnText(inputDir, createOutputListSpans=True, createOutputFile=True,
+                                   outputFilePath=tmp_path / 'saida', outFormat='plain', incremental=True)
+    assert len(manifests) == 1 and manifests[0]._connection is None
@@ -0,0 +1,49 @@
+import filecmp
+
+import pytest
+
+from pToolNER import PortugueseToolNER
+
+
+TEXTS = {
+    'a.txt': ['Maria mora em Lisboa', 'Pedro viajou para Porto'],
+    'b.txt': ['Ana saiu de casa cedo'],
+    'c.txt': ['Maria e Pedro foram ao Porto', 'Lisboa fica longe', 'ninguém respondeu'],
+    'd.txt': ['Pedro mora em Lisboa'],
+    'e.txt': ['Porto', 'Maria viajou para Lisboa com Ana'],
+}
+
+
+@pytest.fixture
+def inputDir(tmp_path):
+    path = tmp_path / 'entrada'
+    path.mkdir()
+    for name, sentences in TEXTS.items():
+        (path / name).write_text('\n'.join(sentences) + '\n', encoding='utf-8')
+    return path
+
+
+def tagFolder(modelPath, inputDir, outputDir, outFormat, workers=1, sharedModel=False):
+    tool = PortugueseToolNER()
+    tool.loadNamedEntityModel(modelPath)
+    if sharedModel:
+        tool.enableSharedModel(sharedModel)
+    return tool.sequenceTaggingOnText(inputDir, useTokenizer_flair=True, maskNamedEntity=True,
+                                      entitiesToMask=['PER'], specialTokenToMaskNE='[X]',
+                                      createOutputListSpans=True, createOutputFile=True,
+                                      outputFilePath=outputDir, outFormat=outFormat,
+                                      workers=workers, chunkSize=2)
+
+
+@pytest.mark.parametrize('outFormat, sharedModel',
+                         [('plain', False), ('CoNLL', False), ('plain', 'fork'), ('CoNLL', 'spawn')])
+def test_workers_match_the_serial_run(tinyTaggerPath, inputDir, tmp_path, outFormat, sharedModel):
+    serial = tagFolder(tinyTaggerPath, inputDir, tmp_path / 'serial', outFormat)
+    parallel = tagFolder(tinyTaggerPath, inputDir, tmp_path / 'paralelo', outFormat,
+                         workers=2, sharedModel=sharedModel)
+
+    assert parallel == serial
+    names = sorted(path.name for path in (tmp_path / 'serial').iterdir())
+    assert names == sorted(path.name for path in (tmp_path / 'paralelo').iterdir())
+    match, mismatch, errors = filecmp.cmpfiles(tmp_path / 'serial', tmp_path / 'paralelo', names, shallow=False)
+    assert mismatch == [] and errors == []